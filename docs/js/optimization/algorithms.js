@@ -30,6 +30,7 @@ export const DEFAULTS = {
   randomRestarts: {
     maxRestarts: 5,
     maxIterPerRestart: 50,
+    stepSize: 0.008,
   },
 };
 
@@ -319,7 +320,7 @@ export function stepRandomRestarts(state, terrainData, getElev, config = {}) {
   }
 
   // Gradient ascent step within current restart
-  const stepSize = 0.008;
+  const stepSize = opts.stepSize;
   const stepX = (grad.dx / magnitude) * stepSize;
   const stepY = (grad.dy / magnitude) * stepSize;
 
@@ -5,11 +5,13 @@ Reference implementations matching the JavaScript versions in docs/js/optimizati
 These are used for validation and testing consistency between Python and JS.
 """
 
-import json
 import math
 import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Callable, Tuple, Optional, Dict, Any
+from typing import Callable, List, Tuple, Optional, Dict, Any
+
+from terrain_cache import load_terrain_data
 
 
 @dataclass
@@ -18,6 +20,17 @@ class OptimizationConfig:
     # Gradient Ascent
     ga_step_size: float = 0.008
     ga_convergence_tol: float = 0.5
+    # Step control (GA_STEP_MODES), also used by random restarts' inner ascent
+    ga_step_mode: str = 'fixed'
+    ga_max_step: float = 0.05  # Cap on one step's length in the adaptive modes
+    ga_armijo_c: float = 1e-4  # Sufficient-increase constant
+    ga_armijo_shrink: float = 0.5
+    ga_armijo_max_backtracks: int = 20
+    ga_momentum: float = 0.9
+    ga_adam_lr: float = 0.01
+    ga_adam_beta1: float = 0.9
+    ga_adam_beta2: float = 0.999
+    ga_adam_eps: float = 1e-8
 
     # Newton-Raphson
     nr_convergence_tol: float = 0.3
@@ -27,6 +40,13 @@ class OptimizationConfig:
     nr_fallback_step_size: float = 0.005
     nr_h: float = 0.01  # Finite difference step
 
+    # Quasi-Newton (BFGS)
+    bfgs_convergence_tol: float = 0.3
+    bfgs_initial_step: float = 0.01  # Length of the first (steepest-ascent) move
+    bfgs_max_step: float = 0.08
+    bfgs_armijo_c: float = 1e-4
+    bfgs_max_backtracks: int = 20
+
     # Simulated Annealing
     sa_initial_temp: float = 1.0
     sa_cooling_rate: float = 0.995
@@ -37,16 +57,35 @@ class OptimizationConfig:
     # Random Restarts
     rr_max_restarts: int = 5
     rr_max_iter_per_restart: int = 50
+    rr_step_size: float = 0.008  # Inner ascent step ('fixed'), or base step of ga_step_mode
 
     # MCMC (Metropolis-Hastings)
     mcmc_proposal_sd: float = 0.03
     mcmc_log_scale: float = 5.0
     mcmc_use_log_posterior: bool = True
-
-
-@dataclass
+    # Proposal adaptation (MCMC_ADAPT_MODES) during the first
+    # mcmc_adapt_iterations steps; the proposal is fixed afterwards
+    mcmc_adapt: str = 'none'
+    mcmc_adapt_iterations: int = 500
+    mcmc_target_accept: float = 0.35  # Near-optimal for a 2-D random walk
+    mcmc_adapt_decay: float = 0.6  # Robbins-Monro gain ~ (t + 1)^-decay
+    mcmc_cov_start: int = 100  # Draws before the proposal follows their covariance
+    mcmc_cov_epsilon: float = 1e-6  # Added to the covariance diagonal
+
+    # Gradient-informed samplers (run_mcmc_chains algorithm='mala' / 'hmc')
+    mala_step_size: float = 0.06
+    hmc_step_size: float = 0.02
+    hmc_n_leapfrog: int = 5
+
+    # Parallel tempering (replica exchange, samplers.run_parallel_tempering)
+    pt_n_temps: int = 8
+    pt_max_temp: float = 20.0
+    pt_swap_interval: int = 1
+
+
+@dataclass(slots=True)
 class OptimizationState:
-    """State of an optimization run."""
+    """State of an optimization run (slotted: fixed layout, no per-instance dict)."""
     x: float
     y: float
     elevation: float
@@ -61,6 +100,9 @@ class OptimizationState:
     step_size: float = 0.0
     gradient_magnitude: float = 0.0
     accepted: Optional[bool] = None  # For MCMC
+    # Step-control memory carried between steps (previous gradient,
+    # velocity, moments, ...); not part of the recorded trajectory
+    memory: Optional[tuple] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self):
         if self.best_x is None:
@@ -71,20 +113,320 @@ class OptimizationState:
             self.best_elevation = self.elevation
 
 
+# Values taken by OptimizationState.convergence_reason; array-backed code
+# stores the index into this tuple instead of the string.
+CONVERGENCE_REASONS = (None, 'gradient_small', 'temperature_min', 'restarts_exhausted',
+                       'step_too_small')
+
+# Array layout of OptimizationState: field name -> storage dtype. Optional
+# fields use sentinel encodings (see decode_state_value).
+STATE_FIELDS = {
+    'x': np.float64,
+    'y': np.float64,
+    'elevation': np.float64,
+    'iteration': np.int64,
+    'converged': np.bool_,
+    'convergence_reason': np.int8,  # Index into CONVERGENCE_REASONS
+    'best_x': np.float64,
+    'best_y': np.float64,
+    'best_elevation': np.float64,
+    'temperature': np.float64,
+    'restarts': np.int64,
+    'step_size': np.float64,
+    'gradient_magnitude': np.float64,
+    'accepted': np.int8,  # -1 for None
+}
+
+# Structured dtype twin of OptimizationState, one record per state
+STATE_DTYPE = np.dtype(list(STATE_FIELDS.items()))
+
+
+def encode_state_value(name: str, value):
+    """Convert an OptimizationState field value to its array encoding."""
+    if name == 'convergence_reason':
+        return CONVERGENCE_REASONS.index(value)
+    if name == 'accepted':
+        return -1 if value is None else int(value)
+    return value
+
+
+def decode_state_value(name: str, value):
+    """Convert an array-encoded field value back to its OptimizationState form."""
+    value = value.item() if isinstance(value, np.generic) else value
+    if name == 'convergence_reason':
+        return CONVERGENCE_REASONS[value]
+    if name == 'accepted':
+        return None if value < 0 else bool(value)
+    return value
+
+
+def states_to_array(states) -> np.ndarray:
+    """Pack a sequence of OptimizationStates into a STATE_DTYPE array."""
+    return np.array(
+        [tuple(encode_state_value(name, getattr(s, name)) for name in STATE_FIELDS) for s in states],
+        dtype=STATE_DTYPE,
+    )
+
+
+def array_to_states(records: np.ndarray) -> list:
+    """Unpack a STATE_DTYPE array into OptimizationStates."""
+    return [
+        OptimizationState(**{name: decode_state_value(name, record[name]) for name in STATE_FIELDS})
+        for record in records
+    ]
+
+
+DERIVATIVE_MODES = ('finite', 'analytic')
+
+# Coarsest pyramid level kept, in grid nodes per axis
+MIN_PYRAMID_SIZE = 32
+
+# (i, j) offsets, in steps of h, of the 9-point value/gradient/Hessian stencil
+DERIVATIVE_STENCIL = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def downsample_grid(elevations: np.ndarray) -> np.ndarray:
+    """
+    Halve a grid's resolution, mipmap style.
+
+    Smooths with a separable [1, 2, 1] / 4 binomial filter (edges
+    extended linearly, so planes pass through unchanged) and resamples
+    bilinearly at the (n - 1) // 2 + 1 nodes per axis that span the same
+    [0, 1] extent, so normalized coordinates mean the same point at every
+    level.
+    """
+    elev = np.asarray(elevations, dtype=np.float64)
+    padded = np.pad(elev, 1, mode='reflect', reflect_type='odd')
+    smooth = (padded[:, :-2] + 2 * padded[:, 1:-1] + padded[:, 2:]) / 4
+    smooth = (smooth[:-2] + 2 * smooth[1:-1] + smooth[2:]) / 4
+
+    rows, cols = elev.shape
+    coarse_rows = (rows - 1) // 2 + 1
+    coarse_cols = (cols - 1) // 2 + 1
+    sampler = TerrainFunction.from_array(smooth)
+    return sampler.get_elevation_batch(np.linspace(0, 1, coarse_cols)[np.newaxis, :],
+                                       np.linspace(0, 1, coarse_rows)[:, np.newaxis])
+
+
+class ElevationCache:
+    """
+    Bounded LRU cache of scalar elevation lookups.
+
+    Keys are the exact (x, y) floats when quantum is 0, so hits return
+    bit-identical values. With quantum > 0 coordinates are rounded to
+    multiples of quantum first, and nearby points share an entry (trading
+    exactness for hit rate).
+    """
+
+    def __init__(self, maxsize: int, quantum: float = 0.0):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if quantum < 0:
+            raise ValueError(f"quantum must be non-negative, got {quantum}")
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, x: float, y: float) -> tuple:
+        if self.quantum:
+            return round(x / self.quantum), round(y / self.quantum)
+        return x, y
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'quantum': self.quantum,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
 class TerrainFunction:
     """Wrapper for terrain data as an objective function."""
 
-    def __init__(self, terrain_data: Dict[str, Any]):
+    def __init__(self, terrain_data: Dict[str, Any], derivatives: str = 'finite',
+                 cache_size: int = 0, cache_quantum: float = 0.0):
         """
         Initialize with terrain data dict (same format as JSON).
 
         Args:
-            terrain_data: Dict with 'elevations', 'grid', 'stats' keys
+            terrain_data: Dict with 'elevations', 'grid', 'stats' keys.
+                An ndarray of elevations is used as-is (not copied), so
+                terrains can wrap shared or memory-mapped grids.
+            derivatives: 'finite' for central differences (matches the JS),
+                or 'analytic' for exact per-cell derivatives of the bilinear
+                surface from a precomputed coefficient table. The exact
+                gradient is discontinuous across cell edges and need not
+                vanish at a peak on a grid node, so gradient-tolerance
+                convergence suits smooth (e.g. synthetic) terrains best.
+            cache_size: Entries in an LRU cache of scalar get_elevation
+                results (0 disables it; see set_cache)
+            cache_quantum: Coordinate rounding for cache keys (0 = exact)
         """
-        self.elevations = np.array(terrain_data['elevations'])
+        if derivatives not in DERIVATIVE_MODES:
+            raise ValueError(f"derivatives must be one of {DERIVATIVE_MODES}, got {derivatives!r}")
+
+        self.elevations = np.asarray(terrain_data['elevations'])
         self.rows = terrain_data['grid']['rows']
         self.cols = terrain_data['grid']['cols']
         self.stats = terrain_data['stats']
+        self.derivatives = derivatives
+        self.cell_coefficients = (
+            self._build_cell_coefficients() if derivatives == 'analytic' else None
+        )
+        self.elevation_cache = None
+        self.set_cache(cache_size, cache_quantum)
+        # Coarser pyramid levels, built on demand by pyramid()
+        self._coarse_levels = []
+
+    @classmethod
+    def from_array(cls, elevations: np.ndarray, stats: Dict[str, Any] = None,
+                   derivatives: str = 'finite', cache_size: int = 0,
+                   cache_quantum: float = 0.0) -> 'TerrainFunction':
+        """Wrap a 2D elevation array without copying it."""
+        if stats is None:
+            stats = {'min': float(elevations.min()), 'max': float(elevations.max()),
+                     'mean': float(elevations.mean())}
+        rows, cols = elevations.shape
+        return cls({
+            'elevations': elevations,
+            'grid': {'rows': rows, 'cols': cols},
+            'stats': stats,
+        }, derivatives=derivatives, cache_size=cache_size, cache_quantum=cache_quantum)
+
+    def set_cache(self, maxsize: int, quantum: float = 0.0) -> None:
+        """
+        Enable (maxsize > 0) or disable (maxsize 0) the elevation cache.
+
+        Scalar lookups revisit points: each Newton stencil (get_derivatives
+        reads through the cache while it is enabled) is centred on the point
+        the previous step just evaluated, a stalled step re-reads all nine,
+        and oscillating gradient ascent re-reads whole stencils. Annealing
+        proposals almost never repeat, and batch methods always bypass the
+        cache. With quantum 0 the cache returns bit-identical values, but it
+        is off by default so runs compared against the JS take exactly the
+        uncached path. The grid is assumed not to change while the cache is
+        enabled.
+        """
+        self.elevation_cache = ElevationCache(maxsize, quantum) if maxsize > 0 else None
+
+    def pyramid(self, levels: int) -> list:
+        """
+        This terrain followed by up to `levels` successively halved copies.
+
+        Levels are built once (see downsample_grid) and reused; the list
+        stops early when the next level would have fewer than
+        MIN_PYRAMID_SIZE nodes per axis. Coarse levels use the same
+        derivatives mode but no elevation cache.
+        """
+        coarse = self._coarse_levels
+        while len(coarse) < levels:
+            finer = coarse[-1] if coarse else self
+            if min(finer.rows, finer.cols) < 2 * MIN_PYRAMID_SIZE - 1:
+                break
+            coarse.append(TerrainFunction.from_array(
+                downsample_grid(finer.elevations), derivatives=self.derivatives))
+        return [self] + coarse[:levels]
+
+    def cache_info(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss/eviction statistics of the elevation cache, or None if disabled."""
+        return None if self.elevation_cache is None else self.elevation_cache.info()
+
+    def _build_cell_coefficients(self) -> np.ndarray:
+        """
+        Precompute per-cell polynomial coefficients for analytic derivatives.
+
+        Within cell (r, c) the bilinear surface is
+            f = a + b*dx + c*dy + d*dx*dy
+        with dx, dy the fractional offsets into the cell. A bilinear patch
+        has zero pure second derivatives, so fxx and fyy are instead
+        bilinearly interpolated from second differences at the grid nodes
+        and stored the same way. Returns an array of shape
+        (rows - 1, cols - 1, 12): value, fxx and fyy coefficients (a, b, c, d).
+        """
+        elev = self.elevations.astype(float)
+        sx = self.cols - 1
+        sy = self.rows - 1
+
+        node_fxx = np.zeros_like(elev)
+        node_fyy = np.zeros_like(elev)
+        if self.cols >= 3:
+            node_fxx[:, 1:-1] = (elev[:, 2:] - 2 * elev[:, 1:-1] + elev[:, :-2]) * sx * sx
+            node_fxx[:, 0] = node_fxx[:, 1]
+            node_fxx[:, -1] = node_fxx[:, -2]
+        if self.rows >= 3:
+            node_fyy[1:-1, :] = (elev[2:, :] - 2 * elev[1:-1, :] + elev[:-2, :]) * sy * sy
+            node_fyy[0, :] = node_fyy[1, :]
+            node_fyy[-1, :] = node_fyy[-2, :]
+
+        def bilinear_coefficients(grid):
+            v00 = grid[:-1, :-1]
+            v01 = grid[:-1, 1:]
+            v10 = grid[1:, :-1]
+            v11 = grid[1:, 1:]
+            return [v00, v01 - v00, v10 - v00, v00 - v01 - v10 + v11]
+
+        return np.stack(
+            bilinear_coefficients(elev)
+            + bilinear_coefficients(node_fxx)
+            + bilinear_coefficients(node_fyy),
+            axis=-1,
+        )
+
+    def _analytic_derivatives(self, x: float, y: float) -> Tuple[float, ...]:
+        """Value, gradient and Hessian at one point from a single cell lookup."""
+        sx = self.cols - 1
+        sy = self.rows - 1
+        # Past the far edge get_elevation holds the edge value; below zero it
+        # extrapolates the first cell, as the patch here does
+        col = min(x * sx, sx)
+        row = min(y * sy, sy)
+        c = max(0, min(math.floor(col), sx - 1))
+        r = max(0, min(math.floor(row), sy - 1))
+        dx = col - c
+        dy = row - r
+
+        a, b, cy, d, xa, xb, xc, xd, ya, yb, yc, yd = self.cell_coefficients[r, c].tolist()
+        f = a + b * dx + cy * dy + d * dx * dy
+        fx = (b + d * dy) * sx
+        fy = (cy + d * dx) * sy
+        fxx = xa + xb * dx + xc * dy + xd * dx * dy
+        fyy = ya + yb * dx + yc * dy + yd * dx * dy
+        fxy = d * sx * sy
+        return f, fx, fy, fxx, fyy, fxy
+
+    def _analytic_derivatives_batch(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Vectorized _analytic_derivatives."""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        sx = self.cols - 1
+        sy = self.rows - 1
+        col = np.minimum(x * sx, sx)
+        row = np.minimum(y * sy, sy)
+        c = np.clip(np.floor(col).astype(np.intp), 0, sx - 1)
+        r = np.clip(np.floor(row).astype(np.intp), 0, sy - 1)
+        dx = col - c
+        dy = row - r
+
+        coef = self.cell_coefficients[r, c]
+        a, b, cy, d = coef[..., 0], coef[..., 1], coef[..., 2], coef[..., 3]
+        f = a + b * dx + cy * dy + d * dx * dy
+        fx = (b + d * dy) * sx
+        fy = (cy + d * dx) * sy
+        fxx = coef[..., 4] + coef[..., 5] * dx + coef[..., 6] * dy + coef[..., 7] * dx * dy
+        fyy = coef[..., 8] + coef[..., 9] * dx + coef[..., 10] * dy + coef[..., 11] * dx * dy
+        fxy = d * sx * sy
+        return f, fx, fy, fxx, fyy, fxy
 
     def __call__(self, x: float, y: float) -> float:
         """Get elevation at normalized coordinates (0-1)."""
@@ -101,6 +443,17 @@ class TerrainFunction:
         Returns:
             Interpolated elevation value
         """
+        cache = self.elevation_cache
+        if cache is not None:
+            key = cache.key(x, y) if cache.quantum else (x, y)
+            entries = cache.entries
+            value = entries.get(key)
+            if value is not None:
+                cache.hits += 1
+                entries.move_to_end(key)
+                return value
+            cache.misses += 1
+
         col = x * (self.cols - 1)
         row = y * (self.rows - 1)
 
@@ -122,16 +475,66 @@ class TerrainFunction:
                      v10 * (1 - dx) * dy +
                      v11 * dx * dy)
 
-        return float(elevation)
+        elevation = float(elevation)
+        if cache is not None:
+            entries[key] = elevation
+            if len(entries) > cache.maxsize:
+                entries.popitem(last=False)
+                cache.evictions += 1
+        return elevation
+
+    def get_elevation_batch(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Get elevations for many points in one vectorized pass.
+
+        Performs exactly the same arithmetic as get_elevation, element-wise,
+        so results are bit-for-bit identical to calling it in a loop.
+
+        Args:
+            x: Array of normalized x coordinates (0-1, west to east)
+            y: Array of normalized y coordinates (0-1, south to north)
+
+        Returns:
+            Array of interpolated elevations, broadcast shape of x and y
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+
+        col = x * (self.cols - 1)
+        row = y * (self.rows - 1)
+
+        # astype truncates toward zero, matching int() in the scalar path
+        col0 = np.clip(col.astype(np.intp), 0, self.cols - 1)
+        row0 = np.clip(row.astype(np.intp), 0, self.rows - 1)
+        col1 = np.minimum(col0 + 1, self.cols - 1)
+        row1 = np.minimum(row0 + 1, self.rows - 1)
+
+        dx = col - col0
+        dy = row - row0
+
+        v00 = self.elevations[row0, col0]
+        v01 = self.elevations[row0, col1]
+        v10 = self.elevations[row1, col0]
+        v11 = self.elevations[row1, col1]
+
+        return (v00 * (1 - dx) * (1 - dy) +
+                v01 * dx * (1 - dy) +
+                v10 * (1 - dx) * dy +
+                v11 * dx * dy)
 
     def get_gradient(self, x: float, y: float, h: float = 0.01) -> Tuple[float, float]:
-        """Compute gradient using central differences."""
+        """Compute gradient using central differences (or analytically)."""
+        if self.derivatives == 'analytic':
+            _, fx, fy, _, _, _ = self._analytic_derivatives(x, y)
+            return fx, fy
         dx = (self.get_elevation(x + h, y) - self.get_elevation(x - h, y)) / (2 * h)
         dy = (self.get_elevation(x, y + h) - self.get_elevation(x, y - h)) / (2 * h)
         return dx, dy
 
     def get_hessian_diag(self, x: float, y: float, h: float = 0.01) -> Tuple[float, float]:
         """Compute diagonal elements of Hessian."""
+        if self.derivatives == 'analytic':
+            _, _, _, fxx, fyy, _ = self._analytic_derivatives(x, y)
+            return fxx, fyy
         f = self.get_elevation(x, y)
         fxx = (self.get_elevation(x + h, y) - 2 * f + self.get_elevation(x - h, y)) / (h * h)
         fyy = (self.get_elevation(x, y + h) - 2 * f + self.get_elevation(x, y - h)) / (h * h)
@@ -139,6 +542,9 @@ class TerrainFunction:
 
     def get_full_hessian(self, x: float, y: float, h: float = 0.01) -> Tuple[float, float, float]:
         """Compute full 2x2 Hessian including mixed partial derivative."""
+        if self.derivatives == 'analytic':
+            _, _, _, fxx, fyy, fxy = self._analytic_derivatives(x, y)
+            return fxx, fyy, fxy
         f = self.get_elevation(x, y)
         fxx = (self.get_elevation(x + h, y) - 2 * f + self.get_elevation(x - h, y)) / (h * h)
         fyy = (self.get_elevation(x, y + h) - 2 * f + self.get_elevation(x, y - h)) / (h * h)
@@ -146,6 +552,97 @@ class TerrainFunction:
                - self.get_elevation(x - h, y + h) + self.get_elevation(x - h, y - h)) / (4 * h * h)
         return fxx, fyy, fxy
 
+    def get_derivatives(self, x: float, y: float, h: float = 0.01) -> Tuple[float, ...]:
+        """
+        Value, gradient and full Hessian at one point.
+
+        In 'analytic' mode this is a single coefficient-table lookup (h is
+        ignored); in 'finite' mode it is the 9-point central-difference
+        stencil shared between gradient and Hessian, read point by point
+        through the elevation cache when one is enabled.
+
+        Returns:
+            Tuple (f, fx, fy, fxx, fyy, fxy)
+        """
+        if self.derivatives == 'analytic':
+            return self._analytic_derivatives(x, y)
+        if self.elevation_cache is not None:
+            samples = [self.get_elevation(x if i == 0 else (x + h if i > 0 else x - h),
+                                          y if j == 0 else (y + h if j > 0 else y - h))
+                       for i, j in DERIVATIVE_STENCIL]
+            return self._stencil_derivatives(samples, h)
+        return tuple(float(v[0]) for v in self.get_derivatives_batch([x], [y], h))
+
+    @staticmethod
+    def _stencil_derivatives(samples, h: float) -> Tuple:
+        """(f, fx, fy, fxx, fyy, fxy) from elevations at DERIVATIVE_STENCIL."""
+        f, fxp, fxm, fyp, fym, fpp, fpm, fmp, fmm = samples
+        fx = (fxp - fxm) / (2 * h)
+        fy = (fyp - fym) / (2 * h)
+        fxx = (fxp - 2 * f + fxm) / (h * h)
+        fyy = (fyp - 2 * f + fym) / (h * h)
+        fxy = (fpp - fpm - fmp + fmm) / (4 * h * h)
+        return f, fx, fy, fxx, fyy, fxy
+
+    def _stencil_batch(self, x: np.ndarray, y: np.ndarray, h: float,
+                       offsets: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+        """
+        Evaluate elevations at (x + i*h, y + j*h) for each (i, j) in offsets.
+
+        All stencil points for all N input points are stacked into a single
+        get_elevation_batch call. Returns an array of shape (len(offsets), N...).
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        sx = np.stack([x if i == 0 else (x + h if i > 0 else x - h) for i, _ in offsets])
+        sy = np.stack([y if j == 0 else (y + h if j > 0 else y - h) for _, j in offsets])
+        return self.get_elevation_batch(sx, sy)
+
+    def get_gradient_batch(self, x: np.ndarray, y: np.ndarray,
+                           h: float = 0.01) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized get_gradient over arrays of points."""
+        if self.derivatives == 'analytic':
+            _, fx, fy, _, _, _ = self._analytic_derivatives_batch(x, y)
+            return fx, fy
+        fxp, fxm, fyp, fym = self._stencil_batch(x, y, h, ((1, 0), (-1, 0), (0, 1), (0, -1)))
+        return (fxp - fxm) / (2 * h), (fyp - fym) / (2 * h)
+
+    def get_hessian_diag_batch(self, x: np.ndarray, y: np.ndarray,
+                               h: float = 0.01) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized get_hessian_diag over arrays of points."""
+        if self.derivatives == 'analytic':
+            _, _, _, fxx, fyy, _ = self._analytic_derivatives_batch(x, y)
+            return fxx, fyy
+        f, fxp, fxm, fyp, fym = self._stencil_batch(
+            x, y, h, ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)))
+        fxx = (fxp - 2 * f + fxm) / (h * h)
+        fyy = (fyp - 2 * f + fym) / (h * h)
+        return fxx, fyy
+
+    def get_full_hessian_batch(self, x: np.ndarray, y: np.ndarray,
+                               h: float = 0.01) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized get_full_hessian over arrays of points."""
+        _, _, _, fxx, fyy, fxy = self.get_derivatives_batch(x, y, h)
+        return fxx, fyy, fxy
+
+    def get_derivatives_batch(self, x: np.ndarray, y: np.ndarray, h: float = 0.01
+                              ) -> Tuple[np.ndarray, ...]:
+        """
+        Value, gradient and full Hessian for N points from one 9-point stencil.
+
+        Separate get_gradient and get_full_hessian calls spend 4 + 9
+        evaluations; here the axis samples are shared between the two, so
+        a Newton step (scalar or population) costs 9 evaluations per point.
+        Each output is bit-for-bit identical to the corresponding scalar
+        method. In
+        'analytic' mode it is a single coefficient-table lookup per point.
+
+        Returns:
+            Tuple of arrays (f, fx, fy, fxx, fyy, fxy)
+        """
+        if self.derivatives == 'analytic':
+            return self._analytic_derivatives_batch(x, y)
+        return self._stencil_derivatives(self._stencil_batch(x, y, h, DERIVATIVE_STENCIL), h)
+
 
 def clamp(x: float, min_val: float = 0.0, max_val: float = 1.0) -> float:
     """Clamp value to range."""
@@ -157,6 +654,102 @@ def gradient_magnitude(grad: Tuple[float, float]) -> float:
     return math.sqrt(grad[0] ** 2 + grad[1] ** 2)
 
 
+GA_STEP_MODES = ('fixed', 'armijo', 'bb', 'momentum', 'adam')
+
+
+def _controlled_step(
+    state: OptimizationState,
+    terrain: TerrainFunction,
+    config: OptimizationConfig,
+    grad: Tuple[float, float],
+    magnitude: float,
+    base_step: float
+) -> Tuple[float, float, float, float]:
+    """
+    Ascent move chosen by config.ga_step_mode (any mode but 'fixed').
+
+    'armijo'    backtracking line search on x + alpha * grad, starting from
+                twice the last accepted alpha, until the rise is at least
+                ga_armijo_c * alpha * |grad|^2
+    'bb'        Barzilai-Borwein move (|s|^2 / |s . dg|) * grad from the
+                previous step s and gradient change dg, or a base_step move
+                when the curvature along s is not negative
+    'momentum'  heavy-ball velocity, learning rate set so that the first
+                move is base_step long
+    'adam'      Adam update on the raw gradient
+
+    Every move is capped at ga_max_step. Updates state.memory.
+
+    Returns:
+        (new_x, new_y, new_elevation, step_length), or None when the line
+        search finds no uphill move
+    """
+    mode = config.ga_step_mode
+    memory = state.memory
+    dir_x = grad[0] / magnitude
+    dir_y = grad[1] / magnitude
+
+    if mode == 'armijo':
+        # alpha scales the raw gradient, so moves shrink as the slope flattens
+        alpha = 2 * memory[0] if memory else math.inf
+        alpha = min(alpha, config.ga_max_step / magnitude)
+        for _ in range(config.ga_armijo_max_backtracks):
+            new_x = clamp(state.x + alpha * grad[0])
+            new_y = clamp(state.y + alpha * grad[1])
+            new_elevation = terrain(new_x, new_y)
+            if new_elevation >= state.elevation + config.ga_armijo_c * alpha * magnitude ** 2:
+                state.memory = (alpha,)
+                return new_x, new_y, new_elevation, alpha * magnitude
+            alpha *= config.ga_armijo_shrink
+        # No uphill move at any length: the finite-difference gradient is
+        # not resolving the surface any more
+        return None
+
+    if mode == 'bb':
+        length = base_step
+        if memory is not None:
+            sx, sy = state.x - memory[0], state.y - memory[1]
+            dgx, dgy = grad[0] - memory[2], grad[1] - memory[3]
+            curvature = sx * dgx + sy * dgy
+            if curvature < 0:
+                length = min((sx * sx + sy * sy) / -curvature * magnitude, config.ga_max_step)
+        state.memory = (state.x, state.y, grad[0], grad[1])
+        step_x, step_y = dir_x * length, dir_y * length
+
+    elif mode == 'momentum':
+        # Learning rate fixed so the first move is base_step long
+        vx, vy, rate = memory if memory is not None else (0.0, 0.0, base_step / magnitude)
+        step_x = config.ga_momentum * vx + rate * grad[0]
+        step_y = config.ga_momentum * vy + rate * grad[1]
+
+    elif mode == 'adam':
+        mx, my, vx, vy, t = memory if memory is not None else (0.0, 0.0, 0.0, 0.0, 0)
+        b1, b2 = config.ga_adam_beta1, config.ga_adam_beta2
+        t += 1
+        mx = b1 * mx + (1 - b1) * grad[0]
+        my = b1 * my + (1 - b1) * grad[1]
+        vx = b2 * vx + (1 - b2) * grad[0] ** 2
+        vy = b2 * vy + (1 - b2) * grad[1] ** 2
+        state.memory = (mx, my, vx, vy, t)
+        step_x = config.ga_adam_lr * (mx / (1 - b1 ** t)) / (math.sqrt(vx / (1 - b2 ** t)) + config.ga_adam_eps)
+        step_y = config.ga_adam_lr * (my / (1 - b1 ** t)) / (math.sqrt(vy / (1 - b2 ** t)) + config.ga_adam_eps)
+
+    else:
+        raise ValueError(f"ga_step_mode must be one of {GA_STEP_MODES}, got {mode!r}")
+
+    length = math.sqrt(step_x ** 2 + step_y ** 2)
+    if length > config.ga_max_step:
+        step_x *= config.ga_max_step / length
+        step_y *= config.ga_max_step / length
+        length = config.ga_max_step
+    if mode == 'momentum':
+        state.memory = (step_x, step_y, rate)
+
+    new_x = clamp(state.x + step_x)
+    new_y = clamp(state.y + step_y)
+    return new_x, new_y, terrain(new_x, new_y), length
+
+
 def step_gradient_ascent(
     state: OptimizationState,
     terrain: TerrainFunction,
@@ -164,7 +757,8 @@ def step_gradient_ascent(
 ) -> OptimizationState:
     """
     Gradient Ascent step.
-    Takes a fixed-size step in the direction of steepest ascent.
+    Takes a fixed-size step in the direction of steepest ascent, or one
+    sized by config.ga_step_mode (see _controlled_step).
     """
     if config is None:
         config = OptimizationConfig()
@@ -178,6 +772,21 @@ def step_gradient_ascent(
         state.convergence_reason = 'gradient_small'
         return state
 
+    if config.ga_step_mode != 'fixed':
+        move = _controlled_step(state, terrain, config, grad, magnitude, config.ga_step_size)
+        if move is None:
+            state.converged = True
+            state.convergence_reason = 'step_too_small'
+            return state
+        state.x, state.y, state.elevation, state.step_size = move
+        state.iteration += 1
+        state.gradient_magnitude = magnitude
+        if state.elevation > state.best_elevation:
+            state.best_x = state.x
+            state.best_y = state.y
+            state.best_elevation = state.elevation
+        return state
+
     # Normalize step
     step_x = (grad[0] / magnitude) * config.ga_step_size
     step_y = (grad[1] / magnitude) * config.ga_step_size
@@ -214,7 +823,9 @@ def step_newton_raphson(
         config = OptimizationConfig()
 
     h = config.nr_h
-    grad = terrain.get_gradient(state.x, state.y, h)
+    # Gradient and Hessian from one stencil (or one cell lookup)
+    _, fx, fy, fxx, fyy, fxy = terrain.get_derivatives(state.x, state.y, h)
+    grad = (fx, fy)
     magnitude = gradient_magnitude(grad)
 
     # Convergence check
@@ -223,9 +834,6 @@ def step_newton_raphson(
         state.convergence_reason = 'gradient_small'
         return state
 
-    # Get full 2x2 Hessian
-    fxx, fyy, fxy = terrain.get_full_hessian(state.x, state.y, h)
-
     # Newton step using full Hessian inverse: step = -H^{-1} * grad
     # For maximization, H must be negative definite: fxx < 0, fyy < 0, det > 0
     det = fxx * fyy - fxy * fxy
@@ -277,6 +885,98 @@ def step_newton_raphson(
     return state
 
 
+def step_bfgs(
+    state: OptimizationState,
+    terrain: TerrainFunction,
+    config: OptimizationConfig = None
+) -> OptimizationState:
+    """
+    Quasi-Newton (BFGS) step.
+    Builds an inverse-Hessian approximation from successive gradients, so
+    each step costs one gradient plus a short backtracking line search and
+    never a finite-difference Hessian. In two dimensions the full 2x2
+    approximation is as cheap as a limited-memory one, so it is kept in
+    state.memory as (x, y, gx, gy, hxx, hxy, hyy) from the previous step.
+    """
+    if config is None:
+        config = OptimizationConfig()
+
+    grad = terrain.get_gradient(state.x, state.y)
+    magnitude = gradient_magnitude(grad)
+
+    # Convergence check
+    if magnitude < config.bfgs_convergence_tol:
+        state.converged = True
+        state.convergence_reason = 'gradient_small'
+        return state
+
+    # Inverse Hessian of -f; start from a scaled identity
+    hxx = hyy = config.bfgs_initial_step / magnitude
+    hxy = 0.0
+    if state.memory is not None:
+        px, py, pgx, pgy, mxx, mxy, myy = state.memory
+        sx, sy = state.x - px, state.y - py
+        # Gradient change of -f
+        yx, yy = pgx - grad[0], pgy - grad[1]
+        sy_dot = sx * yx + sy * yy
+        if sy_dot > 1e-12:
+            # H <- (I - rho s y^T) H (I - rho y s^T) + rho s s^T
+            rho = 1.0 / sy_dot
+            hy_x = mxx * yx + mxy * yy
+            hy_y = mxy * yx + myy * yy
+            yhy = yx * hy_x + yy * hy_y
+            hxx = mxx - rho * 2 * sx * hy_x + (rho * rho * yhy + rho) * sx * sx
+            hxy = mxy - rho * (sx * hy_y + sy * hy_x) + (rho * rho * yhy + rho) * sx * sy
+            hyy = myy - rho * 2 * sy * hy_y + (rho * rho * yhy + rho) * sy * sy
+        else:
+            hxx, hxy, hyy = mxx, mxy, myy
+
+    # Ascent direction H * grad; reset to steepest ascent if it is not uphill
+    step_x = hxx * grad[0] + hxy * grad[1]
+    step_y = hxy * grad[0] + hyy * grad[1]
+    if step_x * grad[0] + step_y * grad[1] <= 0:
+        hxx = hyy = config.bfgs_initial_step / magnitude
+        hxy = 0.0
+        step_x = hxx * grad[0]
+        step_y = hyy * grad[1]
+
+    length = math.sqrt(step_x ** 2 + step_y ** 2)
+    if length > config.bfgs_max_step:
+        step_x *= config.bfgs_max_step / length
+        step_y *= config.bfgs_max_step / length
+
+    # Backtracking line search for sufficient increase
+    slope = step_x * grad[0] + step_y * grad[1]
+    t = 1.0
+    for _ in range(config.bfgs_max_backtracks):
+        new_x = clamp(state.x + t * step_x)
+        new_y = clamp(state.y + t * step_y)
+        new_elevation = terrain(new_x, new_y)
+        if new_elevation >= state.elevation + config.bfgs_armijo_c * t * slope:
+            break
+        t *= 0.5
+    else:
+        state.converged = True
+        state.convergence_reason = 'step_too_small'
+        return state
+
+    state.memory = (state.x, state.y, grad[0], grad[1], hxx, hxy, hyy)
+    state.x = new_x
+    state.y = new_y
+    state.elevation = new_elevation
+    state.iteration += 1
+    state.step_size = t * math.sqrt(step_x ** 2 + step_y ** 2)
+    state.gradient_magnitude = magnitude
+
+    # Update best
+    if state.elevation > state.best_elevation:
+        state.best_x = state.x
+        state.best_y = state.y
+        state.best_elevation = state.elevation
+
+    return state
+
+
 def step_simulated_annealing(
     state: OptimizationState,
     terrain: TerrainFunction,
@@ -349,7 +1049,12 @@ def step_random_restarts(
     local_iteration = state.iteration - state.restarts * config.rr_max_iter_per_restart
 
     # Check if current restart converged
-    if magnitude < 0.5 or local_iteration >= config.rr_max_iter_per_restart:
+    restart = magnitude < 0.5 or local_iteration >= config.rr_max_iter_per_restart
+    if not restart and config.ga_step_mode != 'fixed':
+        move = _controlled_step(state, terrain, config, grad, magnitude, config.rr_step_size)
+        restart = move is None
+
+    if restart:
         state.restarts += 1
 
         # Update best
@@ -372,10 +1077,20 @@ def step_random_restarts(
         state.y = rng.random()
         state.elevation = terrain(state.x, state.y)
         state.iteration += 1
+        state.memory = None
+        return state
+
+    if config.ga_step_mode != 'fixed':
+        state.x, state.y, state.elevation, state.step_size = move
+        state.iteration += 1
+        if state.elevation > state.best_elevation:
+            state.best_x = state.x
+            state.best_y = state.y
+            state.best_elevation = state.elevation
         return state
 
     # Gradient step
-    step_size = 0.008
+    step_size = config.rr_step_size
     step_x = (grad[0] / magnitude) * step_size
     step_y = (grad[1] / magnitude) * step_size
 
@@ -396,6 +1111,103 @@ def step_random_restarts(
     return state
 
 
+MCMC_ADAPT_MODES = ('none', 'scale', 'covariance')
+
+# Haario et al.'s 2.38^2 / d proposal covariance factor for d = 2
+MCMC_COV_SCALE = 2.38 / math.sqrt(2)
+
+
+def _mcmc_log_accept_ratio(proposed_elevation: float, current_elevation: float,
+                           config: OptimizationConfig) -> float:
+    """Log Metropolis ratio of the elevation posterior."""
+    if config.mcmc_use_log_posterior:
+        # Use log(elevation) as log-posterior for more realistic MCMC behavior
+        log_proposal_posterior = math.log(max(1, proposed_elevation))
+        log_current_posterior = math.log(max(1, current_elevation))
+        return (log_proposal_posterior - log_current_posterior) * config.mcmc_log_scale
+    # Direct elevation comparison
+    return proposed_elevation - current_elevation
+
+
+def _step_adaptive_mcmc(
+    state: OptimizationState,
+    terrain: TerrainFunction,
+    config: OptimizationConfig,
+    rng: np.random.Generator
+) -> OptimizationState:
+    """
+    Metropolis-Hastings step with a proposal adapted by config.mcmc_adapt.
+
+    'scale'       Robbins-Monro: after each step the log proposal scale
+                  moves by (alpha - mcmc_target_accept) / (t + 1)^mcmc_adapt_decay,
+                  alpha being the step's acceptance probability
+    'covariance'  as 'scale', and once mcmc_cov_start draws have been seen
+                  the proposal is N(0, s^2 * 2.38^2 / 2 * (C + eps I)), C the
+                  running covariance of the draws (adaptive Metropolis,
+                  Haario et al. 2001, with Andrieu & Thoms' global scaling)
+
+    Adaptation runs for the first mcmc_adapt_iterations steps (counted by
+    state.iteration); later steps keep the final proposal, so draws after
+    warm-up come from a fixed Metropolis kernel. state.memory holds
+    (log_scale, n, mean_x, mean_y, sxx, sxy, syy).
+    """
+    mode = config.mcmc_adapt
+    if mode not in MCMC_ADAPT_MODES:
+        raise ValueError(f"mcmc_adapt must be one of {MCMC_ADAPT_MODES}, got {mode!r}")
+
+    memory = state.memory if state.memory is not None else (0.0, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    log_scale, n, mean_x, mean_y, sxx, sxy, syy = memory
+
+    z_x = rng.standard_normal()
+    z_y = rng.standard_normal()
+    if mode == 'covariance' and n >= config.mcmc_cov_start:
+        # Cholesky factor of the regularised draw covariance
+        factor = math.exp(log_scale) * MCMC_COV_SCALE
+        cxx = sxx / (n - 1) + config.mcmc_cov_epsilon
+        cxy = sxy / (n - 1)
+        cyy = syy / (n - 1) + config.mcmc_cov_epsilon
+        l11 = math.sqrt(cxx)
+        l21 = cxy / l11
+        l22 = math.sqrt(max(cyy - l21 * l21, config.mcmc_cov_epsilon))
+        proposed_x = state.x + factor * l11 * z_x
+        proposed_y = state.y + factor * (l21 * z_x + l22 * z_y)
+    else:
+        scale = config.mcmc_proposal_sd * math.exp(log_scale)
+        proposed_x = state.x + z_x * scale
+        proposed_y = state.y + z_y * scale
+
+    # Out-of-bounds proposals are rejected (alpha = 0), as in step_mcmc
+    accepted = False
+    alpha = 0.0
+    if 0.01 <= proposed_x <= 0.99 and 0.01 <= proposed_y <= 0.99:
+        proposed_elevation = terrain(proposed_x, proposed_y)
+        log_accept_ratio = _mcmc_log_accept_ratio(proposed_elevation, state.elevation, config)
+        alpha = math.exp(min(0.0, log_accept_ratio))
+        accepted = math.log(rng.random()) < log_accept_ratio
+        if accepted:
+            state.x = proposed_x
+            state.y = proposed_y
+            state.elevation = proposed_elevation
+
+    if state.iteration < config.mcmc_adapt_iterations:
+        log_scale += (alpha - config.mcmc_target_accept) / (state.iteration + 1) ** config.mcmc_adapt_decay
+        if mode == 'covariance':
+            # Welford update of the draw mean and co-moment sums
+            n += 1
+            dx = state.x - mean_x
+            dy = state.y - mean_y
+            mean_x += dx / n
+            mean_y += dy / n
+            sxx += dx * (state.x - mean_x)
+            sxy += dx * (state.y - mean_y)
+            syy += dy * (state.y - mean_y)
+        state.memory = (log_scale, n, mean_x, mean_y, sxx, sxy, syy)
+
+    state.iteration += 1
+    state.accepted = accepted
+    return state
+
+
 def step_mcmc(
     state: OptimizationState,
     terrain: TerrainFunction,
@@ -410,6 +1222,9 @@ def step_mcmc(
     Unlike optimization algorithms, MCMC doesn't converge to a point -
     it samples from the posterior distribution proportional to elevation.
 
+    With config.mcmc_adapt other than 'none' the proposal adapts during
+    warm-up (see _step_adaptive_mcmc).
+
     Args:
         state: Current chain state
         terrain: Objective function (elevation as posterior)
@@ -423,6 +1238,8 @@ def step_mcmc(
         config = OptimizationConfig()
     if rng is None:
         rng = np.random.default_rng()
+    if config.mcmc_adapt != 'none':
+        return _step_adaptive_mcmc(state, terrain, config, rng)
 
     current_elevation = state.elevation
 
@@ -437,16 +1254,7 @@ def step_mcmc(
         return state
 
     proposed_elevation = terrain(proposed_x, proposed_y)
-
-    # Compute log acceptance ratio
-    if config.mcmc_use_log_posterior:
-        # Use log(elevation) as log-posterior for more realistic MCMC behavior
-        log_proposal_posterior = math.log(max(1, proposed_elevation))
-        log_current_posterior = math.log(max(1, current_elevation))
-        log_accept_ratio = (log_proposal_posterior - log_current_posterior) * config.mcmc_log_scale
-    else:
-        # Direct elevation comparison
-        log_accept_ratio = proposed_elevation - current_elevation
+    log_accept_ratio = _mcmc_log_accept_ratio(proposed_elevation, current_elevation, config)
 
     # Metropolis acceptance criterion
     accepted = math.log(rng.random()) < log_accept_ratio
@@ -462,13 +1270,193 @@ def step_mcmc(
     return state
 
 
+def _mcmc_log_posterior(elevation: float, config: OptimizationConfig) -> float:
+    """Log posterior whose differences _mcmc_log_accept_ratio computes."""
+    if config.mcmc_use_log_posterior:
+        return math.log(max(1, elevation)) * config.mcmc_log_scale
+    return elevation
+
+
+def _mcmc_log_posterior_gradient(terrain: TerrainFunction, x: float, y: float, elevation: float,
+                                 config: OptimizationConfig) -> Tuple[float, float]:
+    """Gradient of _mcmc_log_posterior (zero where max(1, elevation) is flat)."""
+    gx, gy = terrain.get_gradient(x, y)
+    if not config.mcmc_use_log_posterior:
+        return gx, gy
+    if elevation <= 1:
+        return 0.0, 0.0
+    factor = config.mcmc_log_scale / elevation
+    return gx * factor, gy * factor
+
+
+def _in_sampler_bounds(x: float, y: float) -> bool:
+    return 0.01 <= x <= 0.99 and 0.01 <= y <= 0.99
+
+
+def _cached_log_posterior_gradient(state: OptimizationState, terrain: TerrainFunction,
+                                   config: OptimizationConfig) -> Tuple[float, float]:
+    """Gradient at the chain's position, reusing state.memory = (x, y, gx, gy)."""
+    memory = state.memory
+    if memory is not None and memory[0] == state.x and memory[1] == state.y:
+        return memory[2], memory[3]
+    return _mcmc_log_posterior_gradient(terrain, state.x, state.y, state.elevation, config)
+
+
+def step_mala(
+    state: OptimizationState,
+    terrain: TerrainFunction,
+    config: OptimizationConfig = None,
+    rng: np.random.Generator = None
+) -> OptimizationState:
+    """
+    Single Metropolis-adjusted Langevin step on step_mcmc's posterior.
+
+    Proposes x' = x + (eps^2 / 2) grad log p(x) + eps z with
+    eps = config.mala_step_size, and accepts with the Metropolis-Hastings
+    ratio including the asymmetric proposal densities. The gradient is the
+    terrain's (finite-difference or analytic) one: any deterministic drift
+    keeps the chain exact, a better one just moves it further. One
+    gradient per step, at the proposal; the current point's gradient is
+    kept in state.memory.
+
+    Returns:
+        Updated state with acceptance info
+    """
+    if config is None:
+        config = OptimizationConfig()
+    if rng is None:
+        rng = np.random.default_rng()
+
+    eps = config.mala_step_size
+    half_eps2 = 0.5 * eps * eps
+    gx, gy = _cached_log_posterior_gradient(state, terrain, config)
+
+    proposed_x = state.x + half_eps2 * gx + eps * rng.standard_normal()
+    proposed_y = state.y + half_eps2 * gy + eps * rng.standard_normal()
+
+    state.iteration += 1
+    state.accepted = False
+    state.memory = (state.x, state.y, gx, gy)
+    if not _in_sampler_bounds(proposed_x, proposed_y):
+        return state
+
+    proposed_elevation = terrain(proposed_x, proposed_y)
+    pgx, pgy = _mcmc_log_posterior_gradient(terrain, proposed_x, proposed_y, proposed_elevation, config)
+
+    # log q(x | x') - log q(x' | x) for the Langevin proposals
+    forward = (proposed_x - state.x - half_eps2 * gx) ** 2 + (proposed_y - state.y - half_eps2 * gy) ** 2
+    backward = (state.x - proposed_x - half_eps2 * pgx) ** 2 + (state.y - proposed_y - half_eps2 * pgy) ** 2
+    log_accept_ratio = (_mcmc_log_accept_ratio(proposed_elevation, state.elevation, config)
+                        + (forward - backward) / (2 * eps * eps))
+
+    if math.log(rng.random()) < log_accept_ratio:
+        state.x = proposed_x
+        state.y = proposed_y
+        state.elevation = proposed_elevation
+        state.accepted = True
+        state.memory = (proposed_x, proposed_y, pgx, pgy)
+    return state
+
+
+def step_hmc(
+    state: OptimizationState,
+    terrain: TerrainFunction,
+    config: OptimizationConfig = None,
+    rng: np.random.Generator = None
+) -> OptimizationState:
+    """
+    Single Hamiltonian Monte Carlo step on step_mcmc's posterior.
+
+    Draws a unit-mass momentum, follows hmc_n_leapfrog leapfrog steps of
+    size hmc_step_size and accepts the end point with probability
+    min(1, exp(-dH)). A trajectory that leaves the sampling box is
+    rejected at once (the posterior is zero outside it). Costs
+    hmc_n_leapfrog gradients per step; the current point's gradient is
+    kept in state.memory.
+
+    Returns:
+        Updated state with acceptance info
+    """
+    if config is None:
+        config = OptimizationConfig()
+    if rng is None:
+        rng = np.random.default_rng()
+
+    eps = config.hmc_step_size
+    gx, gy = _cached_log_posterior_gradient(state, terrain, config)
+    state.iteration += 1
+    state.accepted = False
+    state.memory = (state.x, state.y, gx, gy)
+
+    px = rng.standard_normal()
+    py = rng.standard_normal()
+    log_u = math.log(rng.random())
+    kinetic = 0.5 * (px * px + py * py)
+
+    x, y = state.x, state.y
+    elevation = state.elevation
+    for _ in range(config.hmc_n_leapfrog):
+        px += 0.5 * eps * gx
+        py += 0.5 * eps * gy
+        x += eps * px
+        y += eps * py
+        if not _in_sampler_bounds(x, y):
+            return state
+        elevation = terrain(x, y)
+        gx, gy = _mcmc_log_posterior_gradient(terrain, x, y, elevation, config)
+        px += 0.5 * eps * gx
+        py += 0.5 * eps * gy
+
+    log_accept_ratio = (_mcmc_log_accept_ratio(elevation, state.elevation, config)
+                        + kinetic - 0.5 * (px * px + py * py))
+    if log_u < log_accept_ratio:
+        state.x = x
+        state.y = y
+        state.elevation = elevation
+        state.accepted = True
+        state.memory = (x, y, gx, gy)
+    return state
+
+
+MCMC_ALGORITHMS = ('metropolis', 'mala', 'hmc')
+
+# How run_mcmc_chains draws random numbers: one generator shared by all
+# chains in turn, or an independent stream per chain
+RNG_STREAM_MODES = ('shared', 'per-chain')
+
+
+def stream_seed(seed, stream_id: int) -> np.random.SeedSequence:
+    """
+    SeedSequence of independent stream stream_id under seed.
+
+    The same as np.random.SeedSequence(seed).spawn(n)[stream_id] for any
+    n > stream_id, so a stream depends only on (seed, stream_id) and chains
+    or runs can be split across loops, batches or processes in any order.
+    seed may be an int or a SeedSequence; resolve None to a SeedSequence
+    once and pass that to every consumer, or each call draws fresh entropy.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return np.random.SeedSequence(seed.entropy, spawn_key=tuple(seed.spawn_key) + (stream_id,))
+
+
+def chain_rngs(seed, n_chains: int, first_chain: int = 0) -> List[np.random.Generator]:
+    """Generators of chains first_chain .. first_chain + n_chains - 1 under seed."""
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(stream_seed(seed, first_chain + i)) for i in range(n_chains)]
+
+
 def run_mcmc_chains(
     n_chains: int,
     terrain: TerrainFunction,
     n_iterations: int,
     config: OptimizationConfig = None,
     seed: int = None,
-    initial_region: Tuple[float, float, float, float] = (0.1, 0.4, 0.1, 0.4)
+    initial_region: Tuple[float, float, float, float] = (0.1, 0.4, 0.1, 0.4),
+    algorithm: str = 'metropolis',
+    rng_streams: str = 'shared',
+    first_chain: int = 0
 ) -> Tuple[list, dict]:
     """
     Run multiple MCMC chains from random starting points.
@@ -480,20 +1468,46 @@ def run_mcmc_chains(
         config: Algorithm configuration
         seed: Random seed for reproducibility
         initial_region: (x_min, x_max, y_min, y_max) for starting positions
+        algorithm: One of MCMC_ALGORITHMS: 'metropolis' (step_mcmc),
+            'mala' (step_mala) or 'hmc' (step_hmc)
+        rng_streams: 'shared' steps every chain with one generator seeded
+            by seed, so a chain's draws depend on how many chains precede
+            it; 'per-chain' gives chain k the generator of
+            stream_seed(seed, k), so each chain is the same however the
+            chains are batched (see samplers.run_mcmc_pool)
+        first_chain: Id of the first chain ('per-chain' only); chains
+            first_chain .. first_chain + n_chains - 1 are run
 
     Returns:
-        Tuple of (chain_histories, summary_stats)
+        Tuple of (chain_histories, summary_stats). With an adaptive
+        proposal (config.mcmc_adapt), summary_stats adds
+        'warmup_iterations', the leading samples of each chain drawn while
+        the proposal was still adapting, and 'proposal_scales', each
+        chain's final scale multiplier.
     """
     if config is None:
         config = OptimizationConfig()
-
-    rng = np.random.default_rng(seed)
+    steps = {'metropolis': step_mcmc, 'mala': step_mala, 'hmc': step_hmc}
+    if algorithm not in steps:
+        raise ValueError(f"algorithm must be one of {MCMC_ALGORITHMS}, got {algorithm!r}")
+    if algorithm != 'metropolis' and config.mcmc_adapt != 'none':
+        raise ValueError(f"mcmc_adapt only applies to algorithm='metropolis', got {algorithm!r}")
+    step_fn = steps[algorithm]
+    if rng_streams not in RNG_STREAM_MODES:
+        raise ValueError(f"rng_streams must be one of {RNG_STREAM_MODES}, got {rng_streams!r}")
+    if rng_streams == 'shared' and first_chain != 0:
+        raise ValueError("first_chain requires rng_streams='per-chain'")
+
+    if rng_streams == 'shared':
+        rngs = [np.random.default_rng(seed)] * n_chains
+    else:
+        rngs = chain_rngs(seed, n_chains, first_chain)
 
     x_min, x_max, y_min, y_max = initial_region
 
     # Initialize chains
     chains = []
-    for _ in range(n_chains):
+    for rng in rngs:
         x0 = x_min + rng.random() * (x_max - x_min)
         y0 = y_min + rng.random() * (y_max - y_min)
         state = OptimizationState(
@@ -512,7 +1526,7 @@ def run_mcmc_chains(
         for i, chain in enumerate(chains):
             import copy
             chains[i] = copy.deepcopy(chain)
-            chains[i] = step_mcmc(chains[i], terrain, config, rng)
+            chains[i] = step_fn(chains[i], terrain, config, rngs[i])
             histories[i].append({
                 'x': chains[i].x,
                 'y': chains[i].y,
@@ -530,10 +1544,152 @@ def run_mcmc_chains(
         'total_proposed': total_proposed,
         'acceptance_rate': total_accepted / total_proposed if total_proposed > 0 else 0,
     }
+    if config.mcmc_adapt != 'none':
+        summary['warmup_iterations'] = min(config.mcmc_adapt_iterations, n_iterations)
+        summary['proposal_scales'] = [math.exp(chain.memory[0]) if chain.memory else 1.0
+                                      for chain in chains]
 
     return histories, summary
 
 
+class TrajectoryStep:
+    """Read-only view of one recorded step; attributes mirror OptimizationState."""
+    __slots__ = ('_trajectory', '_index')
+
+    def __init__(self, trajectory: 'Trajectory', index: int):
+        self._trajectory = trajectory
+        self._index = index
+
+    def __getattr__(self, name: str):
+        # Slots are unset while copy/pickle rebuild an instance; never
+        # forward private or special names to the trajectory
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._trajectory._value(name, self._index)
+
+    def state(self) -> OptimizationState:
+        """This step as a standalone OptimizationState."""
+        return self._trajectory.state(self._index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TrajectoryStep):
+            other = other.state()
+        if not isinstance(other, OptimizationState):
+            return NotImplemented
+        return self.state() == other
+
+    __hash__ = None
+
+    # Copies and pickles are materialized states, detached from the trajectory
+    def __copy__(self) -> OptimizationState:
+        return self.state()
+
+    def __deepcopy__(self, memo) -> OptimizationState:
+        return self.state()
+
+    def __reduce__(self):
+        state = self.state()
+        return OptimizationState, tuple(getattr(state, name) for name in STATE_FIELDS)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in STATE_FIELDS)
+        return f'TrajectoryStep({fields})'
+
+
+class Trajectory:
+    """
+    Columnar record of an optimization run.
+
+    Each OptimizationState field is stored in its own preallocated array,
+    grown by doubling, so recording a step allocates nothing. Indexing
+    returns lightweight TrajectoryStep views, so code written against the
+    old list-of-states return value (len, [-1], slicing, iteration) keeps
+    working. Whole columns are available as arrays, e.g. trajectory.x.
+
+    evaluations holds the EvaluationCounter of an instrumented run (see
+    instrumentation.py), or None. levels describes the per-level segments
+    of a coarse-to-fine run, or is None.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, capacity)
+        self._columns = {name: np.empty(capacity, dtype=dtype)
+                         for name, dtype in STATE_FIELDS.items()}
+        self._length = 0
+        self.evaluations = None
+        self.levels = None
+
+    def record(self, state: OptimizationState) -> None:
+        """Append a snapshot of state."""
+        n = self._length
+        columns = self._columns
+        if n == columns['x'].size:
+            for name, column in columns.items():
+                grown = np.empty(2 * column.size, dtype=column.dtype)
+                grown[:n] = column
+                columns[name] = grown
+
+        columns['x'][n] = state.x
+        columns['y'][n] = state.y
+        columns['elevation'][n] = state.elevation
+        columns['iteration'][n] = state.iteration
+        columns['converged'][n] = state.converged
+        columns['convergence_reason'][n] = encode_state_value('convergence_reason', state.convergence_reason)
+        columns['best_x'][n] = state.best_x
+        columns['best_y'][n] = state.best_y
+        columns['best_elevation'][n] = state.best_elevation
+        columns['temperature'][n] = state.temperature
+        columns['restarts'][n] = state.restarts
+        columns['step_size'][n] = state.step_size
+        columns['gradient_magnitude'][n] = state.gradient_magnitude
+        columns['accepted'][n] = encode_state_value('accepted', state.accepted)
+        self._length = n + 1
+
+    def _value(self, name: str, index: int):
+        try:
+            column = self._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return decode_state_value(name, column[index])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name.startswith('_') or name not in STATE_FIELDS:
+            raise AttributeError(name)
+        return self._columns[name][:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TrajectoryStep(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('trajectory index out of range')
+        return TrajectoryStep(self, index)
+
+    def __iter__(self):
+        return (TrajectoryStep(self, i) for i in range(self._length))
+
+    def state(self, index: int) -> OptimizationState:
+        """Materialize a recorded step as a standalone OptimizationState."""
+        step = self[index]
+        return OptimizationState(**{name: getattr(step, name) for name in STATE_FIELDS})
+
+
+# Algorithm used on the finer levels of a coarse-to-fine run: local
+# methods refine with themselves, global ones hand over to Newton, which
+# converges in a few steps from a point already near a peak
+COARSE_TO_FINE_REFINE = {
+    'gradient': 'gradient',
+    'newton': 'newton',
+    'bfgs': 'bfgs',
+    'annealing': 'newton',
+    'random-restart': 'newton',
+}
+
+
 def run_optimization(
     algorithm: str,
     terrain: TerrainFunction,
@@ -541,59 +1697,104 @@ def run_optimization(
     y0: float,
     max_iterations: int = 1000,
     config: OptimizationConfig = None,
-    seed: int = None
-) -> list:
+    seed: int = None,
+    instrument: bool = False,
+    pyramid_levels: int = 0
+) -> Trajectory:
     """
     Run a complete optimization from start to convergence.
 
     Args:
-        algorithm: One of 'gradient', 'newton', 'annealing', 'random-restart'
+        algorithm: One of 'gradient', 'newton', 'bfgs', 'annealing',
+            'random-restart'
         terrain: Terrain objective function
         x0, y0: Starting coordinates
-        max_iterations: Maximum iterations before stopping
+        max_iterations: Maximum iterations before stopping (per level)
         config: Algorithm configuration
-        seed: Random seed for reproducibility
+        seed: Random seed for reproducibility; an int, or a SeedSequence
+            such as stream_seed(seed, run_id) to give each of many runs its
+            own independent stream
+        instrument: Count and time terrain evaluations per step function;
+            the counts are returned as trajectory.evaluations
+        pyramid_levels: Coarse-to-fine mode. With n > 0 the algorithm first
+            runs on the coarsest of n halved copies of the grid (see
+            TerrainFunction.pyramid), then each finer level down to the
+            full grid is refined (COARSE_TO_FINE_REFINE) from the previous
+            level's best point, so the full-resolution run starts close to
+            a peak. Instrumentation counts full-resolution evaluations only.
 
     Returns:
-        List of states (trajectory)
+        Trajectory of recorded states (indexable like a list). In
+        coarse-to-fine mode it holds every level's steps in order, and
+        trajectory.levels lists each level's grid size, algorithm and
+        first index; iteration counts restart at 0 on each level.
     """
     if config is None:
         config = OptimizationConfig()
 
+    if instrument:
+        from instrumentation import InstrumentedTerrain
+        if not isinstance(terrain, InstrumentedTerrain):
+            terrain = InstrumentedTerrain(terrain)
+
     rng = np.random.default_rng(seed)
+    levels = terrain.pyramid(pyramid_levels)[::-1]
 
-    # Initialize state
-    state = OptimizationState(
-        x=x0,
-        y=y0,
-        elevation=terrain(x0, y0),
-        temperature=config.sa_initial_temp,
-    )
+    trajectory = Trajectory(capacity=min(len(levels) * (max_iterations + 1), 1024))
+    x, y = x0, y0
+    for depth, level in enumerate(levels):
+        level_algorithm = algorithm if depth == 0 else COARSE_TO_FINE_REFINE[algorithm]
 
-    trajectory = [state]
+        # Initialize state
+        state = OptimizationState(
+            x=x,
+            y=y,
+            elevation=level(x, y),
+            temperature=config.sa_initial_temp,
+        )
+
+        if pyramid_levels:
+            if trajectory.levels is None:
+                trajectory.levels = []
+            trajectory.levels.append({
+                'rows': level.rows,
+                'cols': level.cols,
+                'algorithm': level_algorithm,
+                'start': len(trajectory),
+            })
+        trajectory.record(state)
 
-    step_fn = {
-        'gradient': lambda s: step_gradient_ascent(s, terrain, config),
-        'newton': lambda s: step_newton_raphson(s, terrain, config),
-        'annealing': lambda s: step_simulated_annealing(s, terrain, config, rng),
-        'random-restart': lambda s: step_random_restarts(s, terrain, config, rng),
-    }[algorithm]
+        step_fn = {
+            'gradient': lambda s: step_gradient_ascent(s, level, config),
+            'newton': lambda s: step_newton_raphson(s, level, config),
+            'bfgs': lambda s: step_bfgs(s, level, config),
+            'annealing': lambda s: step_simulated_annealing(s, level, config, rng),
+            'random-restart': lambda s: step_random_restarts(s, level, config, rng),
+        }[level_algorithm]
 
-    while not state.converged and state.iteration < max_iterations:
-        # Create a copy for the new state
-        import copy
-        state = copy.deepcopy(state)
-        state = step_fn(state)
-        trajectory.append(state)
+        # Steps mutate the state in place; the trajectory keeps a snapshot
+        while not state.converged and state.iteration < max_iterations:
+            state = step_fn(state)
+            trajectory.record(state)
 
+        x, y = state.best_x, state.best_y
+
+    if instrument:
+        trajectory.evaluations = terrain.counter
     return trajectory
 
 
-def load_terrain(json_path: str) -> TerrainFunction:
-    """Load terrain data from JSON file."""
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    return TerrainFunction(data)
+def load_terrain(json_path: str, derivatives: str = 'finite',
+                 use_cache: bool = True) -> TerrainFunction:
+    """
+    Load terrain data from JSON file.
+
+    With use_cache, the grid is memory-mapped from a binary sidecar cache
+    (see terrain_cache.py), which is written on first load and rebuilt
+    whenever the JSON content changes.
+    """
+    data = load_terrain_data(json_path, use_cache=use_cache)
+    return TerrainFunction(data, derivatives=derivatives)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,418 @@
+"""
+Basin-of-attraction and peak index for a terrain grid.
+
+A one-time pass over TerrainFunction.elevations links every grid node to
+its steepest-ascent neighbour (of the 8 around it, by rise per unit
+distance). Nodes with no higher neighbour are local maxima. Following the
+links from any node ends at exactly one peak, so every node gets the id of
+the peak whose basin it lies in. After that, "which peak does a climb from
+(x, y) lead to" is a single array lookup at the nearest node, which gives
+tests a ground-truth answer without running the optimizers.
+
+Peaks are numbered in order of decreasing elevation, so id 0 is the
+global maximum (the same convention as population.label_peaks).
+
+Exactly flat regions (8-connected nodes of equal height, such as the base
+of the synthetic families far from any feature) are labelled first and
+treated as a unit: a flat region with no higher neighbour is one peak,
+located at its member nearest the region's centroid, and every other flat
+region drains as a whole to the highest node on its boundary. Peaks less
+than MIN_PROMINENCE above the highest pass to a higher peak (the ripples
+a narrow diagonal ridge leaves along its crest on a grid) are then merged
+into the basin across that pass.
+
+The index is persisted next to the terrain JSON,
+
+    docs/data/arthurs_seat_elevation.json
+    docs/data/arthurs_seat_elevation.basins.npz
+
+and is rebuilt if the grid's content hash no longer matches.
+
+Usage:
+    python basins.py [terrain.json]
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from algorithms import TerrainFunction
+
+INDEX_SUFFIX = '.basins.npz'
+
+# Bump this when labelling changes so stored indexes are rebuilt
+INDEX_VERSION = 2
+
+# Peaks rising less than this (m) above their highest pass to a higher
+# peak are absorbed; on a grid these are mostly steps along a diagonal crest
+MIN_PROMINENCE = 2.0
+
+# (row, col) offsets of the 8 neighbours
+NEIGHBOURS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def index_path_for(json_path: str) -> Path:
+    """Sidecar basin index path for a terrain JSON file."""
+    return Path(json_path).with_suffix(INDEX_SUFFIX)
+
+
+def grid_fingerprint(elevations: np.ndarray) -> str:
+    """SHA-256 of the grid's shape, dtype and contents (and INDEX_VERSION)."""
+    elevations = np.ascontiguousarray(elevations)
+    digest = hashlib.sha256(f"{INDEX_VERSION}{elevations.shape}{elevations.dtype.str}".encode())
+    digest.update(memoryview(elevations).cast('B'))
+    return digest.hexdigest()
+
+
+def steepest_ascent_links(elevations: np.ndarray) -> np.ndarray:
+    """
+    Flat index of each node's steepest-ascent neighbour (itself at a peak).
+
+    Rise is divided by the neighbour distance in grid cells (1 or sqrt 2),
+    so diagonal links are only taken when they are genuinely steeper.
+    """
+    elev = np.asarray(elevations, dtype=np.float64)
+    rows, cols = elev.shape
+    padded = np.pad(elev, 1, constant_values=-np.inf)
+
+    best_slope = np.zeros((rows, cols))
+    best_dir = np.full((rows, cols), -1, dtype=np.int8)
+    for k, (dr, dc) in enumerate(NEIGHBOURS):
+        neighbour = padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        slope = (neighbour - elev) / np.hypot(dr, dc)
+        steeper = slope > best_slope
+        best_slope[steeper] = slope[steeper]
+        best_dir[steeper] = k
+
+    links = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+    offsets = np.array([dr * cols + dc for dr, dc in NEIGHBOURS] + [0], dtype=np.int64)
+    links += offsets[best_dir]  # best_dir == -1 picks the trailing 0
+    return links.ravel()
+
+
+def _neighbour_pairs(shape: Tuple[int, int]):
+    """(src, dst) slice pairs covering each unordered 8-neighbour pair once."""
+    rows, cols = shape
+    # East, south, south-east, south-west
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        yield ((slice(0, rows - dr), slice(max(0, -dc), cols - max(0, dc))),
+               (slice(dr, rows), slice(max(0, dc), cols + min(0, dc))))
+
+
+def flat_components(elevations: np.ndarray) -> np.ndarray:
+    """
+    Root (smallest flat index) of every node's equal-height component.
+
+    Components are 8-connected sets of nodes with exactly equal elevation,
+    found by union-find over the equal neighbour pairs: each round hooks
+    the larger root of every unmerged pair onto the smaller one, then
+    compresses all paths by pointer jumping.
+    """
+    elev = np.asarray(elevations, dtype=np.float64)
+    rows, cols = elev.shape
+    index = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+
+    pairs_a, pairs_b = [], []
+    for src, dst in _neighbour_pairs(elev.shape):
+        equal = elev[src] == elev[dst]
+        pairs_a.append(index[src][equal])
+        pairs_b.append(index[dst][equal])
+    a = np.concatenate(pairs_a)
+    b = np.concatenate(pairs_b)
+
+    parent = np.arange(rows * cols, dtype=np.int64)
+    while a.size:
+        root_a, root_b = parent[a], parent[b]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        parent = _follow_links(parent)
+        unmerged = parent[a] != parent[b]
+        a, b = a[unmerged], b[unmerged]
+    return parent
+
+
+def _first_per_group(groups: np.ndarray, *keys: np.ndarray) -> np.ndarray:
+    """Position of the smallest (keys...) entry of each group, by group."""
+    order = np.lexsort(keys[::-1] + (groups,))
+    _, first = np.unique(groups[order], return_index=True)
+    return order[first]
+
+
+def resolve_flats(elevations: np.ndarray, links: np.ndarray) -> np.ndarray:
+    """
+    Relink the nodes of every multi-node flat component as a unit.
+
+    Members of a component with a strictly higher neighbour all link to the
+    highest such neighbour; members of one
+    without link to the member nearest its centroid, which becomes the peak.
+    """
+    elev = np.asarray(elevations, dtype=np.float64)
+    rows, cols = elev.shape
+    components = flat_components(elev)
+    nodes = np.flatnonzero(np.bincount(components, minlength=components.size)[components] > 1)
+    if nodes.size == 0:
+        return links
+    links = links.copy()
+    groups = components[nodes]
+    node_rows, node_cols = nodes // cols, nodes % cols
+    height = elev.ravel()[nodes]
+
+    exit_height = height.copy()
+    exit_node = np.full(nodes.size, -1, dtype=np.int64)
+    for dr, dc in NEIGHBOURS:
+        r, c = node_rows + dr, node_cols + dc
+        inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+        neighbour = np.where(inside, r * cols + c, 0)
+        neighbour_height = np.where(inside, elev.ravel()[neighbour], -np.inf)
+        higher = neighbour_height > exit_height
+        exit_height[higher] = neighbour_height[higher]
+        exit_node[higher] = neighbour[higher]
+
+    # Highest exit of each component that has one
+    has_exit = exit_node >= 0
+    best = _first_per_group(groups[has_exit], -exit_height[has_exit], exit_node[has_exit])
+    target = np.full(components.size, -1, dtype=np.int64)
+    target[groups[has_exit][best]] = exit_node[has_exit][best]
+
+    # Components without one are peaks, centred on the member nearest their centroid
+    is_peak = target[groups] < 0
+    peak_groups, peak_nodes = groups[is_peak], nodes[is_peak]
+    counts = np.bincount(peak_groups, minlength=components.size)[peak_groups]
+    centre_row = np.bincount(peak_groups, node_rows[is_peak], components.size)[peak_groups] / counts
+    centre_col = np.bincount(peak_groups, node_cols[is_peak], components.size)[peak_groups] / counts
+    dist2 = (node_rows[is_peak] - centre_row) ** 2 + (node_cols[is_peak] - centre_col) ** 2
+    centre = _first_per_group(peak_groups, dist2, peak_nodes)
+    target[peak_groups[centre]] = peak_nodes[centre]
+
+    links[nodes] = target[groups]
+    return links
+
+
+def basin_saddles(elevations: np.ndarray, labels: np.ndarray):
+    """
+    Highest pass between every pair of adjacent basins.
+
+    A pass between neighbouring nodes in different basins is the lower of
+    their two elevations.
+
+    Returns:
+        (basin_a, basin_b, saddle) arrays, basin_a < basin_b
+    """
+    elev = np.asarray(elevations, dtype=np.float64)
+    n_basins = int(labels.max()) + 1
+    keys, heights = [], []
+    for src, dst in _neighbour_pairs(elev.shape):
+        a, b = labels[src], labels[dst]
+        differ = a != b
+        keys.append((np.minimum(a, b)[differ].astype(np.int64) * n_basins
+                     + np.maximum(a, b)[differ]))
+        heights.append(np.minimum(elev[src], elev[dst])[differ])
+    keys = np.concatenate(keys)
+    heights = np.concatenate(heights)
+    highest = _first_per_group(keys, -heights)
+    keys = keys[highest]
+    return keys // n_basins, keys % n_basins, heights[highest]
+
+
+def absorb_low_peaks(elevations: np.ndarray, labels: np.ndarray,
+                     peak_elevation: np.ndarray, min_prominence: float) -> np.ndarray:
+    """
+    Peak each peak's basin merges into once low peaks are absorbed.
+
+    Basins are joined pass by pass, highest first. When two groups meet,
+    the lower group's top has prominence (top - pass); below min_prominence
+    that peak is absorbed by the basin across the pass. Peak ids must be in
+    order of decreasing elevation.
+
+    Returns:
+        owner[i], the id that peak i's basin belongs to (i itself if kept)
+    """
+    n_peaks = peak_elevation.size
+    owner = np.arange(n_peaks)
+    if n_peaks < 2:
+        return owner
+    basin_a, basin_b, saddle = basin_saddles(elevations, labels)
+
+    group = list(range(n_peaks))
+
+    def find(i):
+        while group[i] != i:
+            group[i] = group[group[i]]
+            i = group[i]
+        return i
+
+    # A group's root is its highest peak, the lowest id
+    for k in np.argsort(-saddle, kind='stable'):
+        a, b = int(basin_a[k]), int(basin_b[k])
+        top_a, top_b = find(a), find(b)
+        if top_a == top_b:
+            continue
+        if top_a > top_b:
+            a, b, top_a, top_b = b, a, top_b, top_a
+        if peak_elevation[top_b] - saddle[k] < min_prominence:
+            owner[top_b] = a
+        group[top_b] = top_a
+
+    return _follow_links(owner)
+
+
+def _follow_links(links: np.ndarray) -> np.ndarray:
+    """Root of every node's link chain, by pointer jumping (O(log depth) passes)."""
+    roots = links.copy()
+    while True:
+        jumped = roots[roots]
+        if np.array_equal(jumped, roots):
+            return roots
+        roots = jumped
+
+
+@dataclass
+class BasinIndex:
+    """
+    Peak id of every grid node plus the peak table.
+
+    labels[r, c] is the id of the peak reached by steepest ascent from node
+    (r, c), after low-prominence peaks are merged; peak_rows/peak_cols/
+    peak_elevation describe peak id i, highest first; basin_size[i] counts
+    the nodes draining to it.
+    """
+    labels: np.ndarray
+    peak_rows: np.ndarray
+    peak_cols: np.ndarray
+    peak_elevation: np.ndarray
+    basin_size: np.ndarray
+    fingerprint: str = ''
+
+    @classmethod
+    def from_elevations(cls, elevations: np.ndarray,
+                        min_prominence: float = MIN_PROMINENCE) -> 'BasinIndex':
+        elev = np.asarray(elevations, dtype=np.float64)
+        rows, cols = elev.shape
+        roots = _follow_links(resolve_flats(elev, steepest_ascent_links(elev)))
+
+        peaks = np.flatnonzero(roots == np.arange(roots.size))
+        peaks = peaks[np.argsort(-elev.ravel()[peaks], kind='stable')]
+        peak_id = np.empty(roots.size, dtype=np.int32)
+        peak_id[peaks] = np.arange(peaks.size, dtype=np.int32)
+        labels = peak_id[roots].reshape(rows, cols)
+
+        if min_prominence > 0:
+            owner = absorb_low_peaks(elev, labels, elev.ravel()[peaks], min_prominence)
+            kept = np.flatnonzero(owner == np.arange(owner.size))
+            kept_id = np.empty(owner.size, dtype=np.int32)
+            kept_id[kept] = np.arange(kept.size, dtype=np.int32)
+            labels = kept_id[owner][labels]
+            peaks = peaks[kept]
+
+        return cls(
+            labels=labels,
+            peak_rows=peaks // cols,
+            peak_cols=peaks % cols,
+            peak_elevation=elev.ravel()[peaks],
+            basin_size=np.bincount(labels.ravel(), minlength=peaks.size),
+            fingerprint=grid_fingerprint(elevations),
+        )
+
+    @property
+    def n_peaks(self) -> int:
+        return self.peak_rows.size
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.labels.shape
+
+    def _nearest_node(self, x, y):
+        rows, cols = self.labels.shape
+        col = np.clip(np.rint(np.asarray(x) * (cols - 1)).astype(np.intp), 0, cols - 1)
+        row = np.clip(np.rint(np.asarray(y) * (rows - 1)).astype(np.intp), 0, rows - 1)
+        return row, col
+
+    def peak_at(self, x: float, y: float) -> int:
+        """Id of the peak whose basin contains the grid node nearest (x, y)."""
+        row, col = self._nearest_node(x, y)
+        return int(self.labels[row, col])
+
+    def peak_at_batch(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Vectorized peak_at."""
+        row, col = self._nearest_node(x, y)
+        return self.labels[row, col]
+
+    def peak_location(self, peak: int) -> Tuple[float, float]:
+        """Normalized (x, y) of a peak."""
+        rows, cols = self.labels.shape
+        return (float(self.peak_cols[peak]) / (cols - 1),
+                float(self.peak_rows[peak]) / (rows - 1))
+
+    def save(self, path: str) -> None:
+        """Write the index to an .npz file atomically."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + f'.{os.getpid()}.tmp.npz')
+        np.savez(tmp_path, labels=self.labels, peak_rows=self.peak_rows,
+                 peak_cols=self.peak_cols, peak_elevation=self.peak_elevation,
+                 basin_size=self.basin_size, fingerprint=np.array(self.fingerprint))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BasinIndex':
+        with np.load(path) as data:
+            return cls(
+                labels=data['labels'],
+                peak_rows=data['peak_rows'],
+                peak_cols=data['peak_cols'],
+                peak_elevation=data['peak_elevation'],
+                basin_size=data['basin_size'],
+                fingerprint=str(data['fingerprint']),
+            )
+
+
+def basin_index(terrain: TerrainFunction, path: Optional[str] = None) -> BasinIndex:
+    """
+    Basin index for a terrain, loaded from path when it is still valid.
+
+    With a path, a stored index is reused if its fingerprint matches the
+    terrain grid; otherwise the index is recomputed and written there (if
+    the location is writable).
+    """
+    if path is not None and Path(path).exists():
+        try:
+            index = BasinIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            index = None
+        if index is not None and index.fingerprint == grid_fingerprint(terrain.elevations):
+            return index
+
+    index = BasinIndex.from_elevations(terrain.elevations)
+    if path is not None:
+        try:
+            index.save(path)
+        except OSError:
+            pass
+    return index
+
+
+def load_basin_index(json_path: str) -> BasinIndex:
+    """Basin index for a terrain JSON file, persisted in its sidecar."""
+    from algorithms import load_terrain
+    return basin_index(load_terrain(json_path), index_path_for(json_path))
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    if len(sys.argv) > 1:
+        json_path = sys.argv[1]
+    else:
+        script_dir = Path(__file__).parent
+        json_path = str(script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json')
+
+    start = time.perf_counter()
+    index = load_basin_index(json_path)
+    print(f"{index.shape[0]}x{index.shape[1]} grid: {index.n_peaks} peaks "
+          f"in {time.perf_counter() - start:.3f}s")
+    for peak in range(min(index.n_peaks, 10)):
+        x, y = index.peak_location(peak)
+        print(f"  peak {peak}: {index.peak_elevation[peak]:.1f}m at ({x:.3f}, {y:.3f}), "
+              f"basin {index.basin_size[peak]} nodes")
@@ -0,0 +1,365 @@
+"""
+Benchmark suite for the optimization code in this directory.
+
+Times the hot paths (TerrainFunction evaluation, each step_* function,
+run_optimization per algorithm, the MCMC samplers and their diagnostics,
+the population engine) across terrain grid sizes and population sizes.
+Each result reports ns per operation, operations per second and peak
+traced memory; the mcmc_efficiency rows are per effective sample and
+add ESS per terrain evaluation and per gradient evaluation.
+Results are written as JSON so two commits can be compared.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --sizes 50 512 2048 --populations 1 1000 --output bench.json
+    python benchmark.py --compare old.json new.json --threshold 0.15
+"""
+
+import copy
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from algorithms import (
+    GA_STEP_MODES,
+    OptimizationConfig,
+    OptimizationState,
+    TerrainFunction,
+    load_terrain,
+    run_mcmc_chains,
+    run_optimization,
+    step_bfgs,
+    step_gradient_ascent,
+    step_hmc,
+    step_mala,
+    step_mcmc,
+    step_newton_raphson,
+    step_random_restarts,
+    step_simulated_annealing,
+)
+from diagnostics import ess
+from instrumentation import InstrumentedTerrain
+from population import run_population
+from samplers import from_histories, run_mcmc_vectorized, run_parallel_tempering
+from terrain_families import family_terrain
+
+ALGORITHMS = ['gradient', 'newton', 'annealing', 'random-restart']
+
+# Minimum wall time per timing repeat; the call count is scaled up to reach it
+MIN_REPEAT_TIME = 0.05
+
+
+def time_per_call(fn: Callable[[], Any], repeat: int = 5) -> float:
+    """Best-of-repeat wall time of one fn() call, in nanoseconds."""
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= MIN_REPEAT_TIME * 1e9 or number >= 1 << 20:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / number
+
+
+def peak_memory_kib(fn: Callable[[], Any]) -> float:
+    """Peak memory traced by tracemalloc (includes NumPy buffers) during one fn() call."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def _result(name: str, terrain_name: str, terrain: TerrainFunction, n: int, unit: str,
+            ns_per_call: float, ops_per_call: float, peak_kib: float) -> Dict[str, Any]:
+    ns_per_op = ns_per_call / ops_per_call
+    return {
+        'name': name,
+        'terrain': terrain_name,
+        'grid_size': terrain.rows,
+        'n': n,
+        'unit': unit,
+        'ns_per_op': ns_per_op,
+        'ops_per_s': 1e9 / ns_per_op,
+        'peak_kib': peak_kib,
+    }
+
+
+def bench_terrain(name: str, terrain: TerrainFunction, populations: List[int]) -> List[Dict[str, Any]]:
+    """Evaluation benchmarks: scalar methods and their batch counterparts."""
+    results = []
+    rng = np.random.default_rng(0)
+    x, y = 0.37, 0.61
+
+    for label, fn in [
+        ('get_elevation', lambda: terrain.get_elevation(x, y)),
+        ('get_gradient', lambda: terrain.get_gradient(x, y)),
+        ('get_full_hessian', lambda: terrain.get_full_hessian(x, y)),
+    ]:
+        results.append(_result(label, name, terrain, 1, 'eval',
+                               time_per_call(fn), 1, peak_memory_kib(fn)))
+
+    for n in populations:
+        xs = rng.uniform(0.02, 0.98, n)
+        ys = rng.uniform(0.02, 0.98, n)
+        for label, fn in [
+            ('get_elevation_batch', lambda: terrain.get_elevation_batch(xs, ys)),
+            ('get_gradient_batch', lambda: terrain.get_gradient_batch(xs, ys)),
+            ('get_derivatives_batch', lambda: terrain.get_derivatives_batch(xs, ys)),
+        ]:
+            results.append(_result(label, name, terrain, n, 'eval',
+                                   time_per_call(fn), n, peak_memory_kib(fn)))
+    return results
+
+
+def bench_steps(name: str, terrain: TerrainFunction) -> List[Dict[str, Any]]:
+    """Single-step cost of each step_* function (includes one state copy)."""
+    config = OptimizationConfig()
+    rng = np.random.default_rng(0)
+    start = OptimizationState(x=0.37, y=0.61, elevation=terrain(0.37, 0.61))
+
+    results = []
+    for label, step in [
+        ('step_gradient_ascent', lambda s: step_gradient_ascent(s, terrain, config)),
+        ('step_newton_raphson', lambda s: step_newton_raphson(s, terrain, config)),
+        ('step_bfgs', lambda s: step_bfgs(s, terrain, config)),
+        ('step_simulated_annealing', lambda s: step_simulated_annealing(s, terrain, config, rng)),
+        ('step_random_restarts', lambda s: step_random_restarts(s, terrain, config, rng)),
+        ('step_mcmc', lambda s: step_mcmc(s, terrain, config, rng)),
+        ('step_mala', lambda s: step_mala(s, terrain, config, rng)),
+        ('step_hmc', lambda s: step_hmc(s, terrain, config, rng)),
+    ]:
+        fn = lambda: step(copy.copy(start))
+        results.append(_result(label, name, terrain, 1, 'step',
+                               time_per_call(fn), 1, peak_memory_kib(fn)))
+    return results
+
+
+def bench_runs(name: str, terrain: TerrainFunction, populations: List[int],
+               max_iterations: int = 500, mcmc_iterations: int = 200) -> List[Dict[str, Any]]:
+    """
+    Whole-run throughput: scalar runs (every algorithm and BFGS, plus
+    gradient ascent in each step-control mode), populations and MCMC samplers. Scalar rows
+    also carry the iterations and terrain evaluations the run took.
+    """
+    results = []
+
+    runs = [(algo, 'fixed') for algo in ALGORITHMS + ['bfgs']]
+    runs += [('gradient', mode) for mode in GA_STEP_MODES if mode != 'fixed']
+    for algo, mode in runs:
+        config = OptimizationConfig(ga_step_mode=mode)
+        run = lambda **kwargs: run_optimization(algo, terrain, 0.25, 0.35, max_iterations=max_iterations,
+                                                config=config, seed=42, **kwargs)
+        counted = run(instrument=True)
+        iterations = max(1, len(counted) - 1)
+        label = f'run_optimization[{algo}]' if mode == 'fixed' else f'run_optimization[{algo}/{mode}]'
+        result = _result(label, name, terrain, 1, 'iteration',
+                         time_per_call(run, repeat=3), iterations, peak_memory_kib(run))
+        result['iterations'] = iterations
+        result['evaluations'] = counted.evaluations.evaluations()
+        results.append(result)
+
+    for n in populations:
+        x0 = np.linspace(0.05, 0.95, n)
+        y0 = x0[::-1].copy()
+        for algo in ALGORITHMS:
+            totals = []
+            fn = lambda: totals.append(int(run_population(
+                algo, terrain, x0, y0, max_iterations=max_iterations, seed=42).iteration.sum()))
+            ns = time_per_call(fn, repeat=3)
+            results.append(_result(f'run_population[{algo}]', name, terrain, n, 'iteration',
+                                   ns, max(1, totals[-1]), peak_memory_kib(fn)))
+
+        fn = lambda: run_mcmc_vectorized(n, terrain, mcmc_iterations, seed=42)
+        results.append(_result('run_mcmc_vectorized', name, terrain, n, 'sample',
+                               time_per_call(fn, repeat=3), n * mcmc_iterations,
+                               peak_memory_kib(fn)))
+
+        elevations = np.ascontiguousarray(fn()[0][..., 2])
+        fn = lambda: ess(elevations)
+        results.append(_result('diagnostics.ess', name, terrain, n, 'sample',
+                               time_per_call(fn, repeat=3), n * mcmc_iterations,
+                               peak_memory_kib(fn)))
+
+        # Cost per cold (T = 1) sample of n ladders
+        fn = lambda: run_parallel_tempering(n, terrain, mcmc_iterations, seed=42)
+        results.append(_result('run_parallel_tempering', name, terrain, n, 'sample',
+                               time_per_call(fn, repeat=3), n * mcmc_iterations,
+                               peak_memory_kib(fn)))
+
+        if n <= 64:
+            fn = lambda: run_mcmc_chains(n, terrain, mcmc_iterations, seed=42)
+            results.append(_result('run_mcmc_chains', name, terrain, n, 'sample',
+                                   time_per_call(fn, repeat=3), n * mcmc_iterations,
+                                   peak_memory_kib(fn)))
+    return results
+
+
+def bench_samplers(name: str, terrain: TerrainFunction, n_chains: int = 4,
+                   n_iterations: int = 1500, warmup: int = 500) -> List[Dict[str, Any]]:
+    """
+    Cost per independent draw of each run_mcmc_chains sampler: random-walk
+    Metropolis (fixed and scale-adapted proposal), MALA and HMC.
+
+    Rows are per effective sample (the smallest ESS over x, y and
+    elevation after warm-up) and carry the ESS, terrain evaluations (a
+    finite-difference gradient counts as its elevation lookups), gradient
+    evaluations, and ESS per evaluation and per gradient.
+    """
+    results = []
+    for algorithm, config in [
+        ('metropolis', OptimizationConfig()),
+        ('metropolis/adaptive', OptimizationConfig(mcmc_adapt='scale', mcmc_adapt_iterations=warmup)),
+        ('mala', OptimizationConfig()),
+        ('hmc', OptimizationConfig()),
+    ]:
+        counted = InstrumentedTerrain(terrain)
+        run = lambda t=terrain: run_mcmc_chains(n_chains, t, n_iterations, config=config, seed=42,
+                                                algorithm=algorithm.split('/')[0])
+        histories, _ = run(counted)
+        samples, _ = from_histories(histories)
+        n_eff = min(ess(samples[:, warmup:, k]) for k in range(3))
+        evaluations = counted.counter.evaluations()
+        gradients = counted.counter.calls('get_gradient')
+
+        result = _result(f'mcmc_efficiency[{algorithm}]', name, terrain, n_chains, 'effective sample',
+                         time_per_call(run, repeat=1), max(n_eff, 1e-9), peak_memory_kib(run))
+        result['ess'] = n_eff
+        result['evaluations'] = evaluations
+        result['gradient_evaluations'] = gradients
+        result['ess_per_evaluation'] = n_eff / evaluations
+        result['ess_per_gradient'] = n_eff / gradients if gradients else None
+        results.append(result)
+    return results
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def run_benchmarks(sizes: List[int], populations: List[int], family: str = 'bumps',
+                   include_runs: bool = True) -> Dict[str, Any]:
+    """
+    Run the full suite on the real Arthur's Seat grid and on a terrain
+    family at each grid size.
+    """
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    terrains = [('arthurs_seat', load_terrain(str(terrain_path)))]
+    terrains += [(family, family_terrain(family, size, seed=0)) for size in sizes]
+
+    results = []
+    for name, terrain in terrains:
+        print(f"  {name} {terrain.rows}x{terrain.cols}...", file=sys.stderr)
+        results += bench_terrain(name, terrain, populations)
+        results += bench_steps(name, terrain)
+        if include_runs:
+            results += bench_runs(name, terrain, populations)
+            results += bench_samplers(name, terrain)
+
+    return {'meta': _metadata(), 'results': results}
+
+
+def _key(result: Dict[str, Any]):
+    return result['name'], result['terrain'], result['grid_size'], result['n']
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.15) -> List[Dict[str, Any]]:
+    """
+    Match results between two benchmark files.
+
+    Returns:
+        One row per common benchmark with 'ratio' = new / old ns_per_op and
+        'regression' set when the ratio exceeds 1 + threshold.
+    """
+    old_by_key = {_key(r): r for r in old['results']}
+    rows = []
+    for result in new['results']:
+        before = old_by_key.get(_key(result))
+        if before is None:
+            continue
+        ratio = result['ns_per_op'] / before['ns_per_op']
+        rows.append({
+            'name': result['name'],
+            'terrain': result['terrain'],
+            'grid_size': result['grid_size'],
+            'n': result['n'],
+            'old_ns': before['ns_per_op'],
+            'new_ns': result['ns_per_op'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':32s} {'terrain':>14s} {'grid':>5s} {'n':>6s} "
+          f"{'ns/op':>12s} {'ops/s':>12s} {'peak KiB':>10s}")
+    for r in results:
+        print(f"{r['name']:32s} {r['terrain']:>14s} {r['grid_size']:5d} {r['n']:6d} "
+              f"{r['ns_per_op']:12.1f} {r['ops_per_s']:12.3g} {r['peak_kib']:10.1f}  per {r['unit']}")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the optimization hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[256, 1024],
+                        help='Terrain-family grid sizes (the real 50x50 grid is always included)')
+    parser.add_argument('--populations', type=int, nargs='*', default=[1, 64, 1024],
+                        help='Population / chain counts for batch benchmarks')
+    parser.add_argument('--family', default='bumps')
+    parser.add_argument('--skip-runs', action='store_true', help='Only time evaluations and steps')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='Compare two results files instead of running')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        rows = compare(old, new, args.threshold)
+        for row in rows:
+            flag = 'REGRESSION' if row['regression'] else ''
+            print(f"{row['name']:32s} {row['terrain']:>14s} {row['grid_size']:5d} {row['n']:6d} "
+                  f"{row['old_ns']:12.1f} -> {row['new_ns']:12.1f} ns  x{row['ratio']:.2f} {flag}")
+        sys.exit(1 if any(row['regression'] for row in rows) else 0)
+
+    report = run_benchmarks(args.sizes, args.populations, args.family, not args.skip_runs)
+    print_results(report['results'])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
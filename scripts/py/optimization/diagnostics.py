@@ -0,0 +1,220 @@
+"""
+Convergence diagnostics for MCMC output.
+
+All functions take draws as a (n_chains, n_iterations) array of one
+scalar quantity; summarize() applies them to each column of the
+(n_chains, n_iterations, 3) sampler arrays. Output of run_mcmc_chains can
+be converted with samplers.from_histories.
+
+    rhat        split-R-hat (Gelman et al., BDA3)
+    ess         multi-chain effective sample size on split chains, with
+                Geyer's initial monotone sequence (as in Stan)
+    mcse_mean   Monte Carlo standard error of the mean
+    autocorrelation / autocovariance per chain
+
+Autocovariances come from one FFT per chain. The chains' power spectra are
+averaged before a single inverse transform, chains are transformed in
+batches to bound memory, and ess first pads only for lags up to
+INITIAL_MAX_LAG, falling back to all lags when the Geyer sequence has not
+terminated by then.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Lags ess tries before computing the full autocovariance
+INITIAL_MAX_LAG = 1024
+
+# Complex FFT values held at once (16 bytes each)
+FFT_BATCH_ELEMENTS = 1 << 23
+
+COLUMNS = ('x', 'y', 'elevation')
+
+
+def _as_draws(draws) -> np.ndarray:
+    draws = np.asarray(draws, dtype=np.float64)
+    if draws.ndim == 1:
+        draws = draws[np.newaxis, :]
+    if draws.ndim != 2:
+        raise ValueError(f"draws must be (n_chains, n_iterations), got shape {draws.shape}")
+    return draws
+
+
+def _fft_length(n: int) -> int:
+    """Smallest 2^a 3^b 5^c >= n (sizes pocketfft handles fastest)."""
+    best = 1 << max(0, (n - 1).bit_length())
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _autocovariance_sum(draws: np.ndarray, max_lag: int,
+                        means: Optional[np.ndarray] = None) -> np.ndarray:
+    """Sum over chains of the (biased) autocovariance at lags 0..max_lag."""
+    n_chains, n = draws.shape
+    if means is None:
+        means = draws.mean(axis=1)
+    size = _fft_length(n + max_lag)
+    batch = max(1, FFT_BATCH_ELEMENTS // (size // 2 + 1))
+
+    power = np.zeros(size // 2 + 1)
+    for start in range(0, n_chains, batch):
+        chunk = draws[start:start + batch] - means[start:start + batch, np.newaxis]
+        spectrum = np.fft.rfft(chunk, n=size, axis=1)
+        # |F|^2 summed over chains, squaring the real/imaginary parts in place
+        parts = spectrum.view(np.float64)
+        np.square(parts, out=parts)
+        power += parts.sum(axis=0).reshape(-1, 2).sum(axis=1)
+    return np.fft.irfft(power, n=size)[:max_lag + 1] / n
+
+
+def autocovariance(draws, max_lag: Optional[int] = None) -> np.ndarray:
+    """
+    Per-chain autocovariance (normalised by n, as is usual for MCMC).
+
+    Args:
+        draws: (n_chains, n_iterations) draws
+        max_lag: Largest lag returned (default n_iterations - 1)
+
+    Returns:
+        (n_chains, max_lag + 1) array
+    """
+    draws = _as_draws(draws)
+    n = draws.shape[1]
+    max_lag = n - 1 if max_lag is None else min(max_lag, n - 1)
+    return np.stack([_autocovariance_sum(chain[np.newaxis], max_lag) for chain in draws])
+
+
+def autocorrelation(draws, max_lag: Optional[int] = None) -> np.ndarray:
+    """Per-chain autocorrelation, (n_chains, max_lag + 1); lag 0 is 1."""
+    acov = autocovariance(draws, max_lag)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return acov / acov[:, :1]
+
+
+def split_chains(draws) -> np.ndarray:
+    """Split each chain into halves: (n_chains, n) -> (2 * n_chains, n // 2).
+
+    The halves of chain c are rows 2c and 2c + 1 (a view when n is even);
+    with an odd n the middle draw is dropped.
+    """
+    draws = _as_draws(draws)
+    n_chains, n = draws.shape
+    half = n // 2
+    if n % 2:
+        draws = np.concatenate([draws[:, :half], draws[:, -half:]], axis=1)
+    return draws.reshape(2 * n_chains, half)
+
+
+def _variances(within: float, means: np.ndarray, n: int):
+    """var+ = (n - 1) / n * W + B / n from W and the chain means."""
+    between_over_n = means.var(ddof=1) if means.size > 1 else 0.0
+    return (n - 1) / n * within + between_over_n
+
+
+def rhat(draws) -> float:
+    """
+    Split-R-hat: sqrt(var+ / W) over the split chains.
+
+    Values near 1 mean the halves of all chains agree; NaN if the draws
+    are constant or there are fewer than 4 iterations.
+    """
+    draws = split_chains(draws)
+    n = draws.shape[1]
+    if n < 2:
+        return float('nan')
+    within = draws.var(axis=1, ddof=1).mean()
+    var_plus = _variances(within, draws.mean(axis=1), n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.sqrt(var_plus / within))
+
+
+def _geyer_tau(rho: np.ndarray) -> Optional[float]:
+    """
+    Integrated autocorrelation time from Geyer's initial monotone sequence,
+    or None if the pair sums stay positive through the lags given.
+    """
+    n_pairs = rho.size // 2
+    pairs = rho[:2 * n_pairs:2] + rho[1:2 * n_pairs:2]
+    negative = np.flatnonzero(pairs < 0)
+    if negative.size == 0:
+        return None
+    pairs = np.minimum.accumulate(pairs[:negative[0]])
+    return -1.0 + 2.0 * pairs.sum()
+
+
+def ess(draws, max_lag: Optional[int] = None) -> float:
+    """
+    Effective sample size of the chains combined.
+
+    rho_t = 1 - (W - mean autocovariance_t) / var+ over the split chains,
+    summed with Geyer's initial monotone sequence; capped at
+    N * log10(N) for N total draws, as Stan does for antithetic chains.
+
+    Args:
+        draws: (n_chains, n_iterations) draws
+        max_lag: Only consider lags up to this (default: as many as needed)
+    """
+    draws = split_chains(draws)
+    n_chains, n = draws.shape
+    if n < 4:
+        return float('nan')
+    means = draws.mean(axis=1)
+
+    limit = n - 1 if max_lag is None else min(max_lag, n - 1)
+    lags = min(INITIAL_MAX_LAG, limit)
+    while True:
+        # Unbiased scaling, so lag 0 is the mean within-chain variance W
+        mean_acov = _autocovariance_sum(draws, lags, means) * n / ((n - 1) * n_chains)
+        within = mean_acov[0]
+        var_plus = _variances(within, means, n)
+        if not var_plus > 0:
+            return float('nan')
+        rho = 1 - (within - mean_acov) / var_plus
+        tau = _geyer_tau(rho)
+        if tau is not None or lags == limit:
+            break
+        lags = limit
+
+    if tau is None:
+        tau = -1.0 + 2.0 * (rho[:2 * (rho.size // 2)].sum())
+    total = n_chains * n
+    return float(min(total / max(tau, 1.0 / np.log10(total)), total * np.log10(total)))
+
+
+def mcse_mean(draws) -> float:
+    """Monte Carlo standard error of the mean of all draws."""
+    draws = _as_draws(draws)
+    return float(np.sqrt(draws.var(ddof=1) / ess(draws)))
+
+
+def summarize(samples: np.ndarray, columns=COLUMNS) -> Dict[str, Dict[str, float]]:
+    """
+    Diagnostics for every column of (n_chains, n_iterations, k) sampler output.
+
+    Returns:
+        {column: {'mean', 'sd', 'mcse', 'ess', 'rhat'}}
+    """
+    samples = np.asarray(samples)
+    summary = {}
+    for k, name in enumerate(columns):
+        draws = np.ascontiguousarray(samples[..., k])
+        n_eff = ess(draws)
+        sd = float(draws.std(ddof=1))
+        summary[name] = {
+            'mean': float(draws.mean()),
+            'sd': sd,
+            'mcse': sd / np.sqrt(n_eff),
+            'ess': n_eff,
+            'rhat': rhat(draws),
+        }
+    return summary
@@ -0,0 +1,141 @@
+"""
+Evaluation counting and timing for TerrainFunction.
+
+InstrumentedTerrain is a drop-in TerrainFunction that shares the wrapped
+terrain's grid and records, for every public evaluation method, how many
+calls were made, how many points they evaluated and the cumulative wall
+time. Each record is attributed to the step_* function on the call stack
+(or the outermost non-terrain caller, e.g. run_optimization for the
+initial evaluation), so algorithms can be compared by objective cost
+rather than iteration count.
+
+Nested calls are counted too: a finite-difference get_gradient is recorded
+once under 'get_gradient' and four times under 'get_elevation', and its
+time is included in both (times are inclusive).
+
+    terrain = InstrumentedTerrain(load_terrain(path))
+    step_newton_raphson(state, terrain)
+    terrain.counter.evaluations('step_newton_raphson')  # -> 10
+
+run_optimization(..., instrument=True) does this wrapping itself and
+returns the counter as trajectory.evaluations.
+"""
+
+import sys
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+from algorithms import TerrainFunction
+
+INSTRUMENTED_METHODS = (
+    'get_elevation', 'get_elevation_batch',
+    'get_gradient', 'get_hessian_diag', 'get_full_hessian', 'get_derivatives',
+    'get_gradient_batch', 'get_hessian_diag_batch', 'get_full_hessian_batch',
+    'get_derivatives_batch',
+    '_analytic_derivatives', '_analytic_derivatives_batch',
+)
+
+# Methods that sample the surface itself; their point counts are the
+# objective evaluations an algorithm spends
+PRIMITIVE_METHODS = ('get_elevation', 'get_elevation_batch',
+                     '_analytic_derivatives', '_analytic_derivatives_batch')
+
+_TERRAIN_METHOD_NAMES = frozenset(dir(TerrainFunction))
+
+
+class EvaluationCounter:
+    """Per (caller, method) call counts, point counts and cumulative seconds."""
+
+    def __init__(self):
+        self.records: Dict[tuple, list] = {}
+
+    def record(self, caller: str, method: str, points: int, seconds: float) -> None:
+        entry = self.records.get((caller, method))
+        if entry is None:
+            self.records[(caller, method)] = [1, points, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += points
+            entry[2] += seconds
+
+    def reset(self) -> None:
+        self.records.clear()
+
+    def by_caller(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Nested {caller: {method: {'calls', 'points', 'seconds'}}}."""
+        summary = {}
+        for (caller, method), (calls, points, seconds) in self.records.items():
+            summary.setdefault(caller, {})[method] = {
+                'calls': calls, 'points': points, 'seconds': seconds,
+            }
+        return summary
+
+    def calls(self, method: str, caller: Optional[str] = None) -> int:
+        """Number of calls to method, optionally only from caller."""
+        return sum(entry[0] for (c, m), entry in self.records.items()
+                   if m == method and (caller is None or c == caller))
+
+    def evaluations(self, caller: Optional[str] = None) -> int:
+        """Points at which the surface was sampled, optionally only from caller."""
+        return sum(entry[1] for (c, m), entry in self.records.items()
+                   if m in PRIMITIVE_METHODS and (caller is None or c == caller))
+
+    def seconds(self, method: str, caller: Optional[str] = None) -> float:
+        """Cumulative (inclusive) time spent in method."""
+        return sum(entry[2] for (c, m), entry in self.records.items()
+                   if m == method and (caller is None or c == caller))
+
+    def __repr__(self) -> str:
+        return f'EvaluationCounter(evaluations={self.evaluations()}, records={len(self.records)})'
+
+
+def _caller_name(frame) -> str:
+    """Nearest step_* function on the stack, else the first non-terrain frame."""
+    outer = None
+    while frame is not None:
+        name = frame.f_code.co_name
+        if name.startswith('step_'):
+            return name
+        if outer is None and name not in _TERRAIN_METHOD_NAMES and name != 'wrapper':
+            outer = name
+        frame = frame.f_back
+    return outer or '<unknown>'
+
+
+def _instrument(method: str):
+    base = getattr(TerrainFunction, method)
+
+    def wrapper(self, x, y, *args, **kwargs):
+        start = time.perf_counter()
+        result = base(self, x, y, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        points = np.broadcast(x, y).size if method.endswith('_batch') else 1
+        self.counter.record(_caller_name(sys._getframe(1)), method, points, elapsed)
+        return result
+
+    wrapper.__name__ = 'wrapper'
+    wrapper.__doc__ = base.__doc__
+    return wrapper
+
+
+class InstrumentedTerrain(TerrainFunction):
+    """
+    TerrainFunction that counts and times its own evaluations.
+
+    Shares the wrapped terrain's elevation grid and coefficient table (no
+    copy), and returns exactly the same values; only the bookkeeping
+    differs. Counts accumulate in self.counter until reset().
+    """
+
+    def __init__(self, terrain: TerrainFunction, counter: Optional[EvaluationCounter] = None):
+        self.__dict__.update(terrain.__dict__)
+        self.counter = counter if counter is not None else EvaluationCounter()
+
+    def reset(self) -> None:
+        self.counter.reset()
+
+
+for _method in INSTRUMENTED_METHODS:
+    setattr(InstrumentedTerrain, _method, _instrument(_method))
+del _method
@@ -0,0 +1,445 @@
+"""
+Population engine: advance many optimizer runs in lockstep.
+
+Each algorithm in algorithms.py steps a single OptimizationState. Here N
+runs are held in struct-of-arrays form and every iteration advances all
+still-active members with one vectorized kernel, using the batch
+evaluation methods on TerrainFunction. Converged members are masked out.
+
+The deterministic kernels (gradient, newton) reproduce run_optimization
+exactly, member by member. The stochastic kernels (annealing,
+random-restart) follow the same rules but draw their random numbers for
+the whole population at once, so they are equal in distribution rather
+than sample-for-sample.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any
+
+import numpy as np
+from algorithms import (
+    CONVERGENCE_REASONS,
+    STATE_DTYPE,
+    STATE_FIELDS,
+    OptimizationConfig,
+    OptimizationState,
+    TerrainFunction,
+)
+
+GRADIENT_SMALL = CONVERGENCE_REASONS.index('gradient_small')
+TEMPERATURE_MIN = CONVERGENCE_REASONS.index('temperature_min')
+RESTARTS_EXHAUSTED = CONVERGENCE_REASONS.index('restarts_exhausted')
+
+
+@dataclass
+class PopulationState:
+    """Struct-of-arrays counterpart of OptimizationState for N runs."""
+    x: np.ndarray
+    y: np.ndarray
+    elevation: np.ndarray
+    iteration: np.ndarray
+    converged: np.ndarray
+    convergence_reason: np.ndarray  # Index into CONVERGENCE_REASONS
+    best_x: np.ndarray
+    best_y: np.ndarray
+    best_elevation: np.ndarray
+    temperature: np.ndarray
+    restarts: np.ndarray
+    step_size: np.ndarray
+    gradient_magnitude: np.ndarray
+
+    @classmethod
+    def from_points(
+        cls,
+        x0: np.ndarray,
+        y0: np.ndarray,
+        terrain: TerrainFunction,
+        config: OptimizationConfig = None
+    ) -> 'PopulationState':
+        """Initialize a population at the given start points."""
+        if config is None:
+            config = OptimizationConfig()
+
+        x0, y0 = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(y0, dtype=float))
+        x = x0.ravel().copy()
+        y = y0.ravel().copy()
+        n = x.size
+        elevation = terrain.get_elevation_batch(x, y)
+
+        return cls(
+            x=x,
+            y=y,
+            elevation=elevation,
+            iteration=np.zeros(n, dtype=np.int64),
+            converged=np.zeros(n, dtype=bool),
+            convergence_reason=np.zeros(n, dtype=np.int8),
+            best_x=x.copy(),
+            best_y=y.copy(),
+            best_elevation=elevation.copy(),
+            temperature=np.full(n, config.sa_initial_temp),
+            restarts=np.zeros(n, dtype=np.int64),
+            step_size=np.zeros(n),
+            gradient_magnitude=np.zeros(n),
+        )
+
+    @classmethod
+    def from_array(cls, records: np.ndarray) -> 'PopulationState':
+        """Build a population from a STATE_DTYPE structured array (copies)."""
+        return cls(**{name: records[name].astype(STATE_FIELDS[name])
+                      for name in STATE_FIELDS if name != 'accepted'})
+
+    def to_array(self) -> np.ndarray:
+        """Pack the population into a STATE_DTYPE structured array."""
+        records = np.empty(self.size, dtype=STATE_DTYPE)
+        for name in STATE_FIELDS:
+            records[name] = -1 if name == 'accepted' else getattr(self, name)
+        return records
+
+    @property
+    def size(self) -> int:
+        return self.x.size
+
+    def state(self, i: int) -> OptimizationState:
+        """Materialize member i as an OptimizationState."""
+        return OptimizationState(
+            x=float(self.x[i]),
+            y=float(self.y[i]),
+            elevation=float(self.elevation[i]),
+            iteration=int(self.iteration[i]),
+            converged=bool(self.converged[i]),
+            convergence_reason=CONVERGENCE_REASONS[self.convergence_reason[i]],
+            best_x=float(self.best_x[i]),
+            best_y=float(self.best_y[i]),
+            best_elevation=float(self.best_elevation[i]),
+            temperature=float(self.temperature[i]),
+            restarts=int(self.restarts[i]),
+            step_size=float(self.step_size[i]),
+            gradient_magnitude=float(self.gradient_magnitude[i]),
+        )
+
+
+def _update_best(pop: PopulationState, idx: np.ndarray) -> None:
+    """Record new bests for members idx (strict improvement, as in the scalar code)."""
+    better = idx[pop.elevation[idx] > pop.best_elevation[idx]]
+    pop.best_x[better] = pop.x[better]
+    pop.best_y[better] = pop.y[better]
+    pop.best_elevation[better] = pop.elevation[better]
+
+
+def _converge(pop: PopulationState, idx: np.ndarray, reason: int) -> None:
+    pop.converged[idx] = True
+    pop.convergence_reason[idx] = reason
+
+
+def _return_to_best(pop: PopulationState, idx: np.ndarray) -> None:
+    pop.x[idx] = pop.best_x[idx]
+    pop.y[idx] = pop.best_y[idx]
+    pop.elevation[idx] = pop.best_elevation[idx]
+
+
+def step_gradient_ascent_population(
+    pop: PopulationState,
+    idx: np.ndarray,
+    terrain: TerrainFunction,
+    config: OptimizationConfig
+) -> None:
+    """Vectorized step_gradient_ascent for members idx (in place)."""
+    gx, gy = terrain.get_gradient_batch(pop.x[idx], pop.y[idx])
+    magnitude = np.sqrt(gx ** 2 + gy ** 2)
+
+    done = magnitude < config.ga_convergence_tol
+    _converge(pop, idx[done], GRADIENT_SMALL)
+
+    move = ~done
+    idx, gx, gy, magnitude = idx[move], gx[move], gy[move], magnitude[move]
+
+    step_x = (gx / magnitude) * config.ga_step_size
+    step_y = (gy / magnitude) * config.ga_step_size
+
+    pop.x[idx] = np.clip(pop.x[idx] + step_x, 0.0, 1.0)
+    pop.y[idx] = np.clip(pop.y[idx] + step_y, 0.0, 1.0)
+    pop.elevation[idx] = terrain.get_elevation_batch(pop.x[idx], pop.y[idx])
+    pop.iteration[idx] += 1
+    pop.step_size[idx] = config.ga_step_size
+    pop.gradient_magnitude[idx] = magnitude
+
+    _update_best(pop, idx)
+
+
+def step_newton_raphson_population(
+    pop: PopulationState,
+    idx: np.ndarray,
+    terrain: TerrainFunction,
+    config: OptimizationConfig
+) -> None:
+    """Vectorized step_newton_raphson for members idx (in place)."""
+    _, gx, gy, fxx, fyy, fxy = terrain.get_derivatives_batch(pop.x[idx], pop.y[idx], config.nr_h)
+    magnitude = np.sqrt(gx ** 2 + gy ** 2)
+
+    done = magnitude < config.nr_convergence_tol
+    _converge(pop, idx[done], GRADIENT_SMALL)
+
+    move = ~done
+    idx, gx, gy, magnitude = idx[move], gx[move], gy[move], magnitude[move]
+    fxx, fyy, fxy = fxx[move], fyy[move], fxy[move]
+
+    threshold = config.nr_hessian_threshold
+    det = fxx * fyy - fxy * fxy
+    neg_def = (fxx < threshold) & (fyy < threshold) & (det > 1e-10)
+    x_ok = fxx < threshold
+    y_ok = fyy < threshold
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Full 2x2 inverse where negative definite, per-axis fallback elsewhere
+        step_x = np.where(
+            neg_def,
+            -(fyy * gx - fxy * gy) / det,
+            np.where(x_ok, -gx / fxx, gx * config.nr_fallback_step_size),
+        )
+        step_y = np.where(
+            neg_def,
+            -(-fxy * gx + fxx * gy) / det,
+            np.where(y_ok, -gy / fyy, gy * config.nr_fallback_step_size),
+        )
+
+    step_x = np.clip(step_x * config.nr_damping, -config.nr_max_step, config.nr_max_step)
+    step_y = np.clip(step_y * config.nr_damping, -config.nr_max_step, config.nr_max_step)
+
+    pop.x[idx] = np.clip(pop.x[idx] + step_x, 0.0, 1.0)
+    pop.y[idx] = np.clip(pop.y[idx] + step_y, 0.0, 1.0)
+    pop.elevation[idx] = terrain.get_elevation_batch(pop.x[idx], pop.y[idx])
+    pop.iteration[idx] += 1
+    pop.step_size[idx] = np.sqrt(step_x ** 2 + step_y ** 2)
+    pop.gradient_magnitude[idx] = magnitude
+
+    _update_best(pop, idx)
+
+
+def step_simulated_annealing_population(
+    pop: PopulationState,
+    idx: np.ndarray,
+    terrain: TerrainFunction,
+    config: OptimizationConfig,
+    rng: np.random.Generator
+) -> None:
+    """Vectorized step_simulated_annealing for members idx (in place)."""
+    cooled = pop.temperature[idx] < config.sa_min_temp
+    _converge(pop, idx[cooled], TEMPERATURE_MIN)
+    _return_to_best(pop, idx[cooled])
+
+    idx = idx[~cooled]
+    temperature = pop.temperature[idx]
+    u = rng.random((3, idx.size))
+
+    step_size = config.sa_step_scale * temperature
+    proposed_x = np.clip(pop.x[idx] + (u[0] - 0.5) * step_size, 0.0, 1.0)
+    proposed_y = np.clip(pop.y[idx] + (u[1] - 0.5) * step_size, 0.0, 1.0)
+    proposed_elev = terrain.get_elevation_batch(proposed_x, proposed_y)
+
+    delta = proposed_elev - pop.elevation[idx]
+    accept_prob = np.where(
+        delta > 0, 1.0, np.exp(np.minimum(delta, 0.0) / (temperature * config.sa_temp_scale))
+    )
+    accept = u[2] < accept_prob
+
+    moved = idx[accept]
+    pop.x[moved] = proposed_x[accept]
+    pop.y[moved] = proposed_y[accept]
+    pop.elevation[moved] = proposed_elev[accept]
+
+    _update_best(pop, idx)
+    pop.temperature[idx] *= config.sa_cooling_rate
+    pop.iteration[idx] += 1
+
+
+def step_random_restarts_population(
+    pop: PopulationState,
+    idx: np.ndarray,
+    terrain: TerrainFunction,
+    config: OptimizationConfig,
+    rng: np.random.Generator
+) -> None:
+    """Vectorized step_random_restarts for members idx (in place)."""
+    gx, gy = terrain.get_gradient_batch(pop.x[idx], pop.y[idx])
+    magnitude = np.sqrt(gx ** 2 + gy ** 2)
+    local_iteration = pop.iteration[idx] - pop.restarts[idx] * config.rr_max_iter_per_restart
+
+    restart = (magnitude < 0.5) | (local_iteration >= config.rr_max_iter_per_restart)
+
+    # Members whose current restart has finished
+    ridx = idx[restart]
+    pop.restarts[ridx] += 1
+    _update_best(pop, ridx)
+
+    exhausted = pop.restarts[ridx] >= config.rr_max_restarts
+    _converge(pop, ridx[exhausted], RESTARTS_EXHAUSTED)
+    _return_to_best(pop, ridx[exhausted])
+
+    fresh = ridx[~exhausted]
+    pop.x[fresh] = rng.random(fresh.size)
+    pop.y[fresh] = rng.random(fresh.size)
+    pop.elevation[fresh] = terrain.get_elevation_batch(pop.x[fresh], pop.y[fresh])
+    pop.iteration[fresh] += 1
+
+    # Members taking a gradient step
+    move = ~restart
+    idx, gx, gy, magnitude = idx[move], gx[move], gy[move], magnitude[move]
+
+    step_size = config.rr_step_size
+    pop.x[idx] = np.clip(pop.x[idx] + (gx / magnitude) * step_size, 0.0, 1.0)
+    pop.y[idx] = np.clip(pop.y[idx] + (gy / magnitude) * step_size, 0.0, 1.0)
+    pop.elevation[idx] = terrain.get_elevation_batch(pop.x[idx], pop.y[idx])
+    pop.iteration[idx] += 1
+
+    _update_best(pop, idx)
+
+
+def run_population(
+    algorithm: str,
+    terrain: TerrainFunction,
+    x0: np.ndarray,
+    y0: np.ndarray,
+    max_iterations: int = 1000,
+    config: OptimizationConfig = None,
+    seed: int = None
+) -> PopulationState:
+    """
+    Run many optimizations in lockstep until all converge or hit max_iterations.
+
+    Args:
+        algorithm: One of 'gradient', 'newton', 'annealing', 'random-restart'
+        terrain: Terrain objective function
+        x0, y0: Arrays of starting coordinates (broadcast together)
+        max_iterations: Per-member iteration limit, as in run_optimization
+        config: Algorithm configuration
+        seed: Random seed for the stochastic algorithms
+
+    Returns:
+        Final PopulationState
+    """
+    if config is None:
+        config = OptimizationConfig()
+    if algorithm in ('gradient', 'random-restart') and config.ga_step_mode != 'fixed':
+        raise ValueError(f"run_population only supports ga_step_mode='fixed', got "
+                         f"{config.ga_step_mode!r}; use run_optimization for adaptive steps")
+
+    rng = np.random.default_rng(seed)
+    pop = PopulationState.from_points(x0, y0, terrain, config)
+
+    step_fn = {
+        'gradient': lambda idx: step_gradient_ascent_population(pop, idx, terrain, config),
+        'newton': lambda idx: step_newton_raphson_population(pop, idx, terrain, config),
+        'annealing': lambda idx: step_simulated_annealing_population(pop, idx, terrain, config, rng),
+        'random-restart': lambda idx: step_random_restarts_population(pop, idx, terrain, config, rng),
+    }[algorithm]
+
+    while True:
+        active = np.flatnonzero(~pop.converged & (pop.iteration < max_iterations))
+        if active.size == 0:
+            break
+        step_fn(active)
+
+    return pop
+
+
+def grid_starts(resolution: int, margin: float = 0.02):
+    """Start points on a regular resolution x resolution grid inside [margin, 1 - margin]."""
+    axis = np.linspace(margin, 1 - margin, resolution)
+    xx, yy = np.meshgrid(axis, axis)
+    return xx, yy
+
+
+def label_peaks(x: np.ndarray, y: np.ndarray, elevation: np.ndarray,
+                merge_radius: float = 0.02) -> np.ndarray:
+    """
+    Assign a peak id to each final position.
+
+    Positions within merge_radius of an already-labelled peak share its id.
+    Peaks are numbered in order of decreasing elevation, so id 0 is the
+    highest peak reached.
+    """
+    labels = np.full(x.size, -1, dtype=np.int64)
+    peak_x = np.empty(x.size)
+    peak_y = np.empty(x.size)
+    n_peaks = 0
+    for i in np.argsort(-elevation, kind='stable'):
+        d2 = (peak_x[:n_peaks] - x[i]) ** 2 + (peak_y[:n_peaks] - y[i]) ** 2
+        near = np.flatnonzero(d2 <= merge_radius ** 2)
+        if near.size:
+            labels[i] = near[0]
+        else:
+            labels[i] = n_peaks
+            peak_x[n_peaks] = x[i]
+            peak_y[n_peaks] = y[i]
+            n_peaks += 1
+    return labels
+
+
+def basin_map(
+    algorithm: str,
+    terrain: TerrainFunction,
+    resolution: int = 50,
+    max_iterations: int = 1000,
+    config: OptimizationConfig = None,
+    seed: int = None,
+    merge_radius: float = 0.02
+) -> Dict[str, Any]:
+    """
+    Basin-of-attraction map: run the algorithm from every point of a grid.
+
+    Returns:
+        Dict of (resolution, resolution) arrays: 'x0', 'y0' start points,
+        'final_x', 'final_y', 'final_elevation', 'iterations', 'converged'
+        and 'peak_id' (see label_peaks), plus 'summary' from
+        convergence_summary.
+    """
+    xx, yy = grid_starts(resolution)
+    pop = run_population(algorithm, terrain, xx, yy, max_iterations, config, seed)
+    peak_id = label_peaks(pop.x, pop.y, pop.elevation, merge_radius)
+
+    shape = xx.shape
+    return {
+        'x0': xx,
+        'y0': yy,
+        'final_x': pop.x.reshape(shape),
+        'final_y': pop.y.reshape(shape),
+        'final_elevation': pop.elevation.reshape(shape),
+        'iterations': pop.iteration.reshape(shape),
+        'converged': pop.converged.reshape(shape),
+        'peak_id': peak_id.reshape(shape),
+        'summary': convergence_summary(pop),
+    }
+
+
+def convergence_summary(pop: PopulationState) -> Dict[str, Any]:
+    """Convergence-rate statistics over a population."""
+    converged_iters = pop.iteration[pop.converged]
+    return {
+        'n': pop.size,
+        'converged_fraction': float(pop.converged.mean()) if pop.size else 0.0,
+        'mean_iterations': float(converged_iters.mean()) if converged_iters.size else float('nan'),
+        'median_iterations': float(np.median(converged_iters)) if converged_iters.size else float('nan'),
+        'p90_iterations': float(np.percentile(converged_iters, 90)) if converged_iters.size else float('nan'),
+        'mean_final_elevation': float(pop.elevation.mean()) if pop.size else float('nan'),
+        'best_elevation': float(pop.best_elevation.max()) if pop.size else float('nan'),
+    }
+
+
+if __name__ == '__main__':
+    import time
+    from pathlib import Path
+    from algorithms import load_terrain
+
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    terrain = load_terrain(str(terrain_path))
+
+    for algo in ['gradient', 'newton', 'annealing', 'random-restart']:
+        start = time.perf_counter()
+        result = basin_map(algo, terrain, resolution=50, seed=42)
+        elapsed = time.perf_counter() - start
+        summary = result['summary']
+        n_peaks = int(result['peak_id'].max()) + 1
+        print(f"{algo:15s}: {summary['n']} starts in {elapsed:.2f}s, "
+              f"converged={summary['converged_fraction']:.0%}, "
+              f"median iters={summary['median_iterations']:.0f}, peaks={n_peaks}")
@@ -0,0 +1,460 @@
+"""
+Vectorized MCMC samplers over TerrainFunction.
+
+run_mcmc_chains in algorithms.py is the scalar reference: it steps each
+chain with step_mcmc and records a dict per sample. The samplers here
+advance all chains at once with array-valued proposals and acceptance
+tests, writing into preallocated arrays:
+
+    samples:  (n_chains, n_iterations, 3) float, columns x, y, elevation
+    accepted: (n_chains, n_iterations) bool
+
+run_parallel_tempering runs a ladder of tempered replicas per chain and
+returns the same arrays for the untempered (T = 1) replicas.
+
+With rng_streams='per-chain', chain k draws from its own stream
+stream_seed(seed, k), so run_mcmc_chains, run_mcmc_vectorized and
+run_mcmc_pool (chains split across processes) give identical chains.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+from algorithms import (
+    RNG_STREAM_MODES,
+    OptimizationConfig,
+    TerrainFunction,
+    chain_rngs,
+    run_mcmc_chains,
+)
+from shared_terrain import SharedTerrain, SharedTerrainHandle, attach
+
+# Proposals outside this box are rejected, as in step_mcmc
+BOUNDS = (0.01, 0.99)
+
+
+def _log_accept_ratio(proposed: np.ndarray, current: np.ndarray,
+                      config: OptimizationConfig) -> np.ndarray:
+    """Vectorized form of the acceptance ratio used by step_mcmc."""
+    if config.mcmc_use_log_posterior:
+        return (np.log(np.maximum(1, proposed)) - np.log(np.maximum(1, current))) * config.mcmc_log_scale
+    return proposed - current
+
+
+def _log_target(elevation: np.ndarray, config: OptimizationConfig) -> np.ndarray:
+    """Untempered log posterior whose differences _log_accept_ratio computes."""
+    if config.mcmc_use_log_posterior:
+        return np.log(np.maximum(1, elevation)) * config.mcmc_log_scale
+    return elevation
+
+
+def _summary(accepted: np.ndarray) -> dict:
+    n_chains, n_iterations = accepted.shape
+    total_accepted = int(accepted.sum())
+    total_proposed = accepted.size
+    return {
+        'n_chains': n_chains,
+        'n_iterations': n_iterations,
+        'total_accepted': total_accepted,
+        'total_proposed': total_proposed,
+        'acceptance_rate': total_accepted / total_proposed if total_proposed > 0 else 0,
+        'chain_acceptance_rates': accepted.mean(axis=1) if n_iterations else np.zeros(n_chains),
+    }
+
+
+def initial_positions(n_chains: int, rng: np.random.Generator,
+                      initial_region: Tuple[float, float, float, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Uniform starting points in (x_min, x_max, y_min, y_max)."""
+    x_min, x_max, y_min, y_max = initial_region
+    x = x_min + rng.random(n_chains) * (x_max - x_min)
+    y = y_min + rng.random(n_chains) * (y_max - y_min)
+    return x, y
+
+
+def metropolis_step(x: np.ndarray, y: np.ndarray, elevation: np.ndarray,
+                    terrain: TerrainFunction, config: OptimizationConfig,
+                    rng: np.random.Generator) -> np.ndarray:
+    """
+    One random-walk Metropolis step for every chain, updating x, y and
+    elevation in place.
+
+    Returns:
+        Indices of the chains whose proposal was accepted
+    """
+    lo, hi = BOUNDS
+    n_chains = x.size
+    z = rng.standard_normal((2, n_chains))
+    proposed_x = x + z[0] * config.mcmc_proposal_sd
+    proposed_y = y + z[1] * config.mcmc_proposal_sd
+    log_u = np.log(rng.random(n_chains))
+
+    in_bounds = (proposed_x >= lo) & (proposed_x <= hi) & (proposed_y >= lo) & (proposed_y <= hi)
+    idx = np.flatnonzero(in_bounds)
+    proposed_elevation = terrain.get_elevation_batch(proposed_x[idx], proposed_y[idx])
+    ratio = _log_accept_ratio(proposed_elevation, elevation[idx], config)
+
+    accept = log_u[idx] < ratio
+    moved = idx[accept]
+    x[moved] = proposed_x[moved]
+    y[moved] = proposed_y[moved]
+    elevation[moved] = proposed_elevation[accept]
+    return moved
+
+
+def _legacy_metropolis_step(x: np.ndarray, y: np.ndarray, elevation: np.ndarray,
+                            terrain: TerrainFunction, config: OptimizationConfig,
+                            rngs: List[np.random.Generator]) -> np.ndarray:
+    """
+    metropolis_step consuming random numbers in run_mcmc_chains order:
+    chain i draws from rngs[i] (the same generator for every chain with
+    shared streams).
+    """
+    lo, hi = BOUNDS
+    n_chains = x.size
+    proposed_x = np.empty(n_chains)
+    proposed_y = np.empty(n_chains)
+    log_u = np.full(n_chains, np.inf)
+    for i, rng in enumerate(rngs):
+        proposed_x[i] = x[i] + rng.standard_normal() * config.mcmc_proposal_sd
+        proposed_y[i] = y[i] + rng.standard_normal() * config.mcmc_proposal_sd
+        if lo <= proposed_x[i] <= hi and lo <= proposed_y[i] <= hi:
+            log_u[i] = math.log(rng.random())
+
+    in_bounds = (proposed_x >= lo) & (proposed_x <= hi) & (proposed_y >= lo) & (proposed_y <= hi)
+    idx = np.flatnonzero(in_bounds)
+    proposed_elevation = terrain.get_elevation_batch(proposed_x[idx], proposed_y[idx])
+
+    # Scalar math.log keeps the accept decisions bit-identical to step_mcmc
+    ratio = np.array([
+        (math.log(max(1, p)) - math.log(max(1, c))) * config.mcmc_log_scale
+        if config.mcmc_use_log_posterior else p - c
+        for p, c in zip(proposed_elevation.tolist(), elevation[idx].tolist())
+    ])
+
+    accept = log_u[idx] < ratio
+    moved = idx[accept]
+    x[moved] = proposed_x[moved]
+    y[moved] = proposed_y[moved]
+    elevation[moved] = proposed_elevation[accept]
+    return moved
+
+
+def run_mcmc_vectorized(
+    n_chains: int,
+    terrain: TerrainFunction,
+    n_iterations: int,
+    config: OptimizationConfig = None,
+    seed: int = None,
+    initial_region: Tuple[float, float, float, float] = (0.1, 0.4, 0.1, 0.4),
+    legacy_stream: bool = False,
+    rng_streams: str = 'shared',
+    first_chain: int = 0
+) -> Tuple[np.ndarray, np.ndarray, dict]:
+    """
+    Random-walk Metropolis-Hastings with all chains advanced in lockstep.
+
+    Args:
+        n_chains: Number of parallel chains
+        terrain: Objective function
+        n_iterations: Number of iterations per chain
+        config: Algorithm configuration
+        seed: Random seed for reproducibility
+        initial_region: (x_min, x_max, y_min, y_max) for starting positions
+        legacy_stream: If True, consume random numbers in exactly the order
+            run_mcmc_chains does (chain by chain, skipping the uniform for
+            out-of-bounds proposals), so the output reproduces it sample
+            for sample. Slower; intended for regression tests.
+        rng_streams: 'per-chain' draws chain k's numbers from
+            stream_seed(seed, k) in run_mcmc_chains order, reproducing
+            run_mcmc_chains(..., rng_streams='per-chain') sample for sample
+            (legacy_stream is implied)
+        first_chain: Id of the first chain ('per-chain' only)
+
+    Returns:
+        Tuple of (samples, accepted, summary_stats)
+    """
+    if config is None:
+        config = OptimizationConfig()
+    if config.mcmc_adapt != 'none':
+        raise ValueError(f"Vectorized samplers use a fixed proposal, got mcmc_adapt="
+                         f"{config.mcmc_adapt!r}; use run_mcmc_chains for adaptive proposals")
+
+    if rng_streams not in RNG_STREAM_MODES:
+        raise ValueError(f"rng_streams must be one of {RNG_STREAM_MODES}, got {rng_streams!r}")
+    if rng_streams == 'shared' and first_chain != 0:
+        raise ValueError("first_chain requires rng_streams='per-chain'")
+
+    x_min, x_max, y_min, y_max = initial_region
+    if rng_streams == 'per-chain':
+        rngs = chain_rngs(seed, n_chains, first_chain)
+        legacy_stream = True
+    else:
+        rng = np.random.default_rng(seed)
+        rngs = [rng] * n_chains
+
+    if legacy_stream:
+        x = np.empty(n_chains)
+        y = np.empty(n_chains)
+        for i, chain_rng in enumerate(rngs):
+            x[i] = x_min + chain_rng.random() * (x_max - x_min)
+            y[i] = y_min + chain_rng.random() * (y_max - y_min)
+    else:
+        x, y = initial_positions(n_chains, rng, initial_region)
+    elevation = terrain.get_elevation_batch(x, y)
+
+    samples = np.empty((n_chains, n_iterations, 3))
+    accepted = np.zeros((n_chains, n_iterations), dtype=bool)
+
+    for t in range(n_iterations):
+        if legacy_stream:
+            moved = _legacy_metropolis_step(x, y, elevation, terrain, config, rngs)
+        else:
+            moved = metropolis_step(x, y, elevation, terrain, config, rng)
+
+        samples[:, t, 0] = x
+        samples[:, t, 1] = y
+        samples[:, t, 2] = elevation
+        accepted[moved, t] = True
+
+    return samples, accepted, _summary(accepted)
+
+
+def run_parallel_tempering(
+    n_chains: int,
+    terrain: TerrainFunction,
+    n_iterations: int,
+    config: OptimizationConfig = None,
+    seed: int = None,
+    initial_region: Tuple[float, float, float, float] = (0.1, 0.4, 0.1, 0.4),
+    temperatures: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray, dict]:
+    """
+    Replica-exchange Metropolis-Hastings.
+
+    Each chain is a ladder of replicas at temperatures 1 = T_0 < ... < T_K-1
+    (geometric up to config.pt_max_temp by default), every replica
+    targeting posterior^(1/T) with proposal sd scaled by sqrt(T). All
+    (chain, rung) replicas move in one vectorized step. Every
+    config.pt_swap_interval iterations, neighbouring rungs propose to swap
+    positions, alternating even and odd pairs, and accept with probability
+    min(1, exp((1/T_k - 1/T_k+1) * (L_k+1 - L_k))). Hot replicas cross the
+    low ground between peaks and hand their positions down the ladder.
+
+    Args:
+        n_chains: Number of independent ladders
+        terrain: Objective function
+        n_iterations: Number of iterations per chain
+        config: Algorithm configuration (mcmc_* and pt_* fields)
+        seed: Random seed for reproducibility
+        initial_region: (x_min, x_max, y_min, y_max) for starting positions;
+            all rungs of a ladder start at the same point
+        temperatures: Explicit ladder overriding pt_n_temps/pt_max_temp
+
+    Returns:
+        Tuple of (samples, accepted, summary_stats) for the T = 1 replicas.
+        summary_stats adds 'temperatures', 'rung_acceptance_rates',
+        'swap_acceptance' (per adjacent rung pair) and 'evaluations'.
+    """
+    if config is None:
+        config = OptimizationConfig()
+    if config.mcmc_adapt != 'none':
+        raise ValueError(f"Vectorized samplers use a fixed proposal, got mcmc_adapt="
+                         f"{config.mcmc_adapt!r}; use run_mcmc_chains for adaptive proposals")
+    if temperatures is None:
+        temperatures = np.geomspace(1.0, config.pt_max_temp, config.pt_n_temps)
+    temperatures = np.asarray(temperatures, dtype=float)
+    if temperatures.ndim != 1 or temperatures[0] != 1.0 or np.any(np.diff(temperatures) <= 0):
+        raise ValueError("temperatures must increase from 1.0")
+
+    rng = np.random.default_rng(seed)
+    x_min, x_max, y_min, y_max = initial_region
+    lo, hi = BOUNDS
+    n_temps = temperatures.size
+    inv_temp = 1.0 / temperatures
+    proposal_sd = config.mcmc_proposal_sd * np.sqrt(temperatures)
+
+    x = np.repeat((x_min + rng.random(n_chains) * (x_max - x_min))[:, np.newaxis], n_temps, axis=1)
+    y = np.repeat((y_min + rng.random(n_chains) * (y_max - y_min))[:, np.newaxis], n_temps, axis=1)
+    elevation = terrain.get_elevation_batch(x, y)
+    evaluations = n_chains
+
+    samples = np.empty((n_chains, n_iterations, 3))
+    accepted = np.zeros((n_chains, n_iterations), dtype=bool)
+    moves_accepted = np.zeros(n_temps, dtype=np.int64)
+    swaps_proposed = np.zeros(n_temps - 1, dtype=np.int64)
+    swaps_accepted = np.zeros(n_temps - 1, dtype=np.int64)
+    rows = np.arange(n_chains)[:, np.newaxis]
+
+    for t in range(n_iterations):
+        z = rng.standard_normal((2, n_chains, n_temps))
+        proposed_x = x + z[0] * proposal_sd
+        proposed_y = y + z[1] * proposal_sd
+        log_u = np.log(rng.random((n_chains, n_temps)))
+
+        in_bounds = (proposed_x >= lo) & (proposed_x <= hi) & (proposed_y >= lo) & (proposed_y <= hi)
+        proposed_elevation = np.empty_like(elevation)
+        proposed_elevation[in_bounds] = terrain.get_elevation_batch(proposed_x[in_bounds],
+                                                                    proposed_y[in_bounds])
+        evaluations += int(in_bounds.sum())
+
+        ratio = np.full_like(elevation, -np.inf)
+        ratio[in_bounds] = _log_accept_ratio(proposed_elevation[in_bounds], elevation[in_bounds],
+                                             config) * np.broadcast_to(inv_temp, in_bounds.shape)[in_bounds]
+        accept = log_u < ratio
+        x = np.where(accept, proposed_x, x)
+        y = np.where(accept, proposed_y, y)
+        elevation = np.where(accept, proposed_elevation, elevation)
+        moves_accepted += accept.sum(axis=0)
+        accepted[:, t] = accept[:, 0]
+
+        if n_temps > 1 and (t + 1) % config.pt_swap_interval == 0:
+            first = (t // config.pt_swap_interval) % 2
+            lower = np.arange(first, n_temps - 1, 2)
+            upper = lower + 1
+            log_target = _log_target(elevation, config)
+            log_alpha = (inv_temp[lower] - inv_temp[upper]) * (log_target[:, upper] - log_target[:, lower])
+            swap = np.log(rng.random((n_chains, lower.size))) < log_alpha
+            swaps_proposed[lower] += n_chains
+            swaps_accepted[lower] += swap.sum(axis=0)
+
+            # Exchange positions between rungs k and k+1 where accepted
+            src = np.broadcast_to(np.arange(n_temps), (n_chains, n_temps)).copy()
+            swap_rows, swap_pairs = np.nonzero(swap)
+            src[swap_rows, lower[swap_pairs]] = upper[swap_pairs]
+            src[swap_rows, upper[swap_pairs]] = lower[swap_pairs]
+            x = x[rows, src]
+            y = y[rows, src]
+            elevation = elevation[rows, src]
+
+        samples[:, t, 0] = x[:, 0]
+        samples[:, t, 1] = y[:, 0]
+        samples[:, t, 2] = elevation[:, 0]
+
+    summary = _summary(accepted)
+    summary.update({
+        'temperatures': temperatures,
+        'rung_acceptance_rates': moves_accepted / max(1, n_chains * n_iterations),
+        'swap_acceptance': swaps_accepted / np.maximum(1, swaps_proposed),
+        'evaluations': evaluations,
+    })
+    return samples, accepted, summary
+
+
+def to_histories(samples: np.ndarray, accepted: np.ndarray) -> list:
+    """Convert sampler arrays to the list-of-dicts format of run_mcmc_chains."""
+    return [
+        [
+            {'x': s[0], 'y': s[1], 'elevation': s[2], 'accepted': a}
+            for s, a in zip(chain.tolist(), chain_accepted.tolist())
+        ]
+        for chain, chain_accepted in zip(samples, accepted)
+    ]
+
+
+def from_histories(histories: list) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert run_mcmc_chains histories to (samples, accepted) arrays."""
+    samples = np.array([[(s['x'], s['y'], s['elevation']) for s in chain] for chain in histories],
+                       dtype=np.float64)
+    accepted = np.array([[s['accepted'] for s in chain] for chain in histories], dtype=bool)
+    return samples, accepted
+
+
+# Terrain of the current pool worker process (set by _init_pool_worker)
+_worker_terrain = None
+
+
+def _init_pool_worker(terrain) -> None:
+    global _worker_terrain
+    if isinstance(terrain, SharedTerrainHandle):
+        terrain = attach(terrain)
+    _worker_terrain = terrain
+
+
+def _run_chain_group(task: tuple) -> Tuple[list, dict]:
+    return _chain_group(task, _worker_terrain)
+
+
+def _chain_group(task: tuple, terrain: TerrainFunction) -> Tuple[list, dict]:
+    first_chain, n_chains, n_iterations, config, seed, initial_region, algorithm = task
+    return run_mcmc_chains(n_chains, terrain, n_iterations, config=config, seed=seed,
+                           initial_region=initial_region, algorithm=algorithm,
+                           rng_streams='per-chain', first_chain=first_chain)
+
+
+def run_mcmc_pool(
+    n_chains: int,
+    terrain: TerrainFunction,
+    n_iterations: int,
+    config: OptimizationConfig = None,
+    seed: int = None,
+    initial_region: Tuple[float, float, float, float] = (0.1, 0.4, 0.1, 0.4),
+    algorithm: str = 'metropolis',
+    processes: int = None
+) -> Tuple[list, dict]:
+    """
+    run_mcmc_chains with per-chain streams, chains split across processes.
+
+    Chains are divided into contiguous groups, one per worker, and the
+    terrain grid is shared with the workers as in sweep.run_sweep. Since
+    chain k always draws from stream_seed(seed, k), the result is the same
+    as run_mcmc_chains(..., rng_streams='per-chain') for any process count,
+    including empty results for n_chains=0.
+
+    The groups' summaries are merged: counts are summed and the acceptance
+    rate recomputed, per-chain list entries (e.g. proposal_scales) are
+    concatenated in chain order, and any other entry (e.g.
+    warmup_iterations) is the same for every group and kept once.
+
+    Args:
+        n_chains, terrain, n_iterations, config, seed, initial_region,
+            algorithm: As for run_mcmc_chains
+        processes: Worker processes (default os.cpu_count()); 1 runs in-process
+
+    Returns:
+        Tuple of (chain_histories, summary_stats)
+    """
+    if config is None:
+        config = OptimizationConfig()
+    # Fix the entropy once so every worker derives its streams from it
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, n_chains))
+
+    sizes = [group.size for group in np.array_split(np.arange(max(n_chains, 0)), processes)]
+    firsts = np.cumsum([0] + sizes[:-1])
+    tasks = [
+        (int(first), size, n_iterations, config, seed, initial_region, algorithm)
+        for first, size in zip(firsts, sizes)
+    ]
+    if processes == 1:
+        # In-process: pass the terrain directly rather than setting the worker global
+        parts = [_chain_group(task, terrain) for task in tasks]
+    else:
+        with SharedTerrain(terrain) as shared:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_pool_worker,
+                                     initargs=(shared.handle,)) as pool:
+                parts = list(pool.map(_run_chain_group, tasks))
+
+    histories = [chain for part_histories, _ in parts for chain in part_histories]
+    total_accepted = sum(summary['total_accepted'] for _, summary in parts)
+    total_proposed = sum(summary['total_proposed'] for _, summary in parts)
+    summary = {
+        'n_chains': n_chains,
+        'n_iterations': n_iterations,
+        'total_accepted': total_accepted,
+        'total_proposed': total_proposed,
+        'acceptance_rate': total_accepted / total_proposed if total_proposed > 0 else 0,
+    }
+    for key, value in parts[0][1].items():
+        if key in summary:
+            continue
+        if isinstance(value, list):
+            summary[key] = [v for _, part in parts for v in part[key]]
+        else:
+            summary[key] = value
+    return histories, summary
@@ -0,0 +1,104 @@
+"""
+Share one copy of a terrain grid between processes.
+
+A SharedTerrain publishes a TerrainFunction's elevation grid once, either
+into a multiprocessing.shared_memory block or into a .npy file that is
+memory-mapped. Its picklable handle is passed to worker processes (e.g.
+through a pool initializer), where attach() wraps the same buffer in a
+TerrainFunction without copying and without any JSON parsing.
+
+    with SharedTerrain(terrain) as shared:
+        with ProcessPoolExecutor(initializer=init, initargs=(shared.handle,)) as pool:
+            ...
+
+    # in the worker
+    terrain = attach(handle)
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from algorithms import TerrainFunction
+
+
+@dataclass(frozen=True)
+class SharedTerrainHandle:
+    """Picklable description of a published terrain grid."""
+    kind: str  # 'shm' or 'npy'
+    location: str  # Shared memory block name, or .npy path
+    shape: Tuple[int, int]
+    dtype: str
+    stats: Dict[str, Any]
+    derivatives: str = 'finite'
+
+
+class SharedTerrain:
+    """
+    Owner of a published terrain grid.
+
+    Args:
+        terrain: Terrain to publish
+        npy_path: If given, write the grid to this .npy file and share it by
+            memory mapping instead of through shared memory. The file is left
+            in place on close so it can be reused.
+    """
+
+    def __init__(self, terrain: TerrainFunction, npy_path: Optional[str] = None):
+        elevations = np.ascontiguousarray(terrain.elevations, dtype=np.float64)
+        self._shm = None
+
+        if npy_path is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, elevations.nbytes))
+            view = np.ndarray(elevations.shape, dtype=elevations.dtype, buffer=self._shm.buf)
+            view[...] = elevations
+            kind, location = 'shm', self._shm.name
+        else:
+            np.save(npy_path, elevations)
+            kind, location = 'npy', str(npy_path)
+
+        self.handle = SharedTerrainHandle(
+            kind=kind,
+            location=location,
+            shape=elevations.shape,
+            dtype=elevations.dtype.str,
+            stats=dict(terrain.stats),
+            derivatives=terrain.derivatives,
+        )
+
+    def close(self) -> None:
+        """Release the shared memory block. Attached views become invalid."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> 'SharedTerrain':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach(handle: SharedTerrainHandle) -> TerrainFunction:
+    """
+    Wrap a published grid in a TerrainFunction without copying it.
+
+    The elevation array is read-only. In 'analytic' derivative mode each
+    process still builds its own coefficient table from the shared grid.
+    """
+    if handle.kind == 'npy':
+        elevations = np.load(handle.location, mmap_mode='r')
+        owner = None
+    else:
+        # Pool workers share the parent's resource tracker, so attaching
+        # does not hand ownership of the block to the worker
+        owner = shared_memory.SharedMemory(name=handle.location)
+        elevations = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=owner.buf)
+        elevations.flags.writeable = False
+
+    terrain = TerrainFunction.from_array(elevations, handle.stats, derivatives=handle.derivatives)
+    # Keep the mapping alive for as long as the terrain is
+    terrain.shared_buffer = owner
+    return terrain
@@ -0,0 +1,421 @@
+"""
+Streaming MCMC with online convergence diagnostics.
+
+stream_mcmc advances chains exactly like samplers.run_mcmc_vectorized (the
+same seed gives the same draws) but hands them out in fixed-size chunks
+instead of holding the whole (n_chains, n_iterations, 3) array, so memory
+does not grow with chain length. After every chunk a RunningDiagnostics
+is updated with:
+
+    - per-chain acceptance counts
+    - per-chain Welford means and variances of x, y and elevation
+    - split-R-hat, from the block statistics of each chain's two halves
+    - effective sample size, by batch means over the same blocks
+
+and sampling can stop as soon as R-hat and ESS pass given targets.
+
+write_mcmc_stream sends the chunks to .npy files as they are produced.
+The files are iteration-major, (n_iterations, n_chains, 3) and
+(n_iterations, n_chains), so each chunk is one contiguous append, after
+which the header is rewritten in place with the new length; an interrupted
+run leaves files holding every completed chunk. load_mcmc_stream maps them
+back as (n_chains, n_iterations) views.
+
+Usage:
+    python streaming.py out.npy --chains 64 --iterations 1000000 --rhat 1.01 --ess 4000
+"""
+
+import math
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from algorithms import OptimizationConfig, TerrainFunction
+from samplers import initial_positions, metropolis_step
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Blocks kept per chain for split-R-hat and batch-means ESS; when exceeded,
+# neighbouring blocks are merged and the block size doubles
+MAX_BLOCKS = 128
+
+ACCEPTED_SUFFIX = '.accepted.npy'
+
+# Fixed .npy header size, so the shape can be rewritten in place
+NPY_HEADER_BYTES = 128
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+def _merge(n_a: int, mean_a: np.ndarray, m2_a: np.ndarray,
+           n_b: int, mean_b: np.ndarray, m2_b: np.ndarray):
+    """Combine two Welford (count, mean, M2) summaries (Chan et al.)."""
+    n = n_a + n_b
+    if n_a == 0:
+        return n_b, mean_b.copy(), m2_b.copy()
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    m2 = m2_a + m2_b + delta * delta * (n_a * n_b / n)
+    return n, mean, m2
+
+
+def _combine(blocks: list):
+    """Welford summary of a run of (count, mean, M2) blocks."""
+    n, mean, m2 = blocks[0]
+    for block in blocks[1:]:
+        n, mean, m2 = _merge(n, mean, m2, *block)
+    return n, mean, m2
+
+
+class RunningDiagnostics:
+    """
+    Constant-memory convergence statistics for a set of chains.
+
+    Per-chain draws are summarised as Welford (count, mean, M2) both over
+    the whole run and over consecutive blocks. At most MAX_BLOCKS blocks
+    are kept per chain: when the limit is reached, neighbouring blocks are
+    merged and the block size doubles, so batch sizes grow with the run as
+    batch-means estimators require.
+
+    Arrays are (n_chains, n_params); the columns follow the sample layout
+    (x, y, elevation).
+    """
+
+    def __init__(self, n_chains: int, n_params: int = 3, max_blocks: int = MAX_BLOCKS):
+        if max_blocks < 4 or max_blocks % 2:
+            raise ValueError("max_blocks must be an even number >= 4")
+        self.n_chains = n_chains
+        self.n_params = n_params
+        self.max_blocks = max_blocks
+        self.count = 0
+        self.accepted = np.zeros(n_chains, dtype=np.int64)
+        self._mean = np.zeros((n_chains, n_params))
+        self._m2 = np.zeros((n_chains, n_params))
+        self.block_size = None
+        self.blocks = []
+        self._partial = (0, np.zeros((n_chains, n_params)), np.zeros((n_chains, n_params)))
+
+    def update(self, samples: np.ndarray, accepted: np.ndarray) -> None:
+        """
+        Add a chunk of draws.
+
+        Args:
+            samples: (n_chains, n, n_params) draws
+            accepted: (n_chains, n) acceptance flags
+        """
+        n = samples.shape[1]
+        if n == 0:
+            return
+        mean = samples.mean(axis=1)
+        m2 = ((samples - mean[:, np.newaxis, :]) ** 2).sum(axis=1)
+
+        self.count, self._mean, self._m2 = _merge(self.count, self._mean, self._m2, n, mean, m2)
+        self.accepted += accepted.sum(axis=1)
+
+        if self.block_size is None:
+            self.block_size = n
+        self._partial = _merge(*self._partial, n, mean, m2)
+        if self._partial[0] >= self.block_size:
+            self.blocks.append(self._partial)
+            self._partial = (0, np.zeros_like(mean), np.zeros_like(m2))
+            if len(self.blocks) == self.max_blocks:
+                self.blocks = [_merge(*self.blocks[i], *self.blocks[i + 1])
+                               for i in range(0, self.max_blocks, 2)]
+                self.block_size *= 2
+
+    @property
+    def acceptance_rates(self) -> np.ndarray:
+        return self.accepted / self.count if self.count else np.zeros(self.n_chains)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._mean
+
+    @property
+    def variance(self) -> np.ndarray:
+        if self.count < 2:
+            return np.full_like(self._mean, np.nan)
+        return self._m2 / (self.count - 1)
+
+    def _whole_blocks(self) -> list:
+        """Blocks of exactly block_size draws (a short final chunk is not one)."""
+        return [b for b in self.blocks if b[0] == self.block_size]
+
+    def split_rhat(self) -> np.ndarray:
+        """
+        Split-R-hat per parameter (NaN until four whole blocks exist).
+
+        Each chain is split into its first and last half of whole blocks (a
+        middle block of an odd count and the unfinished tail are left out),
+        and the 2 * n_chains halves are compared by the usual
+        between/within variance ratio.
+        """
+        blocks = self._whole_blocks()
+        half = len(blocks) // 2
+        if half < 2:
+            return np.full(self.n_params, np.nan)
+
+        n, mean_1, m2_1 = _combine(blocks[:half])
+        _, mean_2, m2_2 = _combine(blocks[-half:])
+        means = np.concatenate([mean_1, mean_2])
+        within = np.concatenate([m2_1, m2_2]).mean(axis=0) / (n - 1)
+        between_over_n = means.var(axis=0, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(((n - 1) / n * within + between_over_n) / within)
+
+    def ess(self) -> np.ndarray:
+        """
+        Effective sample size per parameter, summed over chains (NaN until
+        four whole blocks exist).
+
+        Batch means: with blocks of b draws, b * Var(block means) estimates
+        the asymptotic variance of the chain average, and ESS is the total
+        draw count times the ratio of the marginal variance to it.
+        """
+        blocks = self._whole_blocks()
+        if len(blocks) < 4:
+            return np.full(self.n_params, np.nan)
+
+        block_means = np.stack([mean for _, mean, _ in blocks], axis=1)
+        batch_variance = self.block_size * block_means.var(axis=1, ddof=1).mean(axis=0)
+        n_draws = len(blocks) * self.block_size
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.n_chains * n_draws * self.variance.mean(axis=0) / batch_variance
+
+    def converged(self, rhat: Optional[float] = None, ess: Optional[float] = None) -> bool:
+        """True when every parameter has split-R-hat < rhat and ESS >= ess."""
+        if rhat is None and ess is None:
+            return False
+        if rhat is not None and not np.all(self.split_rhat() < rhat):
+            return False
+        if ess is not None and not np.all(self.ess() >= ess):
+            return False
+        return True
+
+    def summary(self) -> dict:
+        return {
+            'n_chains': self.n_chains,
+            'n_iterations': self.count,
+            'acceptance_rate': float(self.accepted.sum() / (self.count * self.n_chains))
+            if self.count else 0,
+            'chain_acceptance_rates': self.acceptance_rates,
+            'mean': self.mean.mean(axis=0),
+            'rhat': self.split_rhat(),
+            'ess': self.ess(),
+        }
+
+
+@dataclass
+class MCMCChunk:
+    """
+    One chunk of a streamed run.
+
+    samples[:, i] and accepted[:, i] are iteration start + i. diagnostics
+    is the live RunningDiagnostics, already updated with this chunk.
+    """
+    start: int
+    samples: np.ndarray
+    accepted: np.ndarray
+    diagnostics: RunningDiagnostics
+
+
+def stream_mcmc(
+    n_chains: int,
+    terrain: TerrainFunction,
+    n_iterations: int,
+    config: OptimizationConfig = None,
+    seed: int = None,
+    initial_region: Tuple[float, float, float, float] = (0.1, 0.4, 0.1, 0.4),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    target_rhat: Optional[float] = None,
+    target_ess: Optional[float] = None,
+) -> Iterator[MCMCChunk]:
+    """
+    Run Metropolis-Hastings chains, yielding fixed-size chunks of draws.
+
+    Concatenating the chunks gives exactly run_mcmc_vectorized's output for
+    the same seed. With target_rhat and/or target_ess, the run ends after
+    the first chunk at which diagnostics.converged(target_rhat, target_ess)
+    holds; otherwise after n_iterations.
+
+    Args:
+        n_chains: Number of parallel chains
+        terrain: Objective function
+        n_iterations: Maximum number of iterations per chain
+        config: Algorithm configuration
+        seed: Random seed for reproducibility
+        initial_region: (x_min, x_max, y_min, y_max) for starting positions
+        chunk_size: Iterations per chunk (the last may be shorter)
+        target_rhat: Stop once split-R-hat is below this for x, y and elevation
+        target_ess: Stop once ESS is at least this for x, y and elevation
+
+    Yields:
+        MCMCChunk with (n_chains, chunk, 3) samples and (n_chains, chunk) flags
+    """
+    if config is None:
+        config = OptimizationConfig()
+    if config.mcmc_adapt != 'none':
+        raise ValueError(f"Vectorized samplers use a fixed proposal, got mcmc_adapt="
+                         f"{config.mcmc_adapt!r}; use run_mcmc_chains for adaptive proposals")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    rng = np.random.default_rng(seed)
+    x, y = initial_positions(n_chains, rng, initial_region)
+    elevation = terrain.get_elevation_batch(x, y)
+    diagnostics = RunningDiagnostics(n_chains)
+
+    for start in range(0, n_iterations, chunk_size):
+        size = min(chunk_size, n_iterations - start)
+        samples = np.empty((n_chains, size, 3))
+        accepted = np.zeros((n_chains, size), dtype=bool)
+        for t in range(size):
+            moved = metropolis_step(x, y, elevation, terrain, config, rng)
+            samples[:, t, 0] = x
+            samples[:, t, 1] = y
+            samples[:, t, 2] = elevation
+            accepted[moved, t] = True
+
+        diagnostics.update(samples, accepted)
+        yield MCMCChunk(start, samples, accepted, diagnostics)
+        if diagnostics.converged(target_rhat, target_ess):
+            return
+
+
+class NpyAppender:
+    """
+    Incrementally written .npy file whose first axis grows with each append.
+
+    The header is a fixed NPY_HEADER_BYTES long and is rewritten in place
+    after each append (one seek per block), so the file is always a valid
+    .npy of the rows appended so far.
+    """
+
+    def __init__(self, path: str, row_shape: Tuple[int, ...], dtype):
+        self.path = Path(path)
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._file = open(self.path, 'wb')
+        self._write_header()
+
+    def _write_header(self) -> None:
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self.dtype),
+            'fortran_order': False,
+            'shape': (self.rows,) + self.row_shape,
+        })
+        header_len = NPY_HEADER_BYTES - len(NPY_MAGIC) - 2
+        if len(header) + 1 > header_len:
+            raise ValueError(f"Shape too large for a {NPY_HEADER_BYTES}-byte header")
+        self._file.seek(0)
+        self._file.write(NPY_MAGIC + struct.pack('<H', header_len))
+        self._file.write((header.ljust(header_len - 1) + '\n').encode('latin1'))
+        self._file.flush()
+
+    def append(self, block: np.ndarray) -> None:
+        """Append rows (block.shape == (n,) + row_shape)."""
+        if block.shape[1:] != self.row_shape:
+            raise ValueError(f"Expected rows of shape {self.row_shape}, got {block.shape[1:]}")
+        self._file.seek(0, 2)
+        self._file.write(np.ascontiguousarray(block, dtype=self.dtype).tobytes())
+        # Rows reach the file before the header counts them
+        self._file.flush()
+        self.rows += block.shape[0]
+        self._write_header()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'NpyAppender':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def accepted_path_for(samples_path: str) -> Path:
+    """Acceptance-flag file written alongside a samples .npy."""
+    return Path(samples_path).with_suffix(ACCEPTED_SUFFIX)
+
+
+def write_mcmc_stream(path: str, n_chains: int, terrain: TerrainFunction,
+                      n_iterations: int, **kwargs) -> dict:
+    """
+    Run stream_mcmc, appending every chunk to .npy files.
+
+    Samples go to path, acceptance flags to accepted_path_for(path). Both
+    are valid .npy files holding every completed chunk, even if the run is
+    interrupted.
+
+    Args:
+        path: Samples file
+        n_chains, terrain, n_iterations, **kwargs: As for stream_mcmc
+
+    Returns:
+        The final diagnostics summary, plus 'samples_path', 'accepted_path'
+        and 'stopped_early'
+    """
+    accepted_path = accepted_path_for(path)
+    diagnostics = None
+    with NpyAppender(path, (n_chains, 3), np.float64) as samples_out, \
+            NpyAppender(accepted_path, (n_chains,), np.bool_) as accepted_out:
+        for chunk in stream_mcmc(n_chains, terrain, n_iterations, **kwargs):
+            samples_out.append(chunk.samples.transpose(1, 0, 2))
+            accepted_out.append(chunk.accepted.T)
+            diagnostics = chunk.diagnostics
+
+    summary = diagnostics.summary() if diagnostics is not None else {'n_iterations': 0}
+    summary['samples_path'] = str(path)
+    summary['accepted_path'] = str(accepted_path)
+    summary['stopped_early'] = summary['n_iterations'] < n_iterations
+    return summary
+
+
+def load_mcmc_stream(path: str, mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Samples and acceptance flags written by write_mcmc_stream, as
+    (n_chains, n_iterations, 3) and (n_chains, n_iterations) arrays
+    (transposed views of the memory-mapped files unless mmap is False).
+    """
+    mmap_mode = 'r' if mmap else None
+    samples = np.load(path, mmap_mode=mmap_mode)
+    accepted = np.load(accepted_path_for(path), mmap_mode=mmap_mode)
+    return samples.transpose(1, 0, 2), accepted.T
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from algorithms import load_terrain
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('output', help='Samples .npy file')
+    parser.add_argument('--terrain', default=None, help='Terrain JSON (default: Arthur\'s Seat)')
+    parser.add_argument('--chains', type=int, default=64)
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--rhat', type=float, default=None, help='Stop when split-R-hat is below this')
+    parser.add_argument('--ess', type=float, default=None, help='Stop when ESS reaches this')
+    args = parser.parse_args()
+
+    terrain_path = args.terrain or str(Path(__file__).parent.parent.parent.parent
+                                       / 'docs' / 'data' / 'arthurs_seat_elevation.json')
+    terrain = load_terrain(terrain_path)
+
+    start = time.perf_counter()
+    summary = write_mcmc_stream(args.output, args.chains, terrain, args.iterations,
+                                seed=args.seed, chunk_size=args.chunk_size,
+                                target_rhat=args.rhat, target_ess=args.ess)
+    elapsed = time.perf_counter() - start
+
+    stopped = ' (stopped early)' if summary['stopped_early'] else ''
+    print(f"{summary['n_chains']} chains x {summary['n_iterations']} iterations{stopped} "
+          f"in {elapsed:.2f}s -> {summary['samples_path']}")
+    print(f"  acceptance rate: {summary['acceptance_rate']:.1%}")
+    for name, rhat, ess in zip(('x', 'y', 'elevation'), summary['rhat'], summary['ess']):
+        ess_text = 'n/a' if math.isnan(ess) else f"{ess:.0f}"
+        print(f"  {name:>9}: split-R-hat {rhat:.4f}, ESS {ess_text}")
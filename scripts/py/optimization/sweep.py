@@ -0,0 +1,245 @@
+"""
+Parameter sweeps over OptimizationConfig.
+
+Runs an algorithm for every combination of config values x start points x
+seeds and collects a tidy results table (one dict per run). Runs are
+farmed across a process pool; the terrain grid is published once in
+shared memory and each worker attaches to it through the pool
+initializer, rather than receiving a pickled copy with every task.
+
+Usage:
+    python sweep.py newton nr_damping=0.3,0.5,0.8 nr_max_step=0.04,0.08
+"""
+
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from algorithms import OptimizationConfig, TerrainFunction, run_optimization
+from shared_terrain import SharedTerrain, SharedTerrainHandle, attach
+
+CONFIG_FIELDS = {f.name for f in fields(OptimizationConfig)}
+
+# Terrain and base config of the current worker process (set by _init_worker)
+_worker_terrain = None
+_worker_config = None
+
+
+def config_grid(**values: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Cartesian product of config values, e.g. config_grid(nr_damping=[0.3, 0.5])."""
+    _check_fields(values)
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values.values())]
+
+
+def config_random(n: int, seed: int = None,
+                  **ranges: Tuple[float, float]) -> List[Dict[str, Any]]:
+    """
+    n configs with each named value drawn uniformly from its (low, high) range.
+
+    Float fields are drawn from [low, high), int fields from the integers
+    low..high inclusive; bool and str fields cannot be sampled this way.
+    """
+    _check_fields(ranges)
+    types = {f.name: f.type for f in fields(OptimizationConfig)}
+    unsupported = sorted(name for name in ranges if types[name] not in (int, float))
+    if unsupported:
+        raise ValueError(f"config_random only samples int and float fields, got {unsupported}; "
+                         f"use config_grid for these")
+    rng = np.random.default_rng(seed)
+
+    def draw(name, low, high):
+        if types[name] is int:
+            return int(rng.integers(low, high + 1))
+        return float(rng.uniform(low, high))
+
+    return [{name: draw(name, low, high) for name, (low, high) in ranges.items()}
+            for _ in range(n)]
+
+
+def _check_fields(values: Dict[str, Any]) -> None:
+    unknown = set(values) - CONFIG_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown OptimizationConfig fields: {sorted(unknown)}")
+
+
+def _parse_value(field_type, raw: str) -> Any:
+    if field_type is bool:
+        lowered = raw.strip().lower()
+        if lowered not in ('true', 'false', '1', '0'):
+            raise ValueError(f"Expected true/false, got {raw!r}")
+        return lowered in ('true', '1')
+    return field_type(raw)
+
+
+def parse_cli_values(args: Sequence[str]) -> Dict[str, List[Any]]:
+    """
+    Parse name=v1,v2,... arguments into config_grid values.
+
+    Each value is converted with the declared type of its OptimizationConfig
+    field (int, float, bool or str), so integer fields stay integers.
+    """
+    types = {f.name: f.type for f in fields(OptimizationConfig)}
+    values = {}
+    for arg in args:
+        name, sep, raw = arg.partition('=')
+        if not sep:
+            raise ValueError(f"Expected name=v1,v2,..., got {arg!r}")
+        _check_fields({name: None})
+        values[name] = [_parse_value(types[name], v) for v in raw.split(',')]
+    return values
+
+
+def _init_worker(terrain, base_config: OptimizationConfig) -> None:
+    global _worker_terrain, _worker_config
+    if isinstance(terrain, SharedTerrainHandle):
+        terrain = attach(terrain)
+    _worker_terrain = terrain
+    _worker_config = base_config
+
+
+def _run_task(task: Tuple[str, Dict[str, Any], float, float, int, int]) -> Dict[str, Any]:
+    return _run_single(task, _worker_terrain, _worker_config)
+
+
+def _run_single(task: Tuple[str, Dict[str, Any], float, float, int, int], terrain,
+                base_config: OptimizationConfig) -> Dict[str, Any]:
+    algorithm, overrides, x0, y0, seed, max_iterations = task
+    config = replace(base_config, **overrides)
+
+    start = time.perf_counter()
+    trajectory = run_optimization(algorithm, terrain, x0, y0,
+                                  max_iterations=max_iterations, config=config, seed=seed)
+    wall_time = time.perf_counter() - start
+
+    final = trajectory[-1]
+    return {
+        'algorithm': algorithm,
+        **overrides,
+        'x0': x0,
+        'y0': y0,
+        'seed': seed,
+        'iterations': final.iteration,
+        'converged': final.converged,
+        'convergence_reason': final.convergence_reason,
+        'final_x': final.x,
+        'final_y': final.y,
+        'final_elevation': final.elevation,
+        'best_elevation': final.best_elevation,
+        'wall_time': wall_time,
+    }
+
+
+def run_sweep(
+    algorithm: str,
+    terrain: TerrainFunction,
+    configs: Sequence[Dict[str, Any]],
+    starts: Sequence[Tuple[float, float]],
+    seeds: Sequence[int] = (None,),
+    max_iterations: int = 1000,
+    base_config: OptimizationConfig = None,
+    processes: int = None
+) -> List[Dict[str, Any]]:
+    """
+    Run algorithm for every (config, start, seed) combination.
+
+    Args:
+        algorithm: Algorithm name accepted by run_optimization
+        terrain: Terrain objective function
+        configs: Dicts of OptimizationConfig overrides (see config_grid)
+        starts: (x0, y0) start points
+        seeds: Random seeds; each combination is run once per seed
+        max_iterations: Per-run iteration limit
+        base_config: Config the overrides are applied to
+        processes: Worker processes (default os.cpu_count()); 1 runs in-process
+
+    Returns:
+        List of result rows, in task order
+    """
+    if base_config is None:
+        base_config = OptimizationConfig()
+    for overrides in configs:
+        _check_fields(overrides)
+
+    tasks = [
+        (algorithm, dict(overrides), float(x0), float(y0), seed, max_iterations)
+        for overrides in configs
+        for x0, y0 in starts
+        for seed in seeds
+    ]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1:
+        # In-process: pass the terrain directly rather than setting the worker globals
+        return [_run_single(task, terrain, base_config) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (4 * processes))
+    with SharedTerrain(terrain) as shared:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(shared.handle, base_config)) as pool:
+            return list(pool.map(_run_task, tasks, chunksize=chunksize))
+
+
+def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
+    """Write sweep results to CSV."""
+    if not rows:
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def summarize(rows: List[Dict[str, Any]], by: Sequence[str]) -> List[Dict[str, Any]]:
+    """Aggregate result rows grouped by the named config fields."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[name] for name in by), []).append(row)
+
+    summary = []
+    for key, group in groups.items():
+        converged = [r['iterations'] for r in group if r['converged']]
+        summary.append({
+            **dict(zip(by, key)),
+            'runs': len(group),
+            'converged_fraction': len(converged) / len(group),
+            'mean_iterations': float(np.mean(converged)) if converged else float('nan'),
+            'mean_final_elevation': float(np.mean([r['final_elevation'] for r in group])),
+            'total_wall_time': float(sum(r['wall_time'] for r in group)),
+        })
+    return summary
+
+
+if __name__ == '__main__':
+    import sys
+    from pathlib import Path
+    from algorithms import load_terrain
+
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    algorithm = sys.argv[1]
+    values = parse_cli_values(sys.argv[2:])
+
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    terrain = load_terrain(str(terrain_path))
+
+    starts = [(x, y) for x in np.linspace(0.1, 0.9, 5) for y in np.linspace(0.1, 0.9, 5)]
+    start = time.perf_counter()
+    rows = run_sweep(algorithm, terrain, config_grid(**values), starts, seeds=[42])
+    print(f"{len(rows)} runs in {time.perf_counter() - start:.2f}s")
+
+    for row in summarize(rows, by=list(values)):
+        params = ', '.join(f"{name}={row[name]}" for name in values)
+        print(f"  {params}: converged={row['converged_fraction']:.0%}, "
+              f"mean iters={row['mean_iterations']:.1f}, "
+              f"mean elev={row['mean_final_elevation']:.1f}m")
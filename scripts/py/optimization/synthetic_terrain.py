@@ -7,30 +7,85 @@ import numpy as np
 from algorithms import TerrainFunction
 
 
+# Gaussian components of the synthetic Arthur's Seat (see create_arthurs_seat_synthetic)
+ARTHURS_SEAT_BUMPS = [
+    # Arthur's Seat summit
+    {'cx': 0.20, 'cy': 0.62, 'height': 128, 'sx': 0.06, 'sy': 0.07, 'rot': 0.3},
+    # Arthur's Seat shoulder (NE of summit)
+    {'cx': 0.25, 'cy': 0.67, 'height': 50, 'sx': 0.07, 'sy': 0.05, 'rot': 0.5},
+    # Salisbury Crags ridge
+    {'cx': 0.32, 'cy': 0.48, 'height': 80, 'sx': 0.05, 'sy': 0.18, 'rot': 0.2},
+    # Broad park base (Holyrood Park general elevation)
+    {'cx': 0.25, 'cy': 0.50, 'height': 30, 'sx': 0.20, 'sy': 0.25, 'rot': 0.0},
+    # Western slopes
+    {'cx': 0.08, 'cy': 0.55, 'height': 15, 'sx': 0.10, 'sy': 0.20, 'rot': 0.0},
+]
+
+
+def gaussian_bumps(bumps, x, y, base_height=0.0):
+    """
+    Evaluate base_height plus a sum of rotated Gaussian bumps on a grid.
+
+    Each bump is a dict with centre 'cx', 'cy', 'height', widths 'sx', 'sy'
+    and rotation 'rot' (radians). The rotated exponent is expanded into the
+    quadratic form -(a*dx^2 + b*dx*dy + c*dy^2), so each bump is one
+    broadcast over the grid; unrotated bumps separate into an outer product
+    of two 1D Gaussians and need no grid-sized exp at all.
+
+    Args:
+        bumps: List of bump dicts
+        x: 1D array of column coordinates
+        y: 1D array of row coordinates
+
+    Returns:
+        (len(y), len(x)) array, row index = y, column index = x
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    z = np.full((y.size, x.size), float(base_height))
+    for b in bumps:
+        cos_r = np.cos(b['rot'])
+        sin_r = np.sin(b['rot'])
+        inv_x = 1 / (2 * b['sx']**2)
+        inv_y = 1 / (2 * b['sy']**2)
+        a = cos_r**2 * inv_x + sin_r**2 * inv_y
+        c = sin_r**2 * inv_x + cos_r**2 * inv_y
+        cross = 2 * cos_r * sin_r * (inv_x - inv_y)
+
+        dx = x - b['cx']
+        dy = y - b['cy']
+        if cross == 0:
+            z += np.outer(b['height'] * np.exp(-c * dy**2), np.exp(-a * dx**2))
+        else:
+            term = -(a * dx**2)[np.newaxis, :] - (cross * dy)[:, np.newaxis] * dx[np.newaxis, :]
+            term -= (c * dy**2)[:, np.newaxis]
+            np.exp(term, out=term)
+            term *= b['height']
+            z += term
+    return z
+
+
+def gaussian_bumps_grid(bumps, base_height=0.0, grid_size=100):
+    """gaussian_bumps on the square grid of normalized coordinates used by TerrainFunction."""
+    coords = np.arange(grid_size) / (grid_size - 1)
+    return gaussian_bumps(bumps, coords, coords, base_height)
+
+
+def create_bump_terrain(bumps, base_height=0.0, grid_size=100, stats=None):
+    """Terrain from an arbitrary list of Gaussian bumps (see gaussian_bumps_grid)."""
+    elevations = gaussian_bumps_grid(bumps, base_height, grid_size)
+    return TerrainFunction.from_array(elevations, stats)
+
+
 def create_unimodal_terrain(peak_x=0.5, peak_y=0.5, peak_height=250,
                             base_height=50, sigma_x=0.2, sigma_y=0.2,
                             rotation=0, grid_size=100):
     """Generate a single Gaussian bump terrain."""
-    cos_r = np.cos(rotation)
-    sin_r = np.sin(rotation)
-
-    elevations = np.zeros((grid_size, grid_size))
-    for row in range(grid_size):
-        y = row / (grid_size - 1)
-        for col in range(grid_size):
-            x = col / (grid_size - 1)
-            dx = x - peak_x
-            dy = y - peak_y
-            dx_rot = dx * cos_r + dy * sin_r
-            dy_rot = -dx * sin_r + dy * cos_r
-            exponent = -(dx_rot**2) / (2 * sigma_x**2) - (dy_rot**2) / (2 * sigma_y**2)
-            elevations[row, col] = base_height + (peak_height - base_height) * np.exp(exponent)
-
-    return TerrainFunction({
-        'elevations': elevations.tolist(),
-        'grid': {'rows': grid_size, 'cols': grid_size},
-        'stats': {'min': base_height, 'max': peak_height}
-    })
+    bump = {'cx': peak_x, 'cy': peak_y, 'height': peak_height - base_height,
+            'sx': sigma_x, 'sy': sigma_y, 'rot': rotation}
+    return create_bump_terrain([bump], base_height, grid_size,
+                               stats={'min': base_height, 'max': peak_height})
 
 
 def create_rotated_terrain(rotation=np.pi/4):
@@ -55,47 +110,11 @@ def create_arthurs_seat_synthetic(grid_size=100):
     Returns a C-infinity smooth surface suitable for testing
     optimization algorithms with well-defined gradients and Hessians.
     """
-    elevations = np.zeros((grid_size, grid_size))
-
-    # Define Gaussian components
-    bumps = [
-        # Arthur's Seat summit
-        {'cx': 0.20, 'cy': 0.62, 'height': 128, 'sx': 0.06, 'sy': 0.07, 'rot': 0.3},
-        # Arthur's Seat shoulder (NE of summit)
-        {'cx': 0.25, 'cy': 0.67, 'height': 50, 'sx': 0.07, 'sy': 0.05, 'rot': 0.5},
-        # Salisbury Crags ridge
-        {'cx': 0.32, 'cy': 0.48, 'height': 80, 'sx': 0.05, 'sy': 0.18, 'rot': 0.2},
-        # Broad park base (Holyrood Park general elevation)
-        {'cx': 0.25, 'cy': 0.50, 'height': 30, 'sx': 0.20, 'sy': 0.25, 'rot': 0.0},
-        # Western slopes
-        {'cx': 0.08, 'cy': 0.55, 'height': 15, 'sx': 0.10, 'sy': 0.20, 'rot': 0.0},
-    ]
-
     base_height = 30.0
-
-    for row in range(grid_size):
-        y = row / (grid_size - 1)
-        for col in range(grid_size):
-            x = col / (grid_size - 1)
-            z = base_height
-            for b in bumps:
-                dx = x - b['cx']
-                dy = y - b['cy']
-                cos_r = np.cos(b['rot'])
-                sin_r = np.sin(b['rot'])
-                dx_rot = dx * cos_r + dy * sin_r
-                dy_rot = -dx * sin_r + dy * cos_r
-                exponent = -(dx_rot**2) / (2 * b['sx']**2) - (dy_rot**2) / (2 * b['sy']**2)
-                z += b['height'] * np.exp(exponent)
-            elevations[row, col] = z
-
+    elevations = gaussian_bumps_grid(ARTHURS_SEAT_BUMPS, base_height, grid_size)
     actual_max = float(elevations.max())
 
-    return TerrainFunction({
-        'elevations': elevations.tolist(),
-        'grid': {'rows': grid_size, 'cols': grid_size},
-        'stats': {'min': base_height, 'max': actual_max}
-    })
+    return TerrainFunction.from_array(elevations, {'min': base_height, 'max': actual_max})
 
 
 if __name__ == '__main__':
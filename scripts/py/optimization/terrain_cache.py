@@ -0,0 +1,149 @@
+"""
+Binary cache for terrain JSON files.
+
+Parsing a terrain JSON (list-of-lists of elevations) dominates startup for
+large grids. The first load writes a sidecar cache next to the JSON,
+
+    docs/data/arthurs_seat_elevation.json
+    docs/data/arthurs_seat_elevation.terraincache
+
+holding the raw elevation grid plus the JSON's other keys. Later loads
+memory-map the grid straight from the cache.
+
+File layout: MAGIC, a little-endian uint32 header length, a UTF-8 JSON
+header, zero padding to a 64-byte boundary, then the grid in C order. The
+header records the SHA-256 and size of the source JSON. A cache newer than
+its JSON is trusted; an older one is reused only if the JSON content hash
+still matches, otherwise it is rebuilt. Elevations keep their JSON dtype
+(float64), so cached terrains are bit-identical to parsed ones.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MAGIC = b'TERRAIN1'
+CACHE_SUFFIX = '.terraincache'
+ALIGNMENT = 64
+
+
+def cache_path_for(json_path: str) -> Path:
+    """Sidecar cache path for a terrain JSON file."""
+    return Path(json_path).with_suffix(CACHE_SUFFIX)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_cache(cache_path: str, data: Dict[str, Any], source_sha256: str,
+                source_size: int) -> None:
+    """Write terrain data (JSON format dict) to a binary cache file atomically."""
+    elevations = np.ascontiguousarray(data['elevations'])
+    header = json.dumps({
+        'source_sha256': source_sha256,
+        'source_size': source_size,
+        'shape': list(elevations.shape),
+        'dtype': elevations.dtype.str,
+        'metadata': {key: value for key, value in data.items() if key != 'elevations'},
+    }).encode('utf-8')
+
+    prefix = len(MAGIC) + 4 + len(header)
+    padding = b'\0' * (-prefix % ALIGNMENT)
+
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_name(cache_path.name + f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(padding)
+        f.write(elevations.tobytes())
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache_header(cache_path: str) -> Optional[Dict[str, Any]]:
+    """Header dict of a cache file (plus 'data_offset'), or None if not a valid cache."""
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_len,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_len).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    prefix = len(MAGIC) + 4 + header_len
+    header['data_offset'] = prefix + (-prefix % ALIGNMENT)
+    return header
+
+
+def read_cache(cache_path: str, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Load terrain data from a cache file.
+
+    Returns a dict in the JSON format, with 'elevations' as a read-only
+    memory-mapped array (or an in-memory copy if mmap is False).
+    """
+    header = read_cache_header(cache_path)
+    if header is None:
+        raise ValueError(f"Not a terrain cache file: {cache_path}")
+
+    shape = tuple(header['shape'])
+    dtype = np.dtype(header['dtype'])
+    if mmap:
+        elevations = np.memmap(cache_path, dtype=dtype, mode='r',
+                               offset=header['data_offset'], shape=shape)
+    else:
+        with open(cache_path, 'rb') as f:
+            f.seek(header['data_offset'])
+            elevations = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+    return {**header['metadata'], 'elevations': elevations}
+
+
+def load_terrain_data(json_path: str, use_cache: bool = True, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Load terrain JSON, going through the binary cache when possible.
+
+    If the cache cannot be written (e.g. read-only directory) the parsed
+    JSON is returned as usual.
+    """
+    json_path = Path(json_path)
+    if not use_cache:
+        with open(json_path, 'r') as f:
+            return json.load(f)
+
+    cache_path = cache_path_for(json_path)
+    source_stat = json_path.stat()
+    header = read_cache_header(cache_path)
+
+    if header is not None and header['source_size'] == source_stat.st_size:
+        if cache_path.stat().st_mtime >= source_stat.st_mtime:
+            return read_cache(cache_path, mmap)
+        # JSON touched since the cache was written: reuse if content is unchanged
+        source_sha256 = _sha256(json_path)
+        if header['source_sha256'] == source_sha256:
+            os.utime(cache_path)
+            return read_cache(cache_path, mmap)
+    else:
+        source_sha256 = _sha256(json_path)
+
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    data['elevations'] = np.array(data['elevations'])
+
+    try:
+        write_cache(cache_path, data, source_sha256, source_stat.st_size)
+    except OSError:
+        pass
+    return data
@@ -0,0 +1,282 @@
+"""
+Procedural terrain families for scalability benchmarks.
+
+Each family is a seeded random landscape that can be rendered at any grid
+size. The random components (bump centres, ridge endpoints, noise lattices)
+depend only on the family parameters and the seed, never on the grid size,
+so the same landscape can be sampled from 50x50 up to 8192x8192 to measure
+how cost scales with resolution, and families with more components to
+measure how it scales with multimodality.
+
+Families:
+    bumps     N random rotated Gaussian bumps
+    ridges    Gaussian ridges along random line segments
+    plateaus  Flat-topped mesas with smooth (logistic) edges
+    fractal   Multi-octave value noise
+
+Grids are rendered in row blocks straight into a memory-mapped .npy in the
+cache directory (TERRAIN_FAMILY_CACHE, default .terrain_families/ next to
+this file), with a JSON sidecar holding stats and the generated components.
+
+Usage:
+    python terrain_families.py fractal 2048 --seed 1
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from algorithms import TerrainFunction
+from synthetic_terrain import gaussian_bumps
+
+FAMILIES = ('bumps', 'ridges', 'plateaus', 'fractal')
+
+# Grid sizes used by the benchmark suite, smallest to largest
+BENCHMARK_SIZES = (50, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+DEFAULT_PARAMS = {
+    'bumps': {'n_bumps': 12, 'base_height': 30.0, 'min_height': 20.0, 'max_height': 200.0,
+              'min_sigma': 0.02, 'max_sigma': 0.12},
+    'ridges': {'n_ridges': 5, 'base_height': 30.0, 'min_height': 40.0, 'max_height': 180.0,
+               'min_width': 0.01, 'max_width': 0.05},
+    'plateaus': {'n_plateaus': 6, 'base_height': 30.0, 'min_height': 30.0, 'max_height': 150.0,
+                 'min_radius': 0.04, 'max_radius': 0.15, 'edge_softness': 0.01},
+    'fractal': {'octaves': 8, 'persistence': 0.5, 'base_frequency': 4,
+                'base_height': 30.0, 'relief': 200.0},
+}
+
+# Bump this when generation changes so stale cache entries are not reused
+GENERATOR_VERSION = 1
+
+# Target number of grid cells rendered per block
+BLOCK_CELLS = 1 << 22
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get('TERRAIN_FAMILY_CACHE', Path(__file__).parent / '.terrain_families'))
+
+
+def family_components(family: str, seed: int = 0, **params) -> Dict[str, Any]:
+    """
+    Draw the random components of a family, independent of grid size.
+
+    Returns:
+        Dict of the resolved parameters plus the component list(s)
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"family must be one of {FAMILIES}, got {family!r}")
+    unknown = set(params) - set(DEFAULT_PARAMS[family])
+    if unknown:
+        raise ValueError(f"Unknown parameters for {family!r}: {sorted(unknown)}")
+
+    p = {**DEFAULT_PARAMS[family], **params}
+    rng = np.random.default_rng(seed)
+
+    if family == 'bumps':
+        n = p['n_bumps']
+        p['components'] = [
+            {'cx': cx, 'cy': cy, 'height': h, 'sx': sx, 'sy': sy, 'rot': rot}
+            for cx, cy, h, sx, sy, rot in zip(
+                rng.uniform(0.05, 0.95, n).tolist(), rng.uniform(0.05, 0.95, n).tolist(),
+                rng.uniform(p['min_height'], p['max_height'], n).tolist(),
+                rng.uniform(p['min_sigma'], p['max_sigma'], n).tolist(),
+                rng.uniform(p['min_sigma'], p['max_sigma'], n).tolist(),
+                rng.uniform(0, np.pi, n).tolist())
+        ]
+    elif family == 'ridges':
+        n = p['n_ridges']
+        p['components'] = [
+            {'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1, 'height': h, 'width': w}
+            for x0, y0, x1, y1, h, w in zip(
+                *rng.uniform(0.05, 0.95, (4, n)).tolist(),
+                rng.uniform(p['min_height'], p['max_height'], n).tolist(),
+                rng.uniform(p['min_width'], p['max_width'], n).tolist())
+        ]
+    elif family == 'plateaus':
+        n = p['n_plateaus']
+        p['components'] = [
+            {'cx': cx, 'cy': cy, 'height': h, 'radius': r}
+            for cx, cy, h, r in zip(
+                *rng.uniform(0.1, 0.9, (2, n)).tolist(),
+                rng.uniform(p['min_height'], p['max_height'], n).tolist(),
+                rng.uniform(p['min_radius'], p['max_radius'], n).tolist())
+        ]
+    else:
+        # One lattice of uniform values per octave, each with its own stream
+        p['components'] = [
+            {'frequency': p['base_frequency'] * 2**k,
+             'amplitude': p['persistence']**k,
+             'seed': [seed, k]}
+            for k in range(p['octaves'])
+        ]
+    return p
+
+
+def _smoothstep(t: np.ndarray) -> np.ndarray:
+    return t * t * (3 - 2 * t)
+
+
+def _value_noise_axis(coords: np.ndarray, frequency: int):
+    """Lattice indices and smoothed weights for one axis of value noise."""
+    g = coords * frequency
+    i0 = np.clip(np.floor(g).astype(np.intp), 0, frequency - 1)
+    return i0, i0 + 1, _smoothstep(g - i0)
+
+
+def _render_block(p: Dict[str, Any], family: str, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Elevations for rows y x columns x of a family with resolved parameters p."""
+    if family == 'bumps':
+        return gaussian_bumps(p['components'], x, y, p['base_height'])
+
+    px = x[np.newaxis, :]
+    py = y[:, np.newaxis]
+    z = np.full((y.size, x.size), float(p['base_height']))
+
+    if family == 'ridges':
+        for r in p['components']:
+            sx, sy = r['x1'] - r['x0'], r['y1'] - r['y0']
+            length2 = sx * sx + sy * sy
+            t = np.clip(((px - r['x0']) * sx + (py - r['y0']) * sy) / length2, 0.0, 1.0)
+            d2 = (px - r['x0'] - t * sx) ** 2 + (py - r['y0'] - t * sy) ** 2
+            z += r['height'] * np.exp(-d2 / (2 * r['width'] ** 2))
+
+    elif family == 'plateaus':
+        softness = p['edge_softness']
+        for m in p['components']:
+            dist = np.sqrt((px - m['cx']) ** 2 + (py - m['cy']) ** 2)
+            # Logistic edge written via tanh to avoid exp overflow
+            z += m['height'] * 0.5 * (1 - np.tanh((dist - m['radius']) / (2 * softness)))
+
+    else:
+        noise = np.zeros_like(z)
+        total_amplitude = 0.0
+        for octave, lattice in zip(p['components'], p['lattices']):
+            freq = octave['frequency']
+            ix0, ix1, tx = _value_noise_axis(x, freq)
+            iy0, iy1, ty = _value_noise_axis(y, freq)
+            # Interpolate along y on lattice rows, then along x
+            rows = (1 - ty)[:, np.newaxis] * lattice[iy0] + ty[:, np.newaxis] * lattice[iy1]
+            noise += octave['amplitude'] * ((1 - tx) * rows[:, ix0] + tx * rows[:, ix1])
+            total_amplitude += octave['amplitude']
+        z += p['relief'] * 0.5 * (noise / total_amplitude + 1)
+
+    return z
+
+
+def render_family(family: str, grid_size: int, seed: int = 0, out: np.ndarray = None,
+                  **params) -> np.ndarray:
+    """
+    Render a family at grid_size x grid_size, block by block.
+
+    Args:
+        out: Optional preallocated (grid_size, grid_size) array, e.g. a memmap
+
+    Returns:
+        The elevation array (out, if given)
+    """
+    p = family_components(family, seed, **params)
+    if family == 'fractal':
+        p['lattices'] = [
+            np.random.default_rng(octave['seed']).uniform(
+                -1, 1, (octave['frequency'] + 1, octave['frequency'] + 1))
+            for octave in p['components']
+        ]
+    if out is None:
+        out = np.empty((grid_size, grid_size))
+
+    coords = np.arange(grid_size) / (grid_size - 1)
+    block_rows = max(1, BLOCK_CELLS // grid_size)
+    for start in range(0, grid_size, block_rows):
+        stop = min(start + block_rows, grid_size)
+        out[start:stop] = _render_block(p, family, coords, coords[start:stop])
+    return out
+
+
+def _cache_key(family: str, grid_size: int, seed: int, params: Dict[str, Any]) -> str:
+    spec = json.dumps({'family': family, 'grid_size': grid_size, 'seed': seed,
+                       'params': params, 'version': GENERATOR_VERSION}, sort_keys=True)
+    return f"{family}-{grid_size}-{hashlib.sha1(spec.encode()).hexdigest()[:12]}"
+
+
+def family_terrain(family: str, grid_size: int = 256, seed: int = 0, cache: bool = True,
+                   cache_dir: str = None, derivatives: str = 'finite',
+                   **params) -> TerrainFunction:
+    """
+    A TerrainFunction for a procedural family, cached on disk.
+
+    The first request renders the grid into <cache_dir>/<key>.npy and writes
+    <key>.json (stats and components); later requests memory-map the .npy.
+    With cache=False the grid is rendered in memory.
+
+    The returned terrain's stats dict also carries 'family', 'seed' and
+    'components', so the generating features are available as ground truth.
+    """
+    if not cache:
+        p = family_components(family, seed, **params)
+        elevations = render_family(family, grid_size, seed, **params)
+        return TerrainFunction.from_array(elevations, _stats(elevations, family, seed, p),
+                                          derivatives=derivatives)
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    key = _cache_key(family, grid_size, seed, params)
+    npy_path = cache_dir / f"{key}.npy"
+    meta_path = cache_dir / f"{key}.json"
+
+    if not (npy_path.exists() and meta_path.exists()):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_dir / f"{key}.{os.getpid()}.tmp.npy"
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float64,
+                                        shape=(grid_size, grid_size))
+        render_family(family, grid_size, seed, out=out, **params)
+        out.flush()
+        stats = _stats(out, family, seed, family_components(family, seed, **params))
+        del out
+        os.replace(tmp_path, npy_path)
+        with open(meta_path, 'w') as f:
+            json.dump(stats, f)
+
+    with open(meta_path) as f:
+        stats = json.load(f)
+    elevations = np.load(npy_path, mmap_mode='r')
+    return TerrainFunction.from_array(elevations, stats, derivatives=derivatives)
+
+
+def _stats(elevations: np.ndarray, family: str, seed: int, p: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'min': float(elevations.min()),
+        'max': float(elevations.max()),
+        'mean': float(elevations.mean()),
+        'family': family,
+        'seed': seed,
+        'components': p['components'],
+    }
+
+
+def benchmark_terrains(families: List[str] = FAMILIES, sizes=BENCHMARK_SIZES,
+                       seed: int = 0, **kwargs):
+    """Yield (family, grid_size, terrain) for every family at every size."""
+    for family in families:
+        for grid_size in sizes:
+            yield family, grid_size, family_terrain(family, grid_size, seed, **kwargs)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('family', choices=FAMILIES)
+    parser.add_argument('grid_size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    terrain = family_terrain(args.family, args.grid_size, args.seed, cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+    print(f"{args.family} {terrain.rows}x{terrain.cols} (seed {args.seed}) in {elapsed:.2f}s: "
+          f"elevation {terrain.stats['min']:.1f}-{terrain.stats['max']:.1f}m, "
+          f"{len(terrain.stats['components'])} components")
@@ -17,7 +17,9 @@ from algorithms import (
     step_gradient_ascent,
     run_optimization,
 )
+from diagnostics import ess, mcse_mean, rhat
 from synthetic_terrain import (
+    ARTHURS_SEAT_BUMPS,
     create_rotated_terrain,
     create_unimodal_terrain,
     create_arthurs_seat_synthetic,
@@ -188,7 +190,8 @@ def test_mcmc_detailed_balance():
     proportional to the target density (elevation).
 
     On a symmetric unimodal peak, the time-averaged position
-    should be near the peak center.
+    should be near the peak center, within Monte Carlo error, and the
+    chain should mix (both halves agree, enough effective samples).
     """
     terrain = create_unimodal_terrain()
     config = OptimizationConfig()
@@ -219,6 +222,15 @@ def test_mcmc_detailed_balance():
     # Mean should be near the peak (within reasonable MCMC noise)
     assert abs(mean_x - 0.5) < 0.1, f"Mean x={mean_x:.4f} too far from peak"
     assert abs(mean_y - 0.5) < 0.1, f"Mean y={mean_y:.4f} too far from peak"
+
+    for name, positions, mean in (('x', positions_x, mean_x), ('y', positions_y, mean_y)):
+        n_eff = ess(positions)
+        mcse = mcse_mean(positions)
+        split_rhat = rhat(positions)
+        print(f"  {name}: ESS {n_eff:.0f} of {n_steps}, MCSE {mcse:.4f}, split-R-hat {split_rhat:.3f}")
+        assert n_eff > 25, f"Chain barely mixes in {name} (ESS {n_eff:.0f})"
+        assert split_rhat < 1.1, f"Halves of the chain disagree in {name} (R-hat {split_rhat:.3f})"
+        assert abs(mean - 0.5) < 4 * mcse, f"Mean {name} off by more than 4 MCSE"
     print("  PASS: MCMC chain centers on peak (consistent with detailed balance)")
 
 
@@ -321,6 +333,30 @@ def test_synthetic_terrain_smooth():
     print("  PASS: Synthetic terrain is smooth")
 
 
+def test_vectorized_bumps_match_pointwise():
+    """Broadcast bump evaluation should match the direct per-point formula."""
+    grid_size = 80
+    terrain = create_arthurs_seat_synthetic(grid_size)
+
+    max_err = 0.0
+    for row in range(0, grid_size, 7):
+        y = row / (grid_size - 1)
+        for col in range(0, grid_size, 7):
+            x = col / (grid_size - 1)
+            z = 30.0
+            for b in ARTHURS_SEAT_BUMPS:
+                dx, dy = x - b['cx'], y - b['cy']
+                dx_rot = dx * math.cos(b['rot']) + dy * math.sin(b['rot'])
+                dy_rot = -dx * math.sin(b['rot']) + dy * math.cos(b['rot'])
+                z += b['height'] * math.exp(-dx_rot**2 / (2 * b['sx']**2)
+                                            - dy_rot**2 / (2 * b['sy']**2))
+            max_err = max(max_err, abs(terrain.elevations[row, col] - z))
+
+    print(f"  Max deviation from pointwise formula: {max_err:.2e}m")
+    assert max_err < 1e-9
+    print("  PASS: Vectorized synthetic terrain matches pointwise evaluation")
+
+
 def test_algorithms_converge_on_synthetic():
     """All algorithms should converge to the peak on a simple unimodal terrain."""
     terrain = create_unimodal_terrain()
@@ -350,6 +386,7 @@ if __name__ == '__main__':
     print("\n--- Synthetic terrain validity ---")
     test_synthetic_arthurs_seat_properties()
     test_synthetic_terrain_smooth()
+    test_vectorized_bumps_match_pointwise()
     test_algorithms_converge_on_synthetic()
 
     print("\n--- Fix 1.3: Newton full Hessian ---")
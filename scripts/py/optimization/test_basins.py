@@ -0,0 +1,98 @@
+"""
+Tests for the basin-of-attraction index in basins.py.
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from basins import BasinIndex, basin_index
+from population import grid_starts, run_population
+from terrain_families import family_terrain
+
+
+def test_basin_index_matches_climbs_and_persists():
+    """Every peak should be a local maximum, gradient ascent should mostly end
+    in the basin it started in, and the stored index should be reused only
+    while the grid is unchanged."""
+    terrain = family_terrain('bumps', 128, seed=1, cache=False)
+    index = BasinIndex.from_elevations(terrain.elevations)
+
+    elev = terrain.elevations
+    assert np.all(np.diff(index.peak_elevation) <= 0), "Peaks should be ordered highest first"
+    assert index.peak_elevation[0] == elev.max()
+    assert index.basin_size.sum() == elev.size
+    for r, c in zip(index.peak_rows, index.peak_cols):
+        window = elev[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2]
+        assert elev[r, c] == window.max()
+
+    xx, yy = grid_starts(30)
+    pop = run_population('gradient', terrain, xx, yy, max_iterations=1000)
+    agree = np.mean(index.peak_at_batch(xx.ravel(), yy.ravel()) == index.peak_at_batch(pop.x, pop.y))
+    print(f"  {index.n_peaks} peaks; gradient ascent stays in its start basin for {agree:.0%}")
+    assert index.n_peaks > 1
+    assert agree > 0.9
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'terrain.basins.npz'
+        first = basin_index(terrain, path)
+        stored = basin_index(terrain, path)
+        assert np.array_equal(first.labels, stored.labels) and stored.fingerprint == first.fingerprint
+
+        flipped = family_terrain('bumps', 128, seed=1, cache=False)
+        flipped.elevations[:] = flipped.elevations[::-1].copy()
+        rebuilt = basin_index(flipped, path)
+        assert rebuilt.fingerprint != first.fingerprint
+        assert BasinIndex.load(path).fingerprint == rebuilt.fingerprint
+
+    print("  PASS: Basin index agrees with climbs and is rebuilt when the grid changes")
+
+
+def _segment_distance(x, y, r):
+    sx, sy = r['x1'] - r['x0'], r['y1'] - r['y0']
+    t = np.clip(((x - r['x0']) * sx + (y - r['y0']) * sy) / (sx * sx + sy * sy), 0.0, 1.0)
+    return np.hypot(x - r['x0'] - t * sx, y - r['y0'] - t * sy)
+
+
+def test_flat_regions_and_crests_give_one_peak_per_feature():
+    """The flat base and flat tops of the procedural families must not count
+    as peaks: each mesa and each ridge should hold exactly one."""
+    # Mesa tops are curved, so flat labelling alone fixes plateaus; ridge
+    # crests also need low-prominence merging
+    cases = [
+        ('plateaus', 0, {}, True,
+         lambda x, y, m: np.hypot(x - m['cx'], y - m['cy']) < m['radius']),
+        ('ridges', 13, {'n_ridges': 3}, False,
+         lambda x, y, r: _segment_distance(x, y, r) < r['width']),
+    ]
+    for family, seed, params, exact_unmerged, on_feature in cases:
+        terrain = family_terrain(family, 256, seed=seed, cache=False, **params)
+        features = terrain.stats['components']
+        index = BasinIndex.from_elevations(terrain.elevations)
+        unmerged = BasinIndex.from_elevations(terrain.elevations, min_prominence=0)
+        print(f"  {family}: {index.n_peaks} peaks for {len(features)} features "
+              f"({unmerged.n_peaks} before merging low peaks)")
+        assert index.n_peaks == len(features)
+        if exact_unmerged:
+            assert unmerged.n_peaks == len(features)
+
+        owners = []
+        for peak in range(index.n_peaks):
+            x, y = index.peak_location(peak)
+            owners.append([k for k, feature in enumerate(features) if on_feature(x, y, feature)])
+        assert sorted(k for ks in owners for k in ks) == list(range(len(features))), owners
+
+    print("  PASS: Flat regions are merged and every feature holds one peak")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Basin Index Tests")
+    print("=" * 60)
+
+    test_basin_index_matches_climbs_and_persists()
+    test_flat_regions_and_crests_give_one_peak_per_feature()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
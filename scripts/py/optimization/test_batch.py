@@ -0,0 +1,183 @@
+"""
+Tests for the vectorized (batch) evaluation paths on TerrainFunction.
+
+Batch methods must agree with the scalar reference implementations,
+which are the ones kept in step with the JavaScript versions.
+"""
+
+from pathlib import Path
+
+import math
+
+import numpy as np
+from algorithms import TerrainFunction, load_terrain, run_optimization
+from synthetic_terrain import create_unimodal_terrain
+
+
+def _load_real_terrain():
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    return load_terrain(str(terrain_path))
+
+
+def test_elevation_batch_matches_scalar():
+    """Batch elevation lookup should be bit-for-bit identical to the scalar path."""
+    terrain = _load_real_terrain()
+
+    rng = np.random.default_rng(0)
+    xs = np.concatenate([rng.random(2000), [0.0, 1.0, 0.0, 1.0, 0.5, -0.01, 1.01]])
+    ys = np.concatenate([rng.random(2000), [0.0, 0.0, 1.0, 1.0, 0.5, 0.5, 0.5]])
+
+    batch = terrain.get_elevation_batch(xs, ys)
+    scalar = np.array([terrain.get_elevation(x, y) for x, y in zip(xs, ys)])
+
+    print(f"  Compared {len(xs)} points")
+    assert batch.shape == xs.shape
+    assert np.array_equal(batch, scalar), "Batch elevations differ from scalar path"
+    print("  PASS: Batch elevation matches scalar exactly")
+
+
+def test_derivatives_batch_matches_scalar():
+    """Batched gradient and Hessian should match the scalar finite differences."""
+    terrain = _load_real_terrain()
+
+    rng = np.random.default_rng(1)
+    xs = rng.uniform(0.02, 0.98, 500)
+    ys = rng.uniform(0.02, 0.98, 500)
+    h = 0.01
+
+    f, fx, fy, fxx, fyy, fxy = terrain.get_derivatives_batch(xs, ys, h)
+    gx, gy = terrain.get_gradient_batch(xs, ys, h)
+    dxx, dyy = terrain.get_hessian_diag_batch(xs, ys, h)
+
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        assert f[i] == terrain.get_elevation(x, y)
+        assert (fx[i], fy[i]) == terrain.get_gradient(x, y, h)
+        assert (gx[i], gy[i]) == terrain.get_gradient(x, y, h)
+        assert (dxx[i], dyy[i]) == terrain.get_hessian_diag(x, y, h)
+        assert (fxx[i], fyy[i], fxy[i]) == terrain.get_full_hessian(x, y, h)
+
+    print(f"  Compared derivatives at {len(xs)} points")
+    print("  PASS: Batched gradient and Hessian match scalar exactly")
+
+
+def test_analytic_derivatives_exact_on_plane():
+    """On a tilted plane the analytic gradient is exact and the Hessian is zero."""
+    n = 20
+    grid = np.linspace(0, 1, n)
+    xx, yy = np.meshgrid(grid, grid)
+    terrain = TerrainFunction({
+        'elevations': 100 + 30 * xx - 20 * yy,
+        'grid': {'rows': n, 'cols': n},
+        'stats': {'min': 80, 'max': 130},
+    }, derivatives='analytic')
+
+    for x, y in [(0.1, 0.2), (0.5, 0.5), (0.93, 0.07), (1.0, 1.0)]:
+        f, fx, fy, fxx, fyy, fxy = terrain.get_derivatives(x, y)
+        assert math.isclose(f, terrain.get_elevation(x, y), abs_tol=1e-9)
+        assert math.isclose(fx, 30, abs_tol=1e-9) and math.isclose(fy, -20, abs_tol=1e-9)
+        assert abs(fxx) < 1e-6 and abs(fyy) < 1e-6 and abs(fxy) < 1e-6
+
+    print("  PASS: Analytic derivatives exact on a plane")
+
+
+def test_analytic_value_clamped_past_edge():
+    """Past the grid edge the analytic value should follow get_elevation's clamping."""
+    terrain = _load_real_terrain()
+    analytic = TerrainFunction({
+        'elevations': terrain.elevations,
+        'grid': {'rows': terrain.rows, 'cols': terrain.cols},
+        'stats': terrain.stats,
+    }, derivatives='analytic')
+
+    xs = np.array([1.003, 0.5, 1.2, -0.004, 0.999])
+    ys = np.array([0.5, 1.01, 1.3, 0.3, 1.0])
+    batch = analytic.get_derivatives_batch(xs, ys)[0]
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        expected = terrain.get_elevation(x, y)
+        assert math.isclose(analytic.get_derivatives(x, y)[0], expected, abs_tol=1e-9)
+        assert math.isclose(batch[i], expected, abs_tol=1e-9)
+
+    print("  PASS: Analytic value matches get_elevation past the edge")
+
+
+def test_analytic_matches_finite_and_converges():
+    """Analytic mode should agree with finite differences on a smooth terrain
+    and still drive Newton to the peak."""
+    finite = create_unimodal_terrain()
+    analytic = TerrainFunction({
+        'elevations': finite.elevations,
+        'grid': {'rows': finite.rows, 'cols': finite.cols},
+        'stats': finite.stats,
+    }, derivatives='analytic')
+
+    xs = np.linspace(0.15, 0.85, 15)
+    ys = np.linspace(0.2, 0.8, 15)
+    _, ax, ay, axx, ayy, _ = analytic.get_derivatives_batch(xs, ys)
+    fx, fy = finite.get_gradient_batch(xs, ys)
+    fxx, fyy, _ = finite.get_full_hessian_batch(xs, ys)
+
+    grad_err = np.max(np.hypot(ax - fx, ay - fy) / (np.hypot(fx, fy) + 10))
+    print(f"  Max relative gradient error: {grad_err:.4f}")
+    assert grad_err < 0.05, "Analytic gradient disagrees with finite differences"
+    assert np.all(np.sign(axx) == np.sign(fxx)) and np.all(np.sign(ayy) == np.sign(fyy))
+
+    traj = run_optimization('newton', analytic, 0.3, 0.3, max_iterations=500)
+    final = traj[-1]
+    dist = math.sqrt((final.x - 0.5)**2 + (final.y - 0.5)**2)
+    print(f"  Newton (analytic): {len(traj)} steps, dist={dist:.4f}")
+    assert final.converged and dist < 0.05
+    print("  PASS: Analytic derivatives agree with finite differences")
+
+
+def test_elevation_cache_exact_and_bounded():
+    """An exact-key elevation cache should not change any trajectory, should
+    hit on revisited stencil points and should respect its size bound."""
+    terrain = _load_real_terrain()
+    assert terrain.cache_info() is None
+
+    hits = {}
+    for algo in ['gradient', 'newton', 'annealing', 'random-restart']:
+        cached = TerrainFunction.from_array(terrain.elevations, terrain.stats, cache_size=32)
+        plain = run_optimization(algo, terrain, 0.25, 0.35, max_iterations=300, seed=42)
+        traj = run_optimization(algo, cached, 0.25, 0.35, max_iterations=300, seed=42)
+        assert np.array_equal(plain.x, traj.x) and np.array_equal(plain.elevation, traj.elevation)
+        info = cached.cache_info()
+        hits[algo] = info['hits']
+        assert info['size'] <= 32 and info['misses'] - info['evictions'] == info['size']
+        if algo == 'newton':
+            # Every stencil after the first is centred on the last new position
+            assert info['hits'] >= len(traj) - 2
+
+    print(f"  Cache hits: {hits}")
+    assert hits['gradient'] > 0 and hits['newton'] > 0
+
+    a, b = np.random.default_rng(3).random((2, 50))
+    for x, y in zip(a, b):
+        assert cached.get_derivatives(x, y, 0.01) == terrain.get_derivatives(x, y, 0.01)
+
+    # Quantized keys share an entry between nearby points
+    cached.set_cache(8, quantum=1e-6)
+    first = cached.get_elevation(0.3, 0.4)
+    assert cached.get_elevation(0.3 + 1e-8, 0.4) == first
+    assert cached.cache_info()['hits'] == 1
+    cached.set_cache(0)
+    assert cached.cache_info() is None
+    print("  PASS: Elevation cache is exact, hits on stencils and stays bounded")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Batch Evaluation Tests")
+    print("=" * 60)
+
+    test_elevation_batch_matches_scalar()
+    test_derivatives_batch_matches_scalar()
+    test_analytic_derivatives_exact_on_plane()
+    test_analytic_value_clamped_past_edge()
+    test_analytic_matches_finite_and_converges()
+    test_elevation_cache_exact_and_bounded()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
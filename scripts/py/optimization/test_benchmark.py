@@ -0,0 +1,69 @@
+"""
+Tests for the benchmark suite in benchmark.py.
+"""
+
+import json
+
+import benchmark
+from synthetic_terrain import create_unimodal_terrain
+
+
+def test_benchmark_results_and_compare():
+    """A quick benchmark pass should produce JSON-serialisable rows, and
+    compare() should flag only slowdowns beyond the threshold."""
+    terrain = create_unimodal_terrain()
+
+    min_repeat_time = benchmark.MIN_REPEAT_TIME
+    benchmark.MIN_REPEAT_TIME = 0.001
+    try:
+        results = benchmark.bench_terrain('unimodal', terrain, populations=[16])
+        results += benchmark.bench_steps('unimodal', terrain)
+    finally:
+        benchmark.MIN_REPEAT_TIME = min_repeat_time
+    names = {r['name'] for r in results}
+    assert {'get_elevation', 'get_full_hessian', 'get_derivatives_batch',
+            'step_newton_raphson', 'step_mcmc'} <= names
+    for r in results:
+        assert r['ns_per_op'] > 0 and r['peak_kib'] >= 0
+    old = json.loads(json.dumps({'meta': {}, 'results': results}))
+
+    slower = json.loads(json.dumps(old))
+    slower['results'][0]['ns_per_op'] *= 2
+    slower['results'][1]['ns_per_op'] *= 1.05
+    rows = benchmark.compare(old, slower, threshold=0.15)
+    assert len(rows) == len(results)
+    assert [row['regression'] for row in rows[:3]] == [True, False, False]
+    assert abs(rows[0]['ratio'] - 2) < 1e-12
+
+    print(f"  {len(results)} benchmarks, get_elevation "
+          f"{results[0]['ns_per_op']:.0f} ns/eval")
+    print("  PASS: Benchmark rows are complete and regressions are flagged")
+
+
+def test_sampler_efficiency_rows():
+    """bench_samplers reports cost per effective sample for every sampler,
+    with gradient counts only for the gradient-based ones."""
+    terrain = create_unimodal_terrain()
+    results = benchmark.bench_samplers('unimodal', terrain, n_chains=2, n_iterations=80, warmup=20)
+    by_name = {r['name']: r for r in results}
+    assert set(by_name) == {'mcmc_efficiency[metropolis]', 'mcmc_efficiency[metropolis/adaptive]',
+                            'mcmc_efficiency[mala]', 'mcmc_efficiency[hmc]'}
+    assert by_name['mcmc_efficiency[metropolis]']['ess_per_gradient'] is None
+    for name in ('mcmc_efficiency[mala]', 'mcmc_efficiency[hmc]'):
+        assert by_name[name]['gradient_evaluations'] > 0 and by_name[name]['ess_per_gradient'] > 0
+    assert all(r['ns_per_op'] > 0 and r['ess'] > 0 for r in results)
+    json.dumps(results)
+    print("  PASS: Sampler efficiency rows carry ESS per evaluation and per gradient")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Benchmark Tests")
+    print("=" * 60)
+
+    test_benchmark_results_and_compare()
+    test_sampler_efficiency_rows()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
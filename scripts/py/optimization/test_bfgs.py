@@ -0,0 +1,63 @@
+"""
+Tests for the quasi-Newton step function step_bfgs.
+"""
+
+import numpy as np
+from algorithms import OptimizationConfig, OptimizationState, run_optimization, step_bfgs
+from synthetic_terrain import create_rotated_terrain, create_unimodal_terrain
+
+
+def test_bfgs_secant_condition():
+    """After an update the inverse-Hessian approximation should map the
+    gradient change onto the step taken (the secant condition)."""
+    terrain = create_unimodal_terrain()
+    config = OptimizationConfig()
+    x0, y0 = 0.45, 0.47  # Concave region, so the curvature condition holds
+    state = OptimizationState(x=x0, y=y0, elevation=terrain(x0, y0))
+    step_bfgs(state, terrain, config)
+    step_bfgs(state, terrain, config)
+
+    # memory holds the second step's start point, gradient and the H
+    # updated from the first step
+    px, py, pgx, pgy, hxx, hxy, hyy = state.memory
+    g0 = terrain.get_gradient(x0, y0)
+    sx, sy = px - x0, py - y0
+    yx, yy = g0[0] - pgx, g0[1] - pgy
+    assert sx * yx + sy * yy > 0
+    assert np.allclose([hxx * yx + hxy * yy, hxy * yx + hyy * yy], [sx, sy])
+    assert hxx > 0 and hyy > 0 and hxx * hyy - hxy ** 2 > 0, "H should stay positive definite"
+    print("  PASS: BFGS update satisfies the secant condition")
+
+
+def test_bfgs_converges_without_hessians():
+    """BFGS should reach the peak of a rotated (correlated) terrain as
+    reliably as Newton, using gradients only."""
+    terrain = create_rotated_terrain()
+    for x0, y0 in [(0.3, 0.3), (0.7, 0.3), (0.3, 0.7)]:
+        newton = run_optimization('newton', terrain, x0, y0, instrument=True)
+        bfgs = run_optimization('bfgs', terrain, x0, y0, instrument=True)
+        final = bfgs[-1]
+        assert final.converged
+        assert np.hypot(final.x - newton[-1].x, final.y - newton[-1].y) < 0.02
+        # Newton gets its Hessian from get_derivatives; BFGS must call no
+        # method that computes one
+        assert newton.evaluations.calls('get_derivatives') > 0
+        for method in ('get_derivatives', 'get_full_hessian', 'get_hessian_diag'):
+            assert bfgs.evaluations.calls(method) == 0, f"BFGS called {method}"
+        assert bfgs.evaluations.evaluations() < newton.evaluations.evaluations()
+        print(f"  ({x0}, {y0}): newton {newton.evaluations.evaluations()} evaluations, "
+              f"bfgs {bfgs.evaluations.evaluations()}")
+    print("  PASS: BFGS converges with gradient evaluations only")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("BFGS Tests")
+    print("=" * 60)
+
+    test_bfgs_secant_condition()
+    test_bfgs_converges_without_hessians()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
@@ -17,6 +17,7 @@ from algorithms import (
     OptimizationState,
     TerrainFunction,
 )
+from basins import load_basin_index
 
 
 def test_terrain_elevation():
@@ -74,10 +75,12 @@ def test_algorithm_convergence():
     terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
 
     terrain = load_terrain(str(terrain_path))
+    basins = load_basin_index(str(terrain_path))
     config = OptimizationConfig()
 
     algorithms = ['gradient', 'newton', 'annealing', 'random-restart']
     x0, y0 = 0.25, 0.35
+    start_peak = basins.peak_at(x0, y0)
 
     print("\nAlgorithm convergence tests:")
     results = {}
@@ -102,6 +105,14 @@ def test_algorithm_convergence():
         assert result['converged'] or result['steps'] >= 1000, f"{algo} didn't converge"
         assert result['final_elev'] > 100, f"{algo} converged to low elevation"
 
+        # The basin index says which peak the final point drains to; a
+        # converged run should be sitting (nearly) on top of it
+        peak = basins.peak_at(result['final_x'], result['final_y'])
+        assert result['final_elev'] > basins.peak_elevation[peak] - 5, \
+            f"{algo} stopped {basins.peak_elevation[peak] - result['final_elev']:.1f}m below its peak"
+        if algo in ('gradient', 'newton'):
+            assert peak == start_peak, f"{algo} left the basin of its start point"
+
     print("  ✓ All algorithms converged to valid peaks")
     return results
 
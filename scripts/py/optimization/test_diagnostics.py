@@ -0,0 +1,84 @@
+"""
+Tests for the MCMC convergence diagnostics in diagnostics.py.
+"""
+
+import numpy as np
+from algorithms import run_mcmc_chains
+from diagnostics import autocorrelation, autocovariance, ess, mcse_mean, rhat, summarize
+from samplers import from_histories, run_mcmc_vectorized
+from synthetic_terrain import create_unimodal_terrain
+
+
+def _ar1(phi: float, n_chains: int, n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((n_chains, n))
+    draws = np.empty_like(noise)
+    draws[:, 0] = noise[:, 0] / np.sqrt(1 - phi ** 2)
+    for t in range(1, n):
+        draws[:, t] = phi * draws[:, t - 1] + noise[:, t]
+    return draws
+
+
+def test_fft_autocovariance_matches_direct_sum():
+    draws = np.random.default_rng(1).standard_normal((3, 257))
+    centered = draws - draws.mean(axis=1, keepdims=True)
+    direct = np.array([[(chain[:257 - k] * chain[k:]).sum() / 257 for k in range(20)]
+                       for chain in centered])
+
+    assert np.allclose(autocovariance(draws, max_lag=19), direct)
+    assert np.allclose(autocorrelation(draws)[:, 0], 1)
+    print("  PASS: FFT autocovariance equals the direct sum")
+
+
+def test_ess_and_rhat_on_known_processes():
+    """AR(1) with coefficient phi has ESS = N (1 - phi) / (1 + phi); chains
+    with different means have R-hat well above 1."""
+    draws = _ar1(0.9, 16, 20000)
+    expected = draws.size * 0.1 / 1.9
+    n_eff = ess(draws)
+    print(f"  AR(0.9): ESS {n_eff:.0f} (theory {expected:.0f}), R-hat {rhat(draws):.4f}")
+    assert abs(n_eff / expected - 1) < 0.1
+    assert abs(rhat(draws) - 1) < 0.01
+    assert abs(mcse_mean(draws) - np.sqrt(draws.var() / n_eff)) < 1e-4
+
+    iid = np.random.default_rng(2).standard_normal((4, 5000))
+    assert abs(ess(iid) / iid.size - 1) < 0.1
+
+    shifted = iid + np.arange(4)[:, np.newaxis]
+    print(f"  Chains offset by 0..3 sd: R-hat {rhat(shifted):.2f}")
+    assert rhat(shifted) > 1.5
+    assert np.isnan(ess(np.ones((4, 100))))
+    print("  PASS: ESS and R-hat match theory")
+
+
+def test_summarize_sampler_output():
+    """summarize() accepts vectorized sampler arrays and run_mcmc_chains
+    histories (via from_histories) alike."""
+    terrain = create_unimodal_terrain()
+    samples, accepted, _ = run_mcmc_vectorized(8, terrain, 2000, seed=3)
+    summary = summarize(samples)
+    for name, stats in summary.items():
+        print(f"  {name:>9}: mean {stats['mean']:.3f} +/- {stats['mcse']:.3f}, "
+              f"ESS {stats['ess']:.0f}, R-hat {stats['rhat']:.3f}")
+    assert set(summary) == {'x', 'y', 'elevation'}
+    assert all(stats['rhat'] < 1.1 and stats['ess'] > 50 for stats in summary.values())
+
+    histories, _ = run_mcmc_chains(2, terrain, 50, seed=4)
+    samples, accepted = from_histories(histories)
+    assert samples.shape == (2, 50, 3) and accepted.shape == (2, 50)
+    assert samples[1, 7, 2] == histories[1][7]['elevation']
+    print("  PASS: Sampler output summarized")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("MCMC Diagnostics Tests")
+    print("=" * 60)
+
+    test_fft_autocovariance_matches_direct_sum()
+    test_ess_and_rhat_on_known_processes()
+    test_summarize_sampler_output()
+
+    print("=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
@@ -0,0 +1,56 @@
+"""
+Tests for evaluation counting in instrumentation.py.
+"""
+
+import numpy as np
+from algorithms import OptimizationConfig, OptimizationState, run_optimization, step_newton_raphson
+from instrumentation import InstrumentedTerrain
+from synthetic_terrain import create_arthurs_seat_synthetic
+
+
+def test_instrumented_counts_and_parity():
+    """Instrumented runs should match plain runs exactly and attribute
+    every evaluation to the step function that made it."""
+    terrain = create_arthurs_seat_synthetic(100)
+
+    # One Newton step: 9 (shared gradient/Hessian stencil) + 1 (new position)
+    instrumented = InstrumentedTerrain(terrain)
+    state = OptimizationState(x=0.3, y=0.4, elevation=terrain(0.3, 0.4))
+    step_newton_raphson(state, instrumented, OptimizationConfig())
+    counter = instrumented.counter
+    assert counter.evaluations('step_newton_raphson') == 10
+    assert counter.calls('get_derivatives') == 1
+    assert counter.calls('get_gradient') == 0
+    assert counter.seconds('get_elevation') > 0
+
+    # Batch calls count the broadcast points, not just those in x
+    batch = InstrumentedTerrain(terrain)
+    batch.get_elevation_batch(0.5, np.linspace(0.1, 0.9, 7))
+    assert batch.counter.evaluations() == 7
+
+    for algo in ['gradient', 'newton', 'annealing', 'random-restart']:
+        plain = run_optimization(algo, terrain, 0.25, 0.35, max_iterations=300, seed=42)
+        counted = run_optimization(algo, terrain, 0.25, 0.35, max_iterations=300, seed=42,
+                                   instrument=True)
+        assert plain.evaluations is None
+        assert np.array_equal(plain.x, counted.x) and np.array_equal(plain.y, counted.y)
+
+        by_caller = counted.evaluations.by_caller()
+        assert by_caller['run_optimization']['get_elevation']['calls'] == 1
+        assert len(by_caller) == 2, f"Unexpected callers {sorted(by_caller)}"
+        print(f"  {algo:15s}: {len(counted) - 1:3d} iterations, "
+              f"{counted.evaluations.evaluations():5d} evaluations")
+
+    print("  PASS: Instrumented runs are identical and evaluations are attributed")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Instrumentation Tests")
+    print("=" * 60)
+
+    test_instrumented_counts_and_parity()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
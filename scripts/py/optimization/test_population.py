@@ -0,0 +1,73 @@
+"""
+Tests for the lockstep population engine in population.py.
+
+Deterministic kernels must reproduce run_optimization member by member;
+stochastic kernels are checked for sensible aggregate behaviour.
+"""
+
+import numpy as np
+from algorithms import run_optimization
+from population import basin_map, grid_starts, run_population
+from synthetic_terrain import create_arthurs_seat_synthetic, create_unimodal_terrain
+
+
+def test_population_matches_scalar_runs():
+    """Gradient and Newton populations should match scalar runs exactly."""
+    terrain = create_arthurs_seat_synthetic(100)
+    xx, yy = grid_starts(6)
+
+    for algo in ['gradient', 'newton']:
+        pop = run_population(algo, terrain, xx, yy, max_iterations=300)
+        for i, (x0, y0) in enumerate(zip(xx.ravel(), yy.ravel())):
+            final = run_optimization(algo, terrain, x0, y0, max_iterations=300)[-1]
+            member = pop.state(i)
+            assert (member.x, member.y, member.elevation) == (final.x, final.y, final.elevation)
+            assert member.iteration == final.iteration
+            assert member.converged == final.converged
+            assert member.convergence_reason == final.convergence_reason
+        print(f"  {algo}: {pop.size} members match scalar trajectories")
+
+    print("  PASS: Population engine reproduces scalar runs")
+
+
+def test_stochastic_population_reaches_peak():
+    """Annealing and random restarts should end near the peak of a unimodal terrain."""
+    terrain = create_unimodal_terrain()
+    x0 = np.full(64, 0.3)
+    y0 = np.full(64, 0.3)
+
+    for algo in ['annealing', 'random-restart']:
+        pop = run_population(algo, terrain, x0, y0, max_iterations=2000, seed=42)
+        print(f"  {algo}: converged={pop.converged.mean():.0%}, "
+              f"median best={np.median(pop.best_elevation):.1f}")
+        assert pop.converged.all()
+        assert np.median(pop.best_elevation) > 200
+
+    print("  PASS: Stochastic populations converge")
+
+
+def test_basin_map_single_peak():
+    """Every start on a unimodal terrain should drain to the same peak."""
+    terrain = create_unimodal_terrain()
+    result = basin_map('newton', terrain, resolution=15)
+
+    print(f"  Peaks found: {result['peak_id'].max() + 1}, "
+          f"converged={result['summary']['converged_fraction']:.0%}")
+    assert result['peak_id'].shape == (15, 15)
+    assert result['summary']['converged_fraction'] == 1.0
+    assert np.all(result['peak_id'] == 0)
+    print("  PASS: Basin map finds a single basin")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Population Engine Tests")
+    print("=" * 60)
+
+    test_population_matches_scalar_runs()
+    test_stochastic_population_reaches_peak()
+    test_basin_map_single_peak()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
@@ -0,0 +1,62 @@
+"""
+Tests for the terrain pyramid and coarse-to-fine mode of run_optimization.
+"""
+
+import tempfile
+
+import numpy as np
+from algorithms import TerrainFunction, downsample_grid, run_optimization
+from terrain_families import family_terrain
+
+
+def test_downsample_preserves_extent():
+    """Halving should keep corners and smooth planes exact, and pyramids
+    should stop before levels get too coarse."""
+    x = np.linspace(0, 1, 257)
+    plane = 100 + 40 * x[np.newaxis, :] - 25 * x[:, np.newaxis]
+    coarse = downsample_grid(plane)
+    assert coarse.shape == (129, 129)
+    assert np.allclose(coarse, plane[::2, ::2])
+
+    terrain = TerrainFunction.from_array(plane)
+    levels = terrain.pyramid(10)
+    assert levels[0] is terrain
+    assert [level.rows for level in levels] == [257, 129, 65, 33]
+    assert terrain.pyramid(2)[2] is levels[2], "Levels should be built once"
+    print("  PASS: Downsampling keeps coordinates aligned across levels")
+
+
+def test_coarse_to_fine_saves_full_resolution_evaluations():
+    """Starting the full-resolution run from a coarse-level optimum should
+    reach the same peak with far fewer full-resolution evaluations."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        terrain = family_terrain('bumps', 1024, seed=1, cache_dir=cache_dir)
+
+        for algo in ['newton', 'random-restart']:
+            plain = run_optimization(algo, terrain, 0.3, 0.3, seed=42, instrument=True)
+            c2f = run_optimization(algo, terrain, 0.3, 0.3, seed=42, instrument=True,
+                                   pyramid_levels=4)
+            final = c2f[-1]
+            assert final.converged
+            assert [level['rows'] for level in c2f.levels] == [64, 128, 256, 512, 1024]
+            assert final.elevation >= plain[-1].elevation - 0.5
+
+            before = plain.evaluations.evaluations()
+            after = c2f.evaluations.evaluations()
+            print(f"  {algo:15s}: {before} -> {after} full-resolution evaluations")
+            assert after < before / 4
+
+    print("  PASS: Coarse-to-fine runs converge with fewer full-resolution evaluations")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Terrain Pyramid Tests")
+    print("=" * 60)
+
+    test_downsample_preserves_extent()
+    test_coarse_to_fine_saves_full_resolution_evaluations()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
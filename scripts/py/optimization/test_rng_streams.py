@@ -0,0 +1,97 @@
+"""
+Tests for per-chain random number streams (rng_streams='per-chain').
+"""
+
+from pathlib import Path
+
+import numpy as np
+import samplers
+from algorithms import OptimizationConfig, load_terrain, run_mcmc_chains, run_optimization, stream_seed
+from samplers import run_mcmc_pool, run_mcmc_vectorized, to_histories
+
+
+def _load_real_terrain():
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    return load_terrain(str(terrain_path))
+
+
+def test_stream_seed_matches_spawn():
+    """stream_seed(seed, k) is the k-th child of SeedSequence(seed)."""
+    children = np.random.SeedSequence(42).spawn(5)
+    for k, child in enumerate(children):
+        expected = np.random.default_rng(child).random(3)
+        assert np.array_equal(np.random.default_rng(stream_seed(42, k)).random(3), expected)
+    # Nested: streams of a stream
+    assert stream_seed(stream_seed(42, 1), 2).spawn_key == (1, 2)
+    print("  PASS: stream_seed reproduces SeedSequence.spawn")
+
+
+def test_chains_independent_of_batching():
+    """With per-chain streams a chain's draws depend only on (seed, chain id):
+    not on how many chains run with it, nor where in the batch it sits."""
+    terrain = _load_real_terrain()
+
+    all_chains, _ = run_mcmc_chains(6, terrain, 150, seed=7, rng_streams='per-chain')
+    first_four, _ = run_mcmc_chains(4, terrain, 150, seed=7, rng_streams='per-chain')
+    last_two, _ = run_mcmc_chains(2, terrain, 150, seed=7, rng_streams='per-chain', first_chain=4)
+    assert first_four == all_chains[:4]
+    assert last_two == all_chains[4:]
+
+    shared, _ = run_mcmc_chains(6, terrain, 150, seed=7)
+    assert shared != all_chains
+    print("  PASS: Per-chain streams are independent of chain batching")
+
+
+def test_serial_vectorized_and_pool_agree():
+    """run_mcmc_chains, run_mcmc_vectorized and run_mcmc_pool give the same
+    chains for the same seed, for any process count."""
+    terrain = _load_real_terrain()
+
+    serial, summary = run_mcmc_chains(5, terrain, 200, seed=11, rng_streams='per-chain')
+    samples, accepted, vsummary = run_mcmc_vectorized(5, terrain, 200, seed=11, rng_streams='per-chain')
+    assert to_histories(samples, accepted) == serial
+    assert vsummary['total_accepted'] == summary['total_accepted']
+
+    for processes in (1, 2, 3):
+        pooled, psummary = run_mcmc_pool(5, terrain, 200, seed=11, processes=processes)
+        assert pooled == serial
+        assert psummary['total_accepted'] == summary['total_accepted']
+    # The in-process path must not leave the caller's terrain in the worker global
+    assert samplers._worker_terrain is None
+
+    config = OptimizationConfig(mcmc_adapt='scale', mcmc_adapt_iterations=100)
+    serial, summary = run_mcmc_chains(3, terrain, 150, config=config, seed=3, rng_streams='per-chain')
+    pooled, psummary = run_mcmc_pool(3, terrain, 150, config=config, seed=3, processes=2)
+    assert pooled == serial and psummary == summary
+
+    empty, esummary = run_mcmc_chains(0, terrain, 50, seed=3)
+    for processes in (1, 2):
+        assert run_mcmc_pool(0, terrain, 50, seed=3, processes=processes) == (empty, esummary)
+    print("  PASS: Serial, vectorized and pooled chains are identical")
+
+
+def test_run_optimization_accepts_stream_seeds():
+    terrain = _load_real_terrain()
+    runs = [run_optimization('annealing', terrain, 0.3, 0.3, max_iterations=200,
+                             seed=stream_seed(5, run_id)) for run_id in range(3)]
+    again = run_optimization('annealing', terrain, 0.3, 0.3, max_iterations=200, seed=stream_seed(5, 1))
+    finals = [(run[-1].x, run[-1].y) for run in runs]
+    assert finals[1] == (again[-1].x, again[-1].y)
+    assert len(set(finals)) == 3
+    print("  PASS: run_optimization takes per-run stream seeds")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("RNG Stream Tests")
+    print("=" * 60)
+
+    test_stream_seed_matches_spawn()
+    test_chains_independent_of_batching()
+    test_serial_vectorized_and_pool_agree()
+    test_run_optimization_accepts_stream_seeds()
+
+    print("=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
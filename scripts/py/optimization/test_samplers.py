@@ -0,0 +1,89 @@
+"""
+Tests for the vectorized MCMC samplers in samplers.py.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from algorithms import load_terrain, run_mcmc_chains
+from samplers import run_mcmc_vectorized, run_parallel_tempering, to_histories
+from synthetic_terrain import create_bump_terrain
+
+
+def _load_real_terrain():
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    return load_terrain(str(terrain_path))
+
+
+def test_vectorized_mcmc_legacy_stream_matches_scalar():
+    """With legacy_stream=True the vectorized sampler reproduces run_mcmc_chains."""
+    terrain = _load_real_terrain()
+
+    histories, summary = run_mcmc_chains(n_chains=4, terrain=terrain, n_iterations=300, seed=42)
+    samples, accepted, vsummary = run_mcmc_vectorized(
+        4, terrain, 300, seed=42, legacy_stream=True
+    )
+
+    assert samples.shape == (4, 300, 3) and accepted.shape == (4, 300)
+    assert to_histories(samples, accepted) == histories
+    assert vsummary['total_accepted'] == summary['total_accepted']
+    print(f"  Acceptance rate: {vsummary['acceptance_rate']:.1%} (matches scalar)")
+    print("  PASS: Legacy stream reproduces run_mcmc_chains")
+
+
+def test_vectorized_mcmc_acceptance_rate():
+    """The fast path should mix like the scalar sampler."""
+    terrain = _load_real_terrain()
+
+    samples, accepted, summary = run_mcmc_vectorized(64, terrain, 500, seed=7)
+    rate = summary['acceptance_rate']
+    print(f"  Acceptance rate: {rate:.1%} over {summary['n_chains']} chains")
+
+    assert 0.1 < rate < 0.8
+    assert np.all((samples[..., :2] >= 0.01) & (samples[..., :2] <= 0.99))
+    # Rejected steps leave the position unchanged
+    steps = np.diff(samples[..., :2], axis=1)
+    assert np.all(steps[~accepted[:, 1:]] == 0)
+    print("  PASS: Vectorized sampler acceptance in expected range")
+
+
+def test_parallel_tempering_crosses_between_modes():
+    """On two well-separated peaks, tempered ladders should move their cold
+    replicas between modes, where plain chains with the same evaluation
+    budget stay on the peak they start on."""
+    bumps = [
+        {'cx': 0.3, 'cy': 0.3, 'height': 170, 'sx': 0.07, 'sy': 0.07, 'rot': 0},
+        {'cx': 0.72, 'cy': 0.7, 'height': 190, 'sx': 0.07, 'sy': 0.07, 'rot': 0},
+    ]
+    terrain = create_bump_terrain(bumps, base_height=30)
+    region = (0.25, 0.35, 0.25, 0.35)
+
+    samples, accepted, summary = run_parallel_tempering(8, terrain, 1000, seed=3, initial_region=region)
+    assert samples.shape == (8, 1000, 3) and accepted.shape == (8, 1000)
+    assert summary['swap_acceptance'].shape == (summary['temperatures'].size - 1,)
+    assert np.all(summary['swap_acceptance'] > 0.2)
+    far_pt = np.mean(samples[..., 0] > 0.5)
+
+    n_plain = summary['evaluations'] // 1000
+    plain, _, _ = run_mcmc_vectorized(n_plain, terrain, 1000, seed=3, initial_region=region)
+    far_plain = np.mean(plain[..., 0] > 0.5)
+
+    print(f"  Swap acceptance per rung: {np.round(summary['swap_acceptance'], 2)}")
+    print(f"  Time on the far peak: tempering {far_pt:.1%}, {n_plain} plain chains {far_plain:.1%}")
+    assert far_pt > 0.2 and far_plain < 0.02
+    print("  PASS: Parallel tempering mixes between separated peaks")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Vectorized Sampler Tests")
+    print("=" * 60)
+
+    test_vectorized_mcmc_legacy_stream_matches_scalar()
+    test_vectorized_mcmc_acceptance_rate()
+    test_parallel_tempering_crosses_between_modes()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
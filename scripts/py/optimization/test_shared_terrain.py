@@ -0,0 +1,66 @@
+"""
+Tests for sharing terrain grids between processes (shared_terrain.py).
+"""
+
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from shared_terrain import SharedTerrain, attach
+from synthetic_terrain import create_arthurs_seat_synthetic
+
+
+def _sample_in_worker(handle):
+    terrain = attach(handle)
+    xs = np.linspace(0.05, 0.95, 50)
+    return terrain.get_elevation_batch(xs, xs[::-1]), terrain.elevations.flags.owndata
+
+
+def test_shared_memory_terrain_in_workers():
+    """Workers attached to shared memory should see exactly the published grid."""
+    terrain = create_arthurs_seat_synthetic(100)
+    xs = np.linspace(0.05, 0.95, 50)
+    expected = terrain.get_elevation_batch(xs, xs[::-1])
+
+    with SharedTerrain(terrain) as shared:
+        local = attach(shared.handle)
+        assert np.array_equal(local.elevations, terrain.elevations)
+        assert not local.elevations.flags.writeable
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_sample_in_worker, [shared.handle] * 4))
+
+    for values, owndata in results:
+        assert np.array_equal(values, expected)
+        assert not owndata, "Worker terrain should be a view, not a copy"
+    print(f"  {len(results)} worker evaluations matched the published grid")
+    print("  PASS: Shared-memory terrain attaches zero-copy")
+
+
+def test_memmap_terrain():
+    """The .npy variant should memory-map the same grid."""
+    terrain = create_arthurs_seat_synthetic(60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = SharedTerrain(terrain, npy_path=str(Path(tmp) / 'terrain.npy'))
+        mapped = attach(shared.handle)
+        assert not mapped.elevations.flags.owndata
+        assert mapped(0.3, 0.6) == terrain(0.3, 0.6)
+        assert mapped.stats == terrain.stats
+        del mapped
+
+    print("  PASS: Memory-mapped terrain matches")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Shared Terrain Tests")
+    print("=" * 60)
+
+    test_shared_memory_terrain_in_workers()
+    test_memmap_terrain()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
@@ -0,0 +1,76 @@
+"""
+Tests for the adaptive step-control modes of gradient ascent (ga_step_mode).
+"""
+
+import numpy as np
+from algorithms import GA_STEP_MODES, OptimizationConfig, run_optimization
+from population import run_population
+from synthetic_terrain import create_unimodal_terrain
+
+
+def test_step_modes_converge_in_fewer_evaluations():
+    """Every adaptive mode should reach the unimodal peak, and the line-search
+    and Barzilai-Borwein modes should need far fewer evaluations than fixed steps."""
+    terrain = create_unimodal_terrain()
+    starts = [(0.25, 0.35), (0.7, 0.2), (0.8, 0.8)]
+
+    evaluations = {}
+    for mode in GA_STEP_MODES:
+        config = OptimizationConfig(ga_step_mode=mode)
+        counts = []
+        for x0, y0 in starts:
+            traj = run_optimization('gradient', terrain, x0, y0, config=config, instrument=True)
+            final = traj[-1]
+            assert np.hypot(final.best_x - 0.5, final.best_y - 0.5) < 0.02, f"{mode} missed the peak"
+            if mode != 'fixed':
+                assert final.converged, f"{mode} did not converge from ({x0}, {y0})"
+            counts.append(traj.evaluations.evaluations())
+        evaluations[mode] = np.mean(counts)
+        print(f"  {mode:9s}: {evaluations[mode]:7.1f} evaluations")
+
+    assert evaluations['armijo'] < evaluations['fixed'] / 10
+    assert evaluations['bb'] < evaluations['fixed'] / 10
+
+    # Restarts reuse the same step control for their inner ascent
+    config = OptimizationConfig(ga_step_mode='armijo')
+    fixed = run_optimization('random-restart', terrain, 0.25, 0.35, seed=1)
+    armijo = run_optimization('random-restart', terrain, 0.25, 0.35, config=config, seed=1)
+    assert armijo[-1].converged and len(armijo) < len(fixed) / 2
+    assert abs(armijo[-1].elevation - fixed[-1].elevation) < 0.5
+
+    try:
+        run_population('gradient', terrain, [0.3], [0.3], config=config)
+        assert False, "run_population should reject adaptive step modes"
+    except ValueError:
+        pass
+    print("  PASS: Adaptive step control converges in a fraction of the evaluations")
+
+
+def test_restart_step_size_is_configurable():
+    """Fixed-step restarts should move rr_step_size per step, in both the
+    scalar and the population kernels."""
+    terrain = create_unimodal_terrain()
+    config = OptimizationConfig(rr_step_size=0.02)
+    traj = run_optimization('random-restart', terrain, 0.25, 0.35, config=config, seed=1)
+    first_leg = np.hypot(np.diff(traj.x[:5]), np.diff(traj.y[:5]))
+    assert np.allclose(first_leg, 0.02)
+
+    pop = run_population('random-restart', terrain, [0.25], [0.35], config=config, seed=1)
+    default = run_population('random-restart', terrain, [0.25], [0.35], seed=1)
+    assert pop.iteration[0] < default.iteration[0]
+    print(f"  rr_step_size 0.02: {traj[-1].iteration} iterations "
+          f"(population {pop.iteration[0]} vs {default.iteration[0]} at the default)")
+    print("  PASS: Restart step size follows OptimizationConfig")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Step Control Tests")
+    print("=" * 60)
+
+    test_step_modes_converge_in_fewer_evaluations()
+    test_restart_step_size_is_configurable()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
@@ -0,0 +1,115 @@
+"""
+Tests for streaming MCMC and the running diagnostics in streaming.py.
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from algorithms import load_terrain
+from samplers import run_mcmc_vectorized
+from streaming import (NpyAppender, RunningDiagnostics, load_mcmc_stream, stream_mcmc,
+                       write_mcmc_stream)
+
+
+def _load_real_terrain():
+    script_dir = Path(__file__).parent
+    terrain_path = script_dir.parent.parent.parent / 'docs' / 'data' / 'arthurs_seat_elevation.json'
+    return load_terrain(str(terrain_path))
+
+
+def test_stream_matches_vectorized_sampler():
+    """Chunks concatenate to run_mcmc_vectorized's draws, and the running
+    statistics agree with the ones computed from the full arrays."""
+    terrain = _load_real_terrain()
+
+    samples, accepted, summary = run_mcmc_vectorized(8, terrain, 1300, seed=5)
+    chunks = list(stream_mcmc(8, terrain, 1300, seed=5, chunk_size=200))
+
+    assert [chunk.start for chunk in chunks] == list(range(0, 1300, 200))
+    assert np.array_equal(np.concatenate([c.samples for c in chunks], axis=1), samples)
+    assert np.array_equal(np.concatenate([c.accepted for c in chunks], axis=1), accepted)
+
+    diagnostics = chunks[-1].diagnostics
+    assert diagnostics.count == 1300
+    assert np.allclose(diagnostics.acceptance_rates, summary['chain_acceptance_rates'])
+    assert np.allclose(diagnostics.mean, samples.mean(axis=1))
+    assert np.allclose(diagnostics.variance, samples.var(axis=1, ddof=1))
+    print("  PASS: Streamed chunks and running statistics match the batch sampler")
+
+
+def test_running_diagnostics_detect_mixing():
+    """Independent draws give R-hat ~ 1 and ESS ~ draw count; chains stuck
+    at different levels give a large R-hat; the block count stays bounded."""
+    rng = np.random.default_rng(0)
+    mixed = RunningDiagnostics(4, n_params=1)
+    stuck = RunningDiagnostics(4, n_params=1, max_blocks=16)
+    offsets = np.arange(4.0)[:, np.newaxis, np.newaxis]
+    for _ in range(100):
+        draws = rng.standard_normal((4, 500, 1))
+        mixed.update(draws, np.ones((4, 500), dtype=bool))
+        stuck.update(draws + offsets, np.ones((4, 500), dtype=bool))
+
+    rhat, ess = mixed.split_rhat()[0], mixed.ess()[0]
+    print(f"  iid: R-hat {rhat:.4f}, ESS {ess:.0f} of 200000; "
+          f"stuck: R-hat {stuck.split_rhat()[0]:.2f}")
+    assert len(stuck.blocks) < 16 and stuck.block_size > 500
+    assert abs(rhat - 1) < 0.01
+    assert 150000 < ess < 250000
+    assert mixed.converged(rhat=1.01, ess=10000)
+    assert stuck.split_rhat()[0] > 1.5 and not stuck.converged(rhat=1.01)
+    print("  PASS: Running split-R-hat and ESS separate mixed from stuck chains")
+
+
+def test_write_stream_stops_early_and_round_trips():
+    """write_mcmc_stream stops once the targets pass and leaves .npy files
+    that load back as the streamed draws."""
+    terrain = _load_real_terrain()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'chains.npy'
+        summary = write_mcmc_stream(path, 16, terrain, 100000, seed=2,
+                                    chunk_size=500, target_rhat=1.1)
+        samples, accepted = load_mcmc_stream(path)
+        n = summary['n_iterations']
+        print(f"  Stopped after {n} iterations, R-hat {np.max(summary['rhat']):.3f}")
+
+        assert summary['stopped_early'] and n % 500 == 0
+        assert np.all(summary['rhat'] < 1.1)
+        assert samples.shape == (16, n, 3) and accepted.shape == (16, n)
+        expected, expected_accepted, _ = run_mcmc_vectorized(16, terrain, n, seed=2)
+        assert np.array_equal(samples, expected)
+        assert np.array_equal(accepted, expected_accepted)
+        del samples, accepted
+    print("  PASS: Early-stopped stream written and reloaded")
+
+
+def test_appender_readable_before_close():
+    """An NpyAppender file should load with every appended row before close()."""
+    rows = np.arange(24, dtype=np.float64).reshape(4, 2, 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'partial.npy'
+        with NpyAppender(path, (2, 3), np.float64) as out:
+            assert np.load(path).shape == (0, 2, 3)
+            out.append(rows[:1])
+            out.append(rows[1:3])
+            assert np.array_equal(np.load(path), rows[:3])
+            out.append(rows[3:])
+        assert np.array_equal(np.load(path), rows)
+    print("  PASS: Appended rows readable before close")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Streaming MCMC Tests")
+    print("=" * 60)
+
+    test_stream_matches_vectorized_sampler()
+    test_running_diagnostics_detect_mixing()
+    test_write_stream_stops_early_and_round_trips()
+    test_appender_readable_before_close()
+
+    print("=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
@@ -0,0 +1,101 @@
+"""
+Tests for the parameter-sweep runner in sweep.py.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import sweep
+from algorithms import OptimizationConfig, run_optimization
+from sweep import config_grid, config_random, parse_cli_values, run_sweep, summarize
+from synthetic_terrain import create_unimodal_terrain
+
+
+def _strip_timing(rows):
+    return [{k: v for k, v in row.items() if k != 'wall_time'} for row in rows]
+
+
+def test_sweep_matches_direct_runs():
+    """Pooled and in-process sweeps should agree with direct run_optimization calls."""
+    terrain = create_unimodal_terrain()
+    configs = config_grid(nr_damping=[0.5, 0.8], nr_max_step=[0.04, 0.08])
+    starts = [(0.2, 0.3), (0.7, 0.6)]
+
+    serial = run_sweep('newton', terrain, configs, starts, max_iterations=500, processes=1)
+    # The in-process path must not leave the caller's terrain in the worker globals
+    assert sweep._worker_terrain is None and sweep._worker_config is None
+    pooled = run_sweep('newton', terrain, configs, starts, max_iterations=500, processes=2)
+
+    assert len(serial) == len(configs) * len(starts)
+    assert _strip_timing(serial) == _strip_timing(pooled)
+
+    row = serial[-1]
+    config = OptimizationConfig(nr_damping=row['nr_damping'], nr_max_step=row['nr_max_step'])
+    final = run_optimization('newton', terrain, row['x0'], row['y0'],
+                             max_iterations=500, config=config)[-1]
+    assert (row['iterations'], row['final_elevation']) == (final.iteration, final.elevation)
+
+    summary = summarize(serial, by=['nr_damping'])
+    print(f"  {len(serial)} runs, summary: "
+          + ', '.join(f"{s['nr_damping']}: {s['mean_iterations']:.0f} iters" for s in summary))
+    assert all(s['converged_fraction'] == 1.0 for s in summary)
+    print("  PASS: Sweep results match direct runs")
+
+
+def test_config_random_ranges():
+    """Random configs should stay inside their ranges, keep int fields integral
+    and reject unknown or non-numeric fields."""
+    configs = config_random(20, seed=1, sa_cooling_rate=(0.99, 0.999))
+    assert all(0.99 <= c['sa_cooling_rate'] <= 0.999 for c in configs)
+
+    configs = config_random(6, seed=1, bfgs_max_backtracks=(5, 8), nr_damping=(0.4, 0.9))
+    assert all(type(c['bfgs_max_backtracks']) is int and 5 <= c['bfgs_max_backtracks'] <= 8
+               for c in configs)
+    rows = run_sweep('bfgs', create_unimodal_terrain(), configs, [(0.3, 0.3)],
+                     max_iterations=200, processes=1)
+    assert [row['bfgs_max_backtracks'] for row in rows] == [c['bfgs_max_backtracks'] for c in configs]
+
+    for bad in ({'not_a_field': (0, 1)}, {'ga_step_mode': (0, 1)},
+                {'mcmc_use_log_posterior': (0, 1)}):
+        try:
+            config_random(2, seed=1, **bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"config_random should reject {sorted(bad)}")
+    try:
+        config_grid(not_a_field=[1])
+    except ValueError:
+        print("  PASS: Config sampling validated")
+    else:
+        raise AssertionError("Unknown config field should raise ValueError")
+
+def test_cli_values_use_field_types():
+    """CLI values should take each config field's type, so int fields work."""
+    values = parse_cli_values(['bfgs_max_backtracks=5,10', 'nr_damping=0.5',
+                               'mcmc_use_log_posterior=false', 'ga_step_mode=armijo'])
+    assert values == {'bfgs_max_backtracks': [5, 10], 'nr_damping': [0.5],
+                      'mcmc_use_log_posterior': [False], 'ga_step_mode': ['armijo']}
+    assert all(type(v) is int for v in values['bfgs_max_backtracks'])
+
+    script = Path(__file__).parent / 'sweep.py'
+    result = subprocess.run([sys.executable, str(script), 'bfgs', 'bfgs_max_backtracks=5,10'],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert 'bfgs_max_backtracks=10:' in result.stdout
+    print("  PASS: CLI parses integer config fields")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Parameter Sweep Tests")
+    print("=" * 60)
+
+    test_sweep_matches_direct_runs()
+    test_config_random_ranges()
+    test_cli_values_use_field_types()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
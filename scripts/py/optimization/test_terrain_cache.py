@@ -0,0 +1,68 @@
+"""
+Tests for the binary terrain cache used by load_terrain (terrain_cache.py).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from algorithms import load_terrain
+from terrain_cache import cache_path_for, read_cache_header
+
+TERRAIN_JSON = (Path(__file__).parent.parent.parent.parent
+                / 'docs' / 'data' / 'arthurs_seat_elevation.json')
+
+
+def test_cache_round_trip_and_invalidation():
+    """Cached loads should be identical to parsing, and rebuilt when the JSON changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / 'terrain.json'
+        shutil.copy(TERRAIN_JSON, json_path)
+        cache_path = cache_path_for(json_path)
+
+        parsed = load_terrain(str(json_path), use_cache=False)
+        first = load_terrain(str(json_path))  # Writes the cache
+        assert cache_path.exists()
+        cached = load_terrain(str(json_path))  # Reads it back
+        assert not cached.elevations.flags.owndata, "Cache should be memory-mapped"
+
+        for terrain in (first, cached):
+            assert np.array_equal(terrain.elevations, parsed.elevations)
+            assert terrain.elevations.dtype == parsed.elevations.dtype
+            assert terrain.stats == parsed.stats
+            assert terrain(0.37, 0.61) == parsed(0.37, 0.61)
+
+        # Touching the JSON without changing it keeps the cache
+        sha = read_cache_header(cache_path)['source_sha256']
+        os.utime(json_path, (os.path.getmtime(cache_path) + 10,) * 2)
+        load_terrain(str(json_path))
+        assert read_cache_header(cache_path)['source_sha256'] == sha
+
+        # Changing the content rebuilds it
+        with open(json_path) as f:
+            data = json.load(f)
+        data['elevations'][0][0] += 1.0
+        with open(json_path, 'w') as f:
+            json.dump(data, f)
+        os.utime(json_path, (os.path.getmtime(cache_path) + 20,) * 2)
+        changed = load_terrain(str(json_path))
+        assert changed.elevations[0, 0] == parsed.elevations[0, 0] + 1.0
+        assert read_cache_header(cache_path)['source_sha256'] != sha
+        del first, cached, changed
+
+    print("  PASS: Terrain cache matches JSON and invalidates on change")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Terrain Cache Tests")
+    print("=" * 60)
+
+    test_cache_round_trip_and_invalidation()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)
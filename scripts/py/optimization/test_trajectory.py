@@ -0,0 +1,114 @@
+"""
+Tests for trajectory recording and state representation in algorithms.py.
+"""
+
+import copy
+import pickle
+
+import numpy as np
+from algorithms import (
+    OptimizationConfig,
+    OptimizationState,
+    STATE_DTYPE,
+    Trajectory,
+    array_to_states,
+    states_to_array,
+    run_optimization,
+    step_simulated_annealing,
+)
+from population import PopulationState, run_population
+from synthetic_terrain import create_arthurs_seat_synthetic
+
+
+def test_trajectory_matches_copied_states():
+    """Recorded steps should equal the states a deepcopy-per-step loop produces."""
+    terrain = create_arthurs_seat_synthetic(100)
+    config = OptimizationConfig()
+    rng = np.random.default_rng(3)
+
+    state = OptimizationState(x=0.4, y=0.3, elevation=terrain(0.4, 0.3))
+    expected = [state]
+    for _ in range(300):
+        state = step_simulated_annealing(copy.deepcopy(state), terrain, config, rng)
+        expected.append(state)
+
+    trajectory = Trajectory(capacity=4)  # Force several growth steps
+    state = OptimizationState(x=0.4, y=0.3, elevation=terrain(0.4, 0.3))
+    trajectory.record(state)
+    rng = np.random.default_rng(3)
+    for _ in range(300):
+        state = step_simulated_annealing(state, terrain, config, rng)
+        trajectory.record(state)
+
+    assert len(trajectory) == len(expected)
+    for i, want in enumerate(expected):
+        assert trajectory.state(i) == want
+    assert np.array_equal(trajectory.elevation, [s.elevation for s in expected])
+    assert trajectory[-1].temperature == expected[-1].temperature
+    assert [s.x for s in trajectory[:5]] == [s.x for s in expected[:5]]
+    print(f"  Recorded {len(trajectory)} steps")
+    print("  PASS: Trajectory views match per-step state copies")
+
+
+def test_run_optimization_trajectory_views():
+    """run_optimization's trajectory should expose steps and columns."""
+    terrain = create_arthurs_seat_synthetic(100)
+    trajectory = run_optimization('newton', terrain, 0.3, 0.4, max_iterations=200)
+    final = trajectory[-1]
+
+    print(f"  Newton: {len(trajectory)} steps, reason={final.convergence_reason}")
+    assert final.converged and final.convergence_reason == 'gradient_small'
+    assert final.accepted is None
+    assert trajectory.iteration[-1] == final.iteration
+    assert trajectory.x.shape == (len(trajectory),)
+    print("  PASS: Trajectory views expose state fields")
+
+
+def test_trajectory_steps_copy_pickle_and_compare():
+    """Steps copy and pickle to standalone states and compare by value,
+    like the OptimizationState objects run_optimization used to return."""
+    terrain = create_arthurs_seat_synthetic(100)
+    trajectory = run_optimization('newton', terrain, 0.3, 0.4, max_iterations=200)
+    final = trajectory[-1]
+    expected = trajectory.state(-1)
+
+    for clone in (copy.copy(final), copy.deepcopy(final), pickle.loads(pickle.dumps(final))):
+        assert type(clone) is OptimizationState
+        assert clone == expected and final == clone
+    assert final == trajectory[-1] and final != trajectory[0]
+    assert not hasattr(final, '_missing')
+    print("  PASS: Trajectory steps copy, pickle and compare by value")
+
+
+def test_state_array_round_trip():
+    """OptimizationState should be slotted and convert losslessly to STATE_DTYPE."""
+    terrain = create_arthurs_seat_synthetic(100)
+    trajectory = run_optimization('random-restart', terrain, 0.5, 0.5, seed=1)
+    states = [trajectory.state(i) for i in range(len(trajectory))]
+    states[3].accepted = True
+
+    assert not hasattr(states[0], '__dict__')
+    records = states_to_array(states)
+    assert records.dtype == STATE_DTYPE
+    assert array_to_states(records) == states
+
+    pop = run_population('newton', terrain, [0.3, 0.6], [0.4, 0.2])
+    restored = PopulationState.from_array(pop.to_array())
+    assert [restored.state(i) for i in range(2)] == [pop.state(i) for i in range(2)]
+    print(f"  Round-tripped {len(states)} states and a population")
+    print("  PASS: State array conversions are lossless")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Trajectory and State Tests")
+    print("=" * 60)
+
+    test_trajectory_matches_copied_states()
+    test_run_optimization_trajectory_views()
+    test_trajectory_steps_copy_pickle_and_compare()
+    test_state_array_round_trip()
+
+    print("\n" + "=" * 60)
+    print("All tests passed!")
+    print("=" * 60)